@@ -0,0 +1,105 @@
+"""
+Compare concert write throughput of the bulk save path against the previous
+row-by-row inserts in rollback-journal mode.
+
+Usage: python benchmarks/bench_database.py [rows ...]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "sf_jam"))
+
+from database import (  # noqa: E402
+    INSERT_CONCERT,
+    LOG_ADDED,
+    ConcertDatabase,
+    _link_artists,
+    prepare_concert,
+)
+from dates import display_date  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+VENUE = "Bench Hall"
+SCRAPED = "2025-01-01"
+
+
+def generate_concerts(count: int):
+    """Yield ``count`` distinct concerts for a single venue."""
+    days = [date(2025, 1, 1) + timedelta(days=offset) for offset in range(365)]
+    dates = [(display_date(day), day.isoformat()) for day in days]
+    for i in range(count):
+        display, iso = dates[i % len(dates)]
+        yield {
+            "title": f"Artist {i}",
+            "date": display,
+            "date_iso": iso,
+            "headliner": f"Artist {i}",
+            "venue": VENUE,
+            "show_time": "8:00 PM",
+            "ticket_url": f"https://tickets.example.com/{i}",
+            "image_url": f"https://img.example.com/{i}.jpg",
+        }
+
+
+def save_row_by_row(db_path: str, concerts) -> int:
+    """
+    Save concerts one statement at a time in rollback-journal mode with
+    default pragmas. Each concert gets the same insert, change log entry and
+    artist links as the bulk path, so only the write path differs.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    inserted = 0
+    try:
+        for concert in concerts:
+            row = prepare_concert(concert, SCRAPED)
+            cursor = conn.execute(INSERT_CONCERT, row)
+            if not cursor.rowcount:
+                continue
+            inserted += 1
+            rowid = cursor.lastrowid
+            conn.execute(LOG_ADDED, (SCRAPED, rowid - 1))
+            _link_artists(conn, [(rowid, row["headliner"], row["support"])])
+        conn.commit()
+    finally:
+        conn.close()
+    return inserted
+
+
+def save_bulk(db_path: str, concerts) -> int:
+    db = ConcertDatabase(db_path)
+    try:
+        return db.save_concerts(concerts, VENUE).added
+    finally:
+        db.close()
+
+
+def run(save, rows: int) -> float:
+    """Return rows per second for saving ``rows`` concerts into a fresh file."""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "bench.db")
+        ConcertDatabase(db_path).close()
+        start = time.perf_counter()
+        inserted = save(db_path, generate_concerts(rows))
+        elapsed = time.perf_counter() - start
+    assert inserted == rows, f"inserted {inserted} of {rows} rows"
+    return rows / elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    variants = [("row-by-row", save_row_by_row), ("bulk executemany", save_bulk)]
+    print(f"{'rows':>10}  {'variant':<20}{'rows/sec':>14}")
+    for rows in sizes:
+        for label, save in variants:
+            print(f"{rows:>10}  {label:<20}{run(save, rows):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare parse time and peak memory of full-page html.parser parsing against
+the configured parser with venue listing strainers.
+
+Usage: python benchmarks/bench_parsing.py [cards] [noise_blocks]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "sf_jam"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from parsing import default_parser, make_soup  # noqa: E402
+from venues import fox, great_american, independent  # noqa: E402
+
+SEETICKETS_CARD = """
+<div class="seetickets-list-event-container">
+  <div class="event-info-block">
+    <p class="event-title"><a href="/event/{i}">Artist {i}</a></p>
+    <p class="headliners">Artist {i}</p>
+    <p class="supporting-talent">Support {i}</p>
+    <p class="event-date">Fri Jan 24</p>
+    <p class="doortime-showtime">
+      <span class="see-doortime">7:00PM</span><span class="see-showtime">8:00PM</span>
+    </p>
+  </div>
+  <a class="seetickets-buy-btn" href="https://wl.seetickets.us/{i}">Buy</a>
+  <img class="seetickets-list-view-event-image" src="/img/{i}.jpg">
+</div>
+"""
+
+TICKETWEB_CARD = """
+<div class="tw-section">
+  <div class="tw-name"><a href="/e/{i}">Artist {i}</a></div>
+  <div class="tw-event-date-complete">
+    <span class="tw-day-of-week">Mon</span><span class="tw-event-date">2.17</span>
+  </div>
+  <span class="tw-event-time">Show: 8:00 pm</span>
+  <div class="tw-artist tw-support">Support {i}</div>
+  <a class="tw-buy-tix-btn" href="https://www.ticketweb.com/{i}">Buy</a>
+  <div class="tw-image"><img src="/img/{i}.jpg"></div>
+</div>
+"""
+
+WORDPRESS_CARD = """
+<div class="mix detail-information">
+  <h2 class="show-title">Artist {i}</h2>
+  <div class="date-show">Apr 04 Fri</div>
+  <div class="time-show"><span class="event__start-time">Show: 8:00 pm</span></div>
+  <a class="button" href="https://www.ticketmaster.com/{i}">Buy Tickets</a>
+  <img class="wp-post-image" src="/img/{i}.jpg">
+</div>
+"""
+
+NOISE = '<div class="nav"><ul>{items}</ul><script>var x = "{pad}";</script></div>'
+
+
+def build_page(card: str, cards: int, noise_blocks: int) -> str:
+    """Build a listing page of ``cards`` cards surrounded by unrelated markup."""
+    items = "".join(f'<li><a href="/p/{i}">Page {i}</a></li>' for i in range(50))
+    noise = NOISE.format(items=items, pad="x" * 1024) * noise_blocks
+    body = "".join(card.format(i=i) for i in range(cards))
+    return f"<html><head>{noise}</head><body>{noise}{body}{noise}</body></html>"
+
+
+def measure(parse, repeat: int = 3) -> tuple:
+    """Return (best seconds, peak MiB) for ``parse``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced on a separate run since tracing slows parsing down
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak / 2**20
+
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    noise_blocks = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    platforms = [
+        ("seetickets", SEETICKETS_CARD, great_american.EXTRACTOR.strainer),
+        ("ticketweb", TICKETWEB_CARD, independent.EXTRACTOR.strainer),
+        ("wordpress", WORDPRESS_CARD, fox.EXTRACTOR.strainer),
+    ]
+    print(
+        f"{cards} cards, {noise_blocks} blocks of unrelated markup, {default_parser()}"
+    )
+    print(f"{'platform':<12}{'variant':<28}{'time (ms)':>12}{'peak (MiB)':>12}")
+    for name, card, strainer in platforms:
+        html = build_page(card, cards, noise_blocks)
+        variants = [
+            ("html.parser full tree", lambda: BeautifulSoup(html, "html.parser")),
+            (f"{default_parser()} full tree", lambda: make_soup(html)),
+            (f"{default_parser()} listings only", lambda: make_soup(html, strainer)),
+        ]
+        for label, parse in variants:
+            elapsed, peak = measure(parse)
+            print(f"{name:<12}{label:<28}{elapsed * 1000:>12.1f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,30 @@
-import sqlite3
 import threading
 
 import pandas as pd
 import streamlit as st
+from database import CONCERT_COLUMNS, DETAIL_COLUMNS, ConcertDatabase
 from main import run_scraper
 
+# Concerts shown per page
+PAGE_SIZE = 100
 
-def load_concerts_from_db():
-    """Load concerts from local SQLite database."""
-    conn = sqlite3.connect("concerts.db")
-    query = "SELECT * FROM concerts"
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+
+@st.cache_resource
+def get_database():
+    """Return the database shared by every session, with its open connections."""
+    return ConcertDatabase()
+
+
+def load_concerts_page(search_term, venues, cursor):
+    """Load one page of matching concerts from the database."""
+    page = get_database().query_concerts(
+        venues=venues or None,
+        search=search_term or None,
+        after=cursor,
+        page_size=PAGE_SIZE,
+    )
+    columns = [*CONCERT_COLUMNS, *DETAIL_COLUMNS]
+    return page, pd.DataFrame(page.concerts, columns=columns)
 
 
 def create_venue_link(row):
@@ -125,8 +137,6 @@ def main():
         unsafe_allow_html=True,
     )
 
-    events = load_concerts_from_db()
-
     # Initialize session state if it doesn't exist
     if "search_term" not in st.session_state:
         st.session_state.search_term = ""
@@ -163,7 +173,7 @@ def main():
         st.session_state.search_term = ""  # Clear the search term
         st.rerun()  # Rerun the app to reflect the changes
     # Get unique venues for the filter
-    all_venues = sorted(events["venue"].unique())
+    all_venues = get_database().get_venues()
     selected_venues = st.multiselect(
         "Select venues:", options=all_venues, default=[], key="venue_filter"
     )
@@ -172,41 +182,44 @@ def main():
     column_mapping = {
         "headliner": "Artist/Event",
         "date": "Date",
+        "door_time": "Doors",
+        "age_restriction": "Ages",
+        "price_range": "Price",
+        "genre": "Genre",
         "venue_link": "Tickets",
     }
 
-    # Create a copy of the DataFrame with selected columns
-    df_display = events[["headliner", "date", "venue", "ticket_url"]].copy()
-
-    # Filter the DataFrame based on selected venues
-    if selected_venues:
-        df_display = df_display[df_display["venue"].isin(selected_venues)]
-
-    # Filter by search term
-    if search_term:
-        df_display = df_display[
-            df_display["headliner"].str.contains(search_term, case=False, na=False)
-        ]
-
-    # Convert date strings to datetime for sorting
-    df_display["date_for_sorting"] = pd.to_datetime(df_display["date"])
+    # Cursors of the pages before the current one, restarted when the
+    # filters change
+    filters = (search_term, tuple(selected_venues))
+    if st.session_state.get("page_filters") != filters:
+        st.session_state.page_filters = filters
+        st.session_state.page_cursors = [None]
+    cursors = st.session_state.page_cursors
 
-    # Sort the DataFrame by the datetime column
-    df_display = df_display.sort_values("date_for_sorting")
+    # Fetch only the page shown, filtered and sorted by the database
+    page, events = load_concerts_page(search_term, selected_venues, cursors[-1])
+    df_display = events[["headliner", "date", "venue", "ticket_url"]].copy()
 
     # Create the venue links
     df_display["venue_link"] = df_display.apply(create_venue_link, axis=1)
 
+    # Event details are only known once a ticket page has been read
+    details = events[list(DETAIL_COLUMNS)].fillna("")
+    df_display = df_display.join(details)
+
     # Keep only the columns we want to display
-    df_display = df_display[["headliner", "date", "venue_link"]]
+    df_display = df_display[list(column_mapping)]
 
     # Rename the columns
     df_display = df_display.rename(columns=column_mapping)
 
     # Show results or no results message
     if len(df_display) > 0:
-        event_string = "events" if len(df_display) > 1 else "event"
-        st.write(f"Showing {len(df_display)} {event_string}")
+        first = (len(cursors) - 1) * PAGE_SIZE + 1
+        last = first + len(df_display) - 1
+        event_string = "events" if page.total > 1 else "event"
+        st.write(f"Showing {first}-{last} of {page.total} {event_string}")
         # Wrap table in a container div and display
         table_html = f"""
         <div class="table-container">
@@ -214,6 +227,17 @@ def main():
         </div>
         """
         st.write(table_html, unsafe_allow_html=True)
+
+        # Move between pages
+        prev_col, next_col = st.columns([1, 1])
+        with prev_col:
+            if len(cursors) > 1 and st.button("Previous", use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with next_col:
+            if page.next_cursor and st.button("Next", use_container_width=True):
+                cursors.append(page.next_cursor)
+                st.rerun()
     else:
         # If search term was used, include it in the message
         if search_term:
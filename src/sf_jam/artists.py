@@ -0,0 +1,75 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Roles an artist plays at a concert
+HEADLINER = "headliner"
+SUPPORT = "support"
+
+# Support acts are listed together, e.g. "with Foo, Bar / Baz"
+# (a slash only between spaces, keeping names like "AC/DC")
+_SEPARATOR_RE = re.compile(r"\s*[,;|•]\s*|\s+/\s+|\s+w/\s*", re.IGNORECASE)
+_PREFIX_RE = re.compile(
+    r"^(?:with|special guests?|also featuring|feat\.|w/)(?:\s*:)?\s+",
+    re.IGNORECASE,
+)
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+
+
+@lru_cache(maxsize=4096)
+def artist_key(name: str) -> str:
+    """
+    Fold an artist name into the key artists are matched by
+
+    Case, accents, punctuation and spacing are ignored and "&" reads as
+    "and", so "Beyoncé", "BEYONCE" and "Beyonce!" share a key.
+
+    Args:
+        name (str): Artist name as listed
+
+    Returns:
+        str: The folded key, empty if the name has no letters or digits
+    """
+    decomposed = unicodedata.normalize("NFKD", name.replace("&", " and "))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_PUNCTUATION_RE.sub(" ", stripped.casefold()).split())
+
+
+def split_support(support: Optional[str]) -> List[str]:
+    """
+    Split a listing's support acts into artist names
+
+    Args:
+        support (str): Support acts as listed, e.g. "with Foo, Bar"
+
+    Returns:
+        list: Artist names in listed order, without leading "with" and the like
+    """
+    names = []
+    for part in _SEPARATOR_RE.split(support or ""):
+        name = _PREFIX_RE.sub("", part.strip()).strip()
+        if artist_key(name):
+            names.append(name)
+    return names
+
+
+def artist_roles(
+    headliner: Optional[str], support: Optional[str]
+) -> List[Tuple[str, str]]:
+    """
+    Return the artists playing a concert with their roles, headliner first
+
+    The headliner is kept whole, since names like "Crosby, Stills & Nash"
+    contain separators. An artist listed twice keeps their first role.
+    """
+    roles = []
+    seen = set()
+    names = [(HEADLINER, headliner or "")]
+    names += [(SUPPORT, name) for name in split_support(support)]
+    for role, name in names:
+        key = artist_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            roles.append((role, name.strip()))
+    return roles
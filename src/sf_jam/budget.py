@@ -0,0 +1,79 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple, Union
+
+# Shortest timeout worth sending a request with; below this the budget is
+# treated as spent
+MIN_TIMEOUT = 0.5
+
+Timeout = Optional[Union[float, Tuple[float, float]]]
+
+# Monotonic time by which the current scrape has to finish, or None
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class BudgetExceeded(Exception):
+    """Raised when a scrape has used up its time budget."""
+
+
+@contextmanager
+def deadline_at(when: Optional[float]):
+    """
+    Bound work inside this block by the monotonic time ``when``
+
+    Deadlines only ever tighten: an enclosing earlier deadline still applies.
+    Threads started with a copy of the current context inherit it.
+    """
+    current = _deadline.get()
+    if when is not None and current is not None:
+        when = min(when, current)
+    token = _deadline.set(when if when is not None else current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check():
+    """
+    Raise if the current deadline has passed
+
+    Raises:
+        BudgetExceeded: If less than MIN_TIMEOUT seconds are left
+    """
+    left = remaining()
+    if left is not None and left < MIN_TIMEOUT:
+        raise BudgetExceeded("Time budget exhausted")
+
+
+def request_timeout(timeout: Timeout) -> Timeout:
+    """
+    Clip a requests timeout to the time left in the budget
+
+    Args:
+        timeout: A single timeout or a (connect, read) pair, in seconds
+
+    Returns:
+        The timeout to send the request with
+
+    Raises:
+        BudgetExceeded: If the budget is already spent
+    """
+    check()
+    left = remaining()
+    if left is None:
+        return timeout
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(min(part, left) for part in timeout)
+    return min(timeout, left)
@@ -1,30 +1,561 @@
+import base64
+import hashlib
+import json
 import logging
+import os
+import queue
+import re
 import sqlite3
-from contextlib import contextmanager
-from datetime import datetime
-from typing import Dict, List, Tuple
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import quote
+
+from artists import artist_key, artist_roles
+from dates import DISPLAY_FORMAT, display_date, parse_date, start_iso
+from models import ConcertPage, SaveResult
 
 logger = logging.getLogger(__name__)
 
+# Concert fields that make up a venue's content fingerprint
+FINGERPRINT_FIELDS = ("title", "date", "headliner", "show_time", "ticket_url")
+
+# Event details fetched from ticket pages, read alongside each concert
+DETAIL_COLUMNS = ("age_restriction", "price_range", "genre", "door_time")
+
+
+def concert_digest(concert: Dict) -> bytes:
+    """Hash the fingerprinted fields of a single concert."""
+    values = "\x1f".join(str(concert.get(key) or "") for key in FINGERPRINT_FIELDS)
+    return hashlib.sha256(values.encode()).digest()
+
+
+def fingerprint(digests: Iterable[bytes]) -> str:
+    """
+    Combine per-concert digests into a fingerprint of a venue's listing
+
+    Digests are sorted first, so the fingerprint does not depend on the
+    order concerts were scraped in.
+    """
+    combined = hashlib.sha256()
+    for digest in sorted(digests):
+        combined.update(digest)
+    return combined.hexdigest()
+
+
+# Columns written for every saved concert, in table order
+CONCERT_COLUMNS = (
+    "title",
+    "date",
+    "headliner",
+    "venue",
+    "show_time",
+    "ticket_url",
+    "image_url",
+    "scraped_date",
+    "date_iso",
+    "starts_at",
+    "support",
+)
+
+_COLUMN_LIST = ", ".join(CONCERT_COLUMNS)
+_VALUE_LIST = ", ".join(f":{column}" for column in CONCERT_COLUMNS)
+_SET_LIST = ", ".join(f"{column} = :{column}" for column in CONCERT_COLUMNS)
+# Duplicates of a concert already saved in the same write are skipped, as
+# are past concerts already archived that a venue still lists
+INSERT_CONCERT = (
+    f"INSERT INTO concerts ({_COLUMN_LIST}) SELECT {_VALUE_LIST} "
+    "WHERE NOT EXISTS (SELECT 1 FROM concerts_archive WHERE venue = :venue "
+    "AND date = :date AND headliner = :headliner) "
+    "ON CONFLICT(venue, date, headliner) DO NOTHING"
+)
+UPDATE_CONCERT = f"UPDATE concerts SET {_SET_LIST} WHERE rowid = :rowid"
+
+# Identifies an event across scrapes, matching the table's UNIQUE constraint
+EVENT_KEY = ("venue", "date", "headliner")
+# Columns compared to tell whether a saved event changed; scraped_date only
+# records when its row was last written
+COMPARED_COLUMNS = tuple(
+    column for column in CONCERT_COLUMNS if column != "scraped_date"
+)
+
+# Concert columns followed by their event details, cached per ticket URL
+_CONCERT_SELECT = "concerts.*, " + ", ".join(
+    f"event_details.{column}" for column in DETAIL_COLUMNS
+)
+_DETAIL_JOIN = (
+    "LEFT JOIN event_details ON event_details.ticket_url = concerts.ticket_url"
+)
+
+# Read-only connections kept open for queries
+READ_POOL_SIZE = 4
+# Seconds a write waits for the database to be free before failing
+BUSY_TIMEOUT = 30
+# Prepared statements cached per connection, enough for every query issued
+CACHED_STATEMENTS = 256
+
+# How long change log entries are kept for consumers to catch up
+CHANGE_RETENTION = timedelta(days=30)
+
+# Applied to every connection. WAL lets the app read while a scrape writes,
+# and with it NORMAL sync is still safe against corruption
+PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -16000,  # KiB, i.e. 16 MiB of page cache
+    "mmap_size": 128 * 2**20,
+    "temp_store": "MEMORY",
+}
+
+
+def prepare_concert(concert: Dict, scraped_date: str) -> Dict:
+    """
+    Build the row stored for a concert
+
+    The ISO date is the source of truth: it is parsed from the display
+    string when a parser did not provide it, and the display string is then
+    derived from it. ``starts_at`` adds the show time when it can be read.
+    """
+    row = {column: concert.get(column) for column in CONCERT_COLUMNS}
+    row["scraped_date"] = scraped_date
+    if not row["date_iso"] and row["date"]:
+        parsed = parse_date(row["date"], (DISPLAY_FORMAT,))
+        row["date_iso"] = parsed.isoformat() if parsed else None
+    if row["date_iso"]:
+        row["date"] = display_date(date.fromisoformat(row["date_iso"]))
+    row["starts_at"] = start_iso(row["date_iso"], row["show_time"])
+    return row
+
+
+def event_key(row: Dict) -> Tuple:
+    """Return the identity of a prepared concert row."""
+    return tuple(row[column] for column in EVENT_KEY)
+
+
+def _add_start_columns(conn: sqlite3.Connection):
+    """Add ISO date and start columns to concerts and backfill them."""
+    conn.execute("ALTER TABLE concerts ADD COLUMN date_iso TEXT")
+    conn.execute("ALTER TABLE concerts ADD COLUMN starts_at TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_concerts_starts_at ON concerts (starts_at)"
+    )
+    rows = conn.execute("SELECT rowid, date, show_time FROM concerts").fetchall()
+    updates = []
+    for rowid, display, show_time in rows:
+        row = prepare_concert({"date": display, "show_time": show_time}, "")
+        updates.append((row["date_iso"], row["starts_at"], row["date"], rowid))
+    conn.executemany(
+        "UPDATE concerts SET date_iso = ?, starts_at = ?, date = ? WHERE rowid = ?",
+        updates,
+    )
+
+
+def _rename_greek_rows(conn: sqlite3.Connection):
+    """Move Greek Theatre rows saved under its parser's name to its own."""
+    # Rows already saved under both names keep the one saved under the
+    # venue's own name
+    conn.execute(
+        "UPDATE OR IGNORE concerts SET venue = 'Greek Theatre' "
+        "WHERE venue = 'The Greek Theatre'"
+    )
+    conn.execute("DELETE FROM concerts WHERE venue = 'The Greek Theatre'")
+
+
+# Columns indexed for search, and the weight each gets when ranking matches
+SEARCH_WEIGHTS = {"headliner": 10.0, "title": 5.0, "support": 2.0}
+
+_SEARCH_COLUMNS = ", ".join(SEARCH_WEIGHTS)
+_OLD_VALUES = ", ".join(f"old.{column}" for column in SEARCH_WEIGHTS)
+_NEW_VALUES = ", ".join(f"new.{column}" for column in SEARCH_WEIGHTS)
+# Triggers keep the index in step with every write to concerts
+_SEARCH_TRIGGERS = (
+    f"""
+    CREATE TRIGGER concerts_fts_insert AFTER INSERT ON concerts BEGIN
+        INSERT INTO concerts_fts (rowid, {_SEARCH_COLUMNS})
+        VALUES (new.rowid, {_NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER concerts_fts_delete AFTER DELETE ON concerts BEGIN
+        INSERT INTO concerts_fts (concerts_fts, rowid, {_SEARCH_COLUMNS})
+        VALUES ('delete', old.rowid, {_OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER concerts_fts_update AFTER UPDATE OF {_SEARCH_COLUMNS}
+    ON concerts BEGIN
+        INSERT INTO concerts_fts (concerts_fts, rowid, {_SEARCH_COLUMNS})
+        VALUES ('delete', old.rowid, {_OLD_VALUES});
+        INSERT INTO concerts_fts (rowid, {_SEARCH_COLUMNS})
+        VALUES (new.rowid, {_NEW_VALUES});
+    END
+    """,
+)
+
+
+def _add_search_index(conn: sqlite3.Connection):
+    """Add the support column and a full-text index over the searched columns."""
+    conn.execute("ALTER TABLE concerts ADD COLUMN support TEXT")
+    # The index stores no copy of the text, only the terms pointing at rowids
+    # of concerts; prefix indexes make short prefix queries cheap
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE concerts_fts USING fts5 (
+            {_SEARCH_COLUMNS},
+            content = 'concerts',
+            content_rowid = 'rowid',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """
+    )
+    for trigger in _SEARCH_TRIGGERS:
+        conn.execute(trigger)
+    conn.execute("INSERT INTO concerts_fts (concerts_fts) VALUES ('rebuild')")
+
+
+def match_query(text: str) -> Optional[str]:
+    """
+    Turn a search box entry into an FTS5 query
+
+    Every word has to match the start of a term, so "arc fi" finds "Arcade
+    Fire". Words are quoted, so FTS5 operators typed by users are literal.
+    Returns None if the text holds no words.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+# Concerts are listed by start, undated concerts last. Queries sort and
+# filter on this expression so its indexes serve both
+UNDATED = "~"
+START_KEY = f"IFNULL(starts_at, '{UNDATED}')"
+
+# Sort orders of query_concerts: key expressions, then whether descending.
+# Ties are broken by rowid in the same direction, so every row has a
+# distinct position to resume a page from
+SORT_ORDERS = {
+    "date": ((START_KEY,), False),
+    "date_desc": ((START_KEY,), True),
+    "venue": (("venue", START_KEY), False),
+}
+
+
+def _add_query_indexes(conn: sqlite3.Connection):
+    """Index concerts by venue and start for filtered, paginated queries."""
+    conn.execute(
+        f"CREATE INDEX idx_concerts_venue_start ON concerts (venue, {START_KEY})"
+    )
+    conn.execute(f"CREATE INDEX idx_concerts_start ON concerts ({START_KEY})")
+    # Superseded by idx_concerts_start, which also orders undated concerts
+    conn.execute("DROP INDEX IF EXISTS idx_concerts_starts_at")
+
+
+def _after(keys: Sequence[str], descending: bool) -> str:
+    """
+    Build the condition for rows after a cursor's position in a sort order
+
+    The condition is nested as ``k1 >= ? AND (k1 > ? OR ...)`` rather than
+    compared as a row value, so SQLite can seek the index to the cursor.
+    Parameters are each key's value twice, then the rowid.
+    """
+    if not keys:
+        return f"concerts.rowid {'<' if descending else '>'} ?"
+    at_or_after, after = ("<=", "<") if descending else (">=", ">")
+    key, rest = keys[0], keys[1:]
+    return (
+        f"{key} {at_or_after} ? AND ({key} {after} ? OR " f"{_after(rest, descending)})"
+    )
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Turn sort key values and a rowid into an opaque page cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """
+    Read the values of a page cursor
+
+    Raises:
+        ValueError: If the cursor was not made by encode_cursor for ``size`` values
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid page cursor: {cursor!r}")
+    return values
+
+
+def _add_archive(conn: sqlite3.Connection):
+    """Add the table past concerts are moved to."""
+    # Columns added to concerts by later migrations have to be added here too
+    conn.execute(
+        """
+        CREATE TABLE concerts_archive (
+            title TEXT,
+            date TEXT,
+            headliner TEXT,
+            venue TEXT,
+            show_time TEXT,
+            ticket_url TEXT,
+            image_url TEXT,
+            scraped_date TEXT,
+            date_iso TEXT,
+            starts_at TEXT,
+            support TEXT,
+            archived_at TEXT,
+            UNIQUE(venue, date, headliner)
+        )
+    """
+    )
+    conn.execute(
+        "CREATE INDEX idx_archive_date_iso ON concerts_archive (date_iso, venue)"
+    )
+
+
+def _add_change_log(conn: sqlite3.Connection):
+    """Add the log of concerts added, changed and removed by saves."""
+    # AUTOINCREMENT keeps sequence numbers increasing even after old
+    # changes are pruned, so a consumer's cursor never sees one reused
+    conn.execute(
+        """
+        CREATE TABLE concert_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            venue TEXT,
+            date TEXT,
+            headliner TEXT,
+            before TEXT,
+            after TEXT,
+            changed_at TEXT
+        )
+    """
+    )
+
+
+# Change log entries record a concert's compared columns as a JSON object
+_JSON_COLUMNS = ", ".join(f"'{column}', {column}" for column in COMPARED_COLUMNS)
+LOG_ADDED = (
+    "INSERT INTO concert_changes (kind, venue, date, headliner, after, changed_at) "
+    f"SELECT 'added', venue, date, headliner, json_object({_JSON_COLUMNS}), ? "
+    "FROM concerts WHERE rowid > ?"
+)
+LOG_CHANGE = (
+    "INSERT INTO concert_changes "
+    "(kind, venue, date, headliner, before, after, changed_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _json_row(values: Iterable) -> str:
+    """Encode compared column values the way the change log stores them."""
+    return json.dumps(dict(zip(COMPARED_COLUMNS, values)))
+
+
+def _link_artists(conn: sqlite3.Connection, concerts: Iterable[Tuple]):
+    """
+    Record the artists playing concerts, adding artists not seen before
+
+    Args:
+        conn (sqlite3.Connection): Connection inside a write transaction
+        concerts (Iterable[Tuple]): (rowid, headliner, support) of each concert
+    """
+    artists: Dict[str, str] = {}
+    links = []
+    for rowid, headliner, support in concerts:
+        for position, (role, name) in enumerate(artist_roles(headliner, support)):
+            key = artist_key(name)
+            artists.setdefault(key, name)
+            links.append((rowid, role, position, key))
+    # An artist keeps the spelling they were first saved with
+    conn.executemany(
+        "INSERT INTO artists (key, name) VALUES (?, ?) ON CONFLICT(key) DO NOTHING",
+        artists.items(),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO concert_artists (concert_rowid, artist_id, role, position) "
+        "SELECT ?, id, ?, ? FROM artists WHERE key = ?",
+        links,
+    )
+
+
+def _relink_all_artists(conn: sqlite3.Connection):
+    """Rebuild every concert's artist links, e.g. after rowids changed."""
+    conn.execute("DELETE FROM concert_artists")
+    _link_artists(conn, conn.execute("SELECT rowid, headliner, support FROM concerts"))
+
+
+def _add_artists(conn: sqlite3.Connection):
+    """Add normalized artists and the artists playing each concert."""
+    conn.execute(
+        """
+        CREATE TABLE artists (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL
+        )
+    """
+    )
+    # Links use concerts' rowids, like the search index
+    conn.execute(
+        """
+        CREATE TABLE concert_artists (
+            concert_rowid INTEGER NOT NULL,
+            artist_id INTEGER NOT NULL REFERENCES artists (id),
+            role TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (concert_rowid, artist_id)
+        ) WITHOUT ROWID
+    """
+    )
+    conn.execute(
+        "CREATE INDEX idx_concert_artists_artist "
+        "ON concert_artists (artist_id, role, concert_rowid)"
+    )
+    # Saves link the artists of rows they write; links of deleted or
+    # archived concerts go with them
+    conn.execute(
+        """
+        CREATE TRIGGER concert_artists_delete AFTER DELETE ON concerts BEGIN
+            DELETE FROM concert_artists WHERE concert_rowid = old.rowid;
+        END
+    """
+    )
+    _relink_all_artists(conn)
+
+
+# Schema changes applied in order; the database's user_version records how
+# many have run
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _add_start_columns,
+    _rename_greek_rows,
+    _add_search_index,
+    _add_query_indexes,
+    _add_archive,
+    _add_change_log,
+    _add_artists,
+]
+
 
 class ConcertDatabase:
-    def __init__(self, db_path: str = "concerts.db"):
+    """
+    Concerts and scrape runs stored in SQLite.
+
+    The database owns its connections: one long-lived writer shared by all
+    threads, one write at a time, and a pool of read-only connections for
+    queries. Pragmas are applied once when a connection opens, and each
+    connection keeps its cache of prepared statements for its lifetime.
+    """
+
+    def __init__(
+        self, db_path: str = "concerts.db", read_pool_size: int = READ_POOL_SIZE
+    ):
         self.db_path = db_path
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._read_slots = threading.BoundedSemaphore(read_pool_size)
         self._init_database()
 
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the database's pragmas applied."""
+        if read_only:
+            conn = sqlite3.connect(
+                f"file:{quote(os.path.abspath(self.db_path))}?mode=ro",
+                uri=True,
+                timeout=BUSY_TIMEOUT,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+            )
+            conn.execute("PRAGMA query_only = ON")
+            conn.row_factory = sqlite3.Row
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+            )
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Context manager for the write connection, held by one thread at a time
+
+        Streamed saves hold the connection while pages download, so other
+        writers wait for it, up to BUSY_TIMEOUT as with SQLite's own lock.
+
+        Raises:
+            sqlite3.OperationalError: If the connection stays busy too long
+        """
+        if not self._write_lock.acquire(timeout=BUSY_TIMEOUT):
+            raise sqlite3.OperationalError("database is locked")
         try:
-            yield conn
+            if self._writer is None:
+                self._writer = self._connect()
+            yield self._writer
         finally:
-            conn.close()
+            # A failed write must not leave its transaction open for the next
+            if self._writer is not None and self._writer.in_transaction:
+                self._writer.rollback()
+            self._write_lock.release()
+
+    @contextmanager
+    def get_read_connection(self):
+        """
+        Context manager borrowing a read-only connection from the pool
+
+        Rows are returned as sqlite3.Row. Connections are opened as needed,
+        up to the pool size, after which callers wait for one to be returned.
+        """
+        with self._read_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect(read_only=True)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+
+    def close(self):
+        """Close the writer and every pooled reader."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
 
     def _init_database(self):
         """Initialize the database with required schema."""
         try:
             with self.get_connection() as conn:
+                # Stored in the database file, so they only have to be set
+                # once; auto_vacuum only applies to a database without tables
+                # yet, older ones are converted by compact()
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("PRAGMA journal_mode = WAL")
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -41,58 +572,711 @@ class ConcertDatabase:
                     )
                 """
                 )
+                self._migrate(conn)
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS scrape_runs (
+                        venue TEXT PRIMARY KEY,
+                        last_success TEXT,
+                        duration REAL,
+                        row_count INTEGER,
+                        fingerprint TEXT
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS event_details (
+                        ticket_url TEXT PRIMARY KEY,
+                        age_restriction TEXT,
+                        price_range TEXT,
+                        genre TEXT,
+                        door_time TEXT,
+                        fetched_at TEXT
+                    )
+                """
+                )
                 conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Database initialization failed: {e}")
             raise
 
-    def save_concerts(self, concerts: List[Dict], venue: str) -> Tuple[int, int]:
+    def _migrate(self, conn: sqlite3.Connection):
         """
-        Save concerts to database with error handling and duplicate prevention.
-        Returns tuple of (inserted_count, error_count).
+        Apply the migrations this database has not run yet, each in its own
+        transaction so a failed migration leaves the previous version intact.
         """
-        inserted = 0
-        errors = 0
+        read_version = "PRAGMA user_version"
+        if conn.execute(read_version).fetchone()[0] >= len(MIGRATIONS):
+            return
+
+        while True:
+            # Take the write lock before re-reading the version, in case
+            # another process is migrating at the same time
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute(read_version).fetchone()[0]
+                if version >= len(MIGRATIONS):
+                    conn.rollback()
+                    return
+                logger.info(f"Migrating concerts database to version {version + 1}")
+                MIGRATIONS[version](conn)
+                # PRAGMA does not accept bound parameters
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+
+    def _rows(
+        self, concerts: Iterable[Dict], venue: str, failed: List[Dict]
+    ) -> Iterator[Dict]:
+        """Prepare rows for insertion, setting aside concerts that are malformed."""
         current_date = datetime.now().strftime("%Y-%m-%d")
+        for concert in concerts:
+            try:
+                row = prepare_concert(concert, current_date)
+            except (TypeError, ValueError) as e:
+                failed.append(concert)
+                logger.error(
+                    f"Error preparing concert for {venue}: {e}\nData: {concert}"
+                )
+                continue
+            # Saved rows are keyed by the venue they are saved under, which
+            # a parser's venue name may not match
+            row["venue"] = venue
+            yield row
+
+    def _existing(self, conn: sqlite3.Connection, venue: str) -> Dict[Tuple, Tuple]:
+        """Return a venue's saved events as {key: (rowid, compared values)}."""
+        rows = conn.execute(
+            f"SELECT rowid, {', '.join(COMPARED_COLUMNS)} FROM concerts WHERE venue = ?",
+            (venue,),
+        )
+        existing = {}
+        for rowid, *values in rows:
+            key = event_key(dict(zip(COMPARED_COLUMNS, values)))
+            existing[key] = (rowid, tuple(values))
+        return existing
+
+    def _sync(
+        self,
+        conn: sqlite3.Connection,
+        rows: Iterable[Dict],
+        existing: Dict[Tuple, Tuple],
+        seen: Set[Tuple],
+        result: SaveResult,
+    ):
+        """
+        Insert new events and update changed ones, removing every event seen
+        from ``existing`` so what remains at the end of a listing is gone.
+        Repeats of an event within a listing are skipped, and so are past
+        events already moved to the archive.
+        """
+        updates: List[Tuple[Dict, Tuple]] = []
+        offered = 0
 
+        def new_rows() -> Iterator[Dict]:
+            nonlocal offered
+            for row in rows:
+                key = event_key(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                stored = existing.pop(key, None)
+                if stored is None:
+                    offered += 1
+                    yield row
+                elif stored[1] != tuple(row[column] for column in COMPARED_COLUMNS):
+                    updates.append((row, stored))
+                else:
+                    result.unchanged += 1
+
+        changed_at = datetime.now().isoformat(timespec="seconds")
+        # Inserted rows get rowids above the current maximum, which is how
+        # the rows actually added are found for the change log
+        last_rowid = conn.execute("SELECT IFNULL(max(rowid), 0) FROM concerts")
+        last_rowid = last_rowid.fetchone()[0]
+        added = conn.executemany(INSERT_CONCERT, new_rows()).rowcount
+        result.added += added
+        # Events skipped as already archived are saved, just not live
+        result.unchanged += offered - added
+        conn.execute(LOG_ADDED, (changed_at, last_rowid))
+        _link_artists(
+            conn,
+            conn.execute(
+                "SELECT rowid, headliner, support FROM concerts WHERE rowid > ?",
+                (last_rowid,),
+            ).fetchall(),
+        )
+        if updates:
+            result.changed += conn.executemany(
+                UPDATE_CONCERT,
+                [{**row, "rowid": rowid} for row, (rowid, _) in updates],
+            ).rowcount
+            # The headliner is part of the key, only support acts can change
+            conn.executemany(
+                "DELETE FROM concert_artists WHERE concert_rowid = ?",
+                [(rowid,) for _, (rowid, _) in updates],
+            )
+            _link_artists(
+                conn,
+                [
+                    (rowid, row["headliner"], row["support"])
+                    for row, (rowid, _) in updates
+                ],
+            )
+            conn.executemany(
+                LOG_CHANGE,
+                [
+                    (
+                        "changed",
+                        *event_key(row),
+                        _json_row(values),
+                        _json_row(row[column] for column in COMPARED_COLUMNS),
+                        changed_at,
+                    )
+                    for row, (_, values) in updates
+                ],
+            )
+
+    def _remove(
+        self, conn: sqlite3.Connection, existing: Dict[Tuple, Tuple], result: SaveResult
+    ):
+        """Delete saved events that are no longer listed."""
+        conn.executemany(
+            "DELETE FROM concerts WHERE rowid = ?",
+            [(rowid,) for rowid, _ in existing.values()],
+        )
+        changed_at = datetime.now().isoformat(timespec="seconds")
+        conn.executemany(
+            LOG_CHANGE,
+            [
+                ("removed", *key, _json_row(values), None, changed_at)
+                for key, (_, values) in existing.items()
+            ],
+        )
+        result.removed += len(existing)
+
+    def save_concerts(self, concerts: Iterable[Dict], venue: str) -> SaveResult:
+        """
+        Sync a venue's saved concerts with its current listing.
+        In one transaction, new events are inserted, events whose fields
+        changed are updated in place and events no longer listed are deleted;
+        unchanged rows are not written. Events are matched by EVENT_KEY.
+        Returns the counts of added, changed and removed rows.
+        """
+        failed: List[Dict] = []
+        result = SaveResult()
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    existing = self._existing(conn, venue)
+                    rows = self._rows(concerts, venue, failed)
+                    self._sync(conn, rows, existing, set(), result)
+                    self._remove(conn, existing, result)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+        except sqlite3.Error as e:
+            logger.error(f"Database operation failed for {venue}: {e}")
+            raise
 
-                # Delete old records for this venue
-                cursor.execute("DELETE FROM concerts WHERE venue = ?", (venue,))
-
-                # Insert new records
-                for concert in concerts:
-                    try:
-                        concert["scraped_date"] = current_date
-                        cursor.execute(
-                            """
-                            INSERT INTO concerts VALUES (
-                                :title, :date, :headliner, :venue,
-                                :show_time, :ticket_url, :image_url, :scraped_date
-                            )
-                        """,
-                            concert,
-                        )
-                        inserted += 1
-                    except sqlite3.IntegrityError as e:  # noqa
-                        # Skip duplicates (constraint violations) without counting as error
-                        logger.debug(
-                            f"Skipping duplicate concert for {venue}: {concert}"
-                        )
-                        continue
-                    except sqlite3.Error as e:
-                        errors += 1
-                        logger.error(
-                            f"Error inserting concert for {venue}: {e}\nData: {concert}"
-                        )
+        result.errors = len(failed)
+        logger.info(
+            f"Saved {venue}: {result.added} added, {result.changed} changed, "
+            f"{result.removed} removed (with {result.errors} errors)"
+        )
+        return result
+
+    def save_concerts_stream(
+        self, concerts: Iterable[Dict], venue: str, batch_size: int = 50
+    ) -> SaveResult:
+        """
+        Sync a venue's saved concerts in batches while they are still being
+        produced, as save_concerts does. The transaction starts with the
+        first batch and events no longer listed are only deleted once the
+        stream ends, so an empty or failed stream leaves the venue intact.
+        """
+        failed: List[Dict] = []
+        result = SaveResult()
+        concerts = iter(concerts)
+        existing: Optional[Dict[Tuple, Tuple]] = None
+        seen: Set[Tuple] = set()
 
+        # The write connection is only taken once the first batch is ready;
+        # leaving the stack rolls back an unfinished transaction
+        with ExitStack() as stack:
+            while True:
+                batch = list(islice(concerts, batch_size))
+                if not batch:
+                    break
+                if existing is None:
+                    conn = stack.enter_context(self.get_connection())
+                    conn.execute("BEGIN IMMEDIATE")
+                    existing = self._existing(conn, venue)
+
+                rows = self._rows(batch, venue, failed)
+                self._sync(conn, rows, existing, seen, result)
+            if existing is not None:
+                self._remove(conn, existing, result)
                 conn.commit()
-                logger.info(
-                    f"Saved {inserted} concerts for {venue} (with {errors} errors)"
+
+        result.errors = len(failed)
+        logger.info(
+            f"Streamed {venue}: {result.added} added, {result.changed} changed, "
+            f"{result.removed} removed (with {result.errors} errors)"
+        )
+        return result
+
+    def record_scrape_run(
+        self,
+        venue: str,
+        duration: float,
+        row_count: Optional[int] = None,
+        content_fingerprint: Optional[str] = None,
+    ):
+        """
+        Record a successful scrape of a venue.
+        A row count or fingerprint of None (e.g. for an unchanged listing)
+        keeps the values stored by the last scrape that saved concerts.
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO scrape_runs VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(venue) DO UPDATE SET
+                        last_success = excluded.last_success,
+                        duration = excluded.duration,
+                        row_count = COALESCE(excluded.row_count, row_count),
+                        fingerprint = COALESCE(excluded.fingerprint, fingerprint)
+                """,
+                    (
+                        venue,
+                        datetime.now().isoformat(timespec="seconds"),
+                        duration,
+                        row_count,
+                        content_fingerprint,
+                    ),
                 )
-                return inserted, errors
+                conn.commit()
         except sqlite3.Error as e:
-            logger.error(f"Database operation failed for {venue}: {e}")
+            logger.error(f"Failed to record scrape run for {venue}: {e}")
+            raise
+
+    def get_scrape_runs(self) -> Dict[str, Dict]:
+        """Return the last successful scrape of each venue, keyed by venue."""
+        with self.get_read_connection() as conn:
+            rows = conn.execute("SELECT * FROM scrape_runs").fetchall()
+        return {row["venue"]: dict(row) for row in rows}
+
+    def get_concerts(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        venues: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """
+        Return concerts in start order, optionally within a date range
+
+        Args:
+            start (date): Earliest concert date to include
+            end (date): Latest concert date to include
+            venues (Iterable[str]): Only include these venues
+
+        Returns:
+            list: Concert rows with their event details; rows without a
+                known date come last
+        """
+        clauses, params = [], []
+        if start:
+            clauses.append("date_iso >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append("date_iso <= ?")
+            params.append(end.isoformat())
+        if venues is not None:
+            venues = list(venues)
+            clauses.append(f"venue IN ({', '.join('?' * len(venues))})")
+            params.extend(venues)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_CONCERT_SELECT} FROM concerts {_DETAIL_JOIN} {where} "
+                f"ORDER BY {START_KEY}, venue",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query_concerts(
+        self,
+        venues: Optional[Iterable[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        search: Optional[str] = None,
+        sort: str = "date",
+        after: Optional[str] = None,
+        page_size: int = 50,
+    ) -> ConcertPage:
+        """
+        Return one page of concerts matching a filter, in a sort order
+
+        Pages are read by keyset: each page continues from the sort position
+        of the last row of the previous one, through the venue and start
+        indexes, so fetching a later page costs the same as the first.
+
+        Args:
+            venues (Iterable[str]): Only include these venues
+            start (date): Earliest concert date to include
+            end (date): Latest concert date to include
+            search (str): Words headliner, title or support acts must match,
+                each as a prefix
+            sort (str): One of SORT_ORDERS
+            after (str): next_cursor of the previous page, or None for the first
+            page_size (int): Most concerts to return
+
+        Returns:
+            ConcertPage: The page's concerts, the total matching the filter
+            and the cursor of the next page
+
+        Raises:
+            ValueError: If the sort order or cursor is unknown
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        keys, descending = SORT_ORDERS[sort]
+
+        clauses, params = [], []
+        if venues is not None:
+            venues = list(venues)
+            clauses.append(f"venue IN ({', '.join('?' * len(venues))})")
+            params.extend(venues)
+        if start:
+            clauses.append(f"{START_KEY} >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append(f"{START_KEY} < ?")
+            params.append((end + timedelta(days=1)).isoformat())
+        if search is not None:
+            query = match_query(search)
+            if query is None:
+                return ConcertPage([], 0)
+            clauses.append(
+                "concerts.rowid IN "
+                "(SELECT rowid FROM concerts_fts WHERE concerts_fts MATCH ?)"
+            )
+            params.append(query)
+        where = " AND ".join(clauses) or "1"
+
+        page_clause, page_params = "", []
+        if after is not None:
+            *values, rowid = decode_cursor(after, len(keys) + 1)
+            page_clause = f"AND {_after(keys, descending)}"
+            for value in values:
+                page_params.extend([value, value])
+            page_params.append(rowid)
+        direction = " DESC" if descending else ""
+        order = ", ".join(f"{key}{direction}" for key in (*keys, "concerts.rowid"))
+        selected = ", ".join(f"{key} AS sort_{i}" for i, key in enumerate(keys))
+
+        with self.get_read_connection() as conn:
+            # One read transaction, so the count and page see the same rows
+            conn.execute("BEGIN")
+            try:
+                total = conn.execute(
+                    f"SELECT count(*) FROM concerts WHERE {where}", params
+                ).fetchone()[0]
+                rows = conn.execute(
+                    f"SELECT concerts.rowid, {selected}, {_CONCERT_SELECT} "
+                    f"FROM concerts {_DETAIL_JOIN} "
+                    f"WHERE {where} {page_clause} ORDER BY {order} LIMIT ?",
+                    [*params, *page_params, page_size + 1],
+                ).fetchall()
+            finally:
+                conn.rollback()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                [*(last[f"sort_{i}"] for i in range(len(keys))), last["rowid"]]
+            )
+        # Drop the rowid and sort keys selected ahead of the concert's columns
+        skip = len(keys) + 1
+        concerts = [dict(zip(row.keys()[skip:], row[skip:])) for row in rows]
+        return ConcertPage(concerts, total, next_cursor)
+
+    def archive_past_concerts(self, before: Optional[date] = None) -> int:
+        """
+        Move concerts dated before a day into the archive
+
+        Concerts whose venue is no longer scraped are archived too, so the
+        live table only holds upcoming events. Concerts without a known date
+        stay where they are.
+
+        Args:
+            before (date): Archive concerts dated before this day, today by
+                default
+
+        Returns:
+            int: Number of concerts archived
+        """
+        cutoff = (before or date.today()).isoformat()
+        archived_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with self.get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Served by idx_concerts_start; undated concerts sort after
+                # every date, so they never fall before the cutoff
+                conn.execute(
+                    f"INSERT OR REPLACE INTO concerts_archive ({_COLUMN_LIST}, archived_at) "
+                    f"SELECT {_COLUMN_LIST}, ? FROM concerts WHERE {START_KEY} < ?",
+                    (archived_at, cutoff),
+                )
+                archived = conn.execute(
+                    f"DELETE FROM concerts WHERE {START_KEY} < ?", (cutoff,)
+                ).rowcount
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Archiving concerts before {cutoff} failed: {e}")
+            raise
+
+        logger.info(f"Archived {archived} concerts dated before {cutoff}")
+        return archived
+
+    def compact(self):
+        """
+        Return the pages freed by deletes and archiving to the filesystem
+
+        Frees pages incrementally, checkpoints the write-ahead log into the
+        database and refreshes the query planner's statistics. A database
+        created before incremental vacuuming was enabled is converted with a
+        full VACUUM the first time.
+        """
+        try:
+            with self.get_connection() as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    logger.info("Enabling incremental vacuum on concerts database")
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
+                    # VACUUM may renumber the rowids the search index and
+                    # artist links point at, since concerts has no INTEGER
+                    # PRIMARY KEY
+                    conn.execute(
+                        "INSERT INTO concerts_fts (concerts_fts) VALUES ('rebuild')"
+                    )
+                    _relink_all_artists(conn)
+                    conn.commit()
+                freed = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                # execute() steps this pragma once, freeing a single page;
+                # executescript() runs it to completion
+                conn.executescript("PRAGMA incremental_vacuum")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+                conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.error(f"Compacting concerts database failed: {e}")
             raise
+        logger.info(f"Compacted concerts database, freed {freed} pages")
+
+    def get_archived_concerts(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        venues: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Return archived concerts, most recent first
+
+        Args:
+            start (date): Earliest concert date to include
+            end (date): Latest concert date to include
+            venues (Iterable[str]): Only include these venues
+            limit (int): Most concerts to return, or None for all
+
+        Returns:
+            list: Archived concert rows, with the time each was archived
+        """
+        clauses, params = [], []
+        if start:
+            clauses.append("date_iso >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append("date_iso <= ?")
+            params.append(end.isoformat())
+        if venues is not None:
+            venues = list(venues)
+            clauses.append(f"venue IN ({', '.join('?' * len(venues))})")
+            params.extend(venues)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(-1 if limit is None else limit)
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM concerts_archive {where} "
+                "ORDER BY date_iso DESC, venue LIMIT ?",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_changes(self, since: int = 0, limit: int = 1000) -> List[Dict]:
+        """
+        Return changes made by saves after a sequence number, oldest first
+
+        Poll with the ``seq`` of the last change received to read only what
+        is new. Concerts moved to the archive are not logged as removed.
+
+        Args:
+            since (int): Sequence number of the last change already read
+            limit (int): Most changes to return
+
+        Returns:
+            list: Changes with their ``seq``, ``kind`` ("added", "changed" or
+            "removed"), the concert's venue, date and headliner, its
+            ``before`` and ``after`` values as dicts (None where the concert
+            did not exist) and when the change was saved
+        """
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM concert_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        changes = []
+        for row in rows:
+            change = dict(row)
+            for field in ("before", "after"):
+                change[field] = json.loads(row[field]) if row[field] else None
+            changes.append(change)
+        return changes
+
+    def prune_changes(self, older_than: timedelta = CHANGE_RETENTION) -> int:
+        """
+        Delete change log entries saved longer ago than ``older_than``
+
+        Returns:
+            int: Number of entries deleted
+        """
+        cutoff = (datetime.now() - older_than).isoformat(timespec="seconds")
+        try:
+            with self.get_connection() as conn:
+                # Sequence numbers grow with time, so the old entries are a
+                # prefix of the log
+                pruned = conn.execute(
+                    "DELETE FROM concert_changes WHERE seq <= "
+                    "(SELECT max(seq) FROM concert_changes WHERE changed_at < ?)",
+                    (cutoff,),
+                ).rowcount
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Pruning concert changes failed: {e}")
+            raise
+        logger.info(f"Pruned {pruned} concert changes saved before {cutoff}")
+        return pruned
+
+    def get_artist_concerts(self, name: str) -> List[Dict]:
+        """
+        Return every saved concert an artist plays, at any venue, in start order
+
+        Args:
+            name (str): Artist name, matched by its folded key (see artist_key)
+
+        Returns:
+            list: Concert rows with their event details, each with the
+            artist's ``role``
+        """
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {_CONCERT_SELECT}, concert_artists.role FROM artists
+                JOIN concert_artists ON concert_artists.artist_id = artists.id
+                JOIN concerts ON concerts.rowid = concert_artists.concert_rowid
+                {_DETAIL_JOIN}
+                WHERE artists.key = ?
+                ORDER BY {START_KEY}, concerts.venue
+            """,
+                (artist_key(name),),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_venue_artists(self, venue: str, role: Optional[str] = None) -> List[Dict]:
+        """
+        Return the artists playing a venue's saved concerts
+
+        Args:
+            venue (str): Venue name as saved
+            role (str): Only artists in this role, "headliner" or "support"
+
+        Returns:
+            list: Artists with their ``name``, ``role`` and number of
+            ``concerts``, most concerts first
+        """
+        role_clause = "AND concert_artists.role = ?" if role else ""
+        params = [venue, role] if role else [venue]
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT artists.name, concert_artists.role, count(*) AS concerts
+                FROM concerts
+                JOIN concert_artists ON concert_artists.concert_rowid = concerts.rowid
+                JOIN artists ON artists.id = concert_artists.artist_id
+                WHERE concerts.venue = ? {role_clause}
+                GROUP BY artists.id, concert_artists.role
+                ORDER BY concerts DESC, artists.key
+            """,
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_venues(self) -> List[str]:
+        """Return the names of venues with saved concerts, alphabetically."""
+        with self.get_read_connection() as conn:
+            rows = conn.execute("SELECT DISTINCT venue FROM concerts ORDER BY venue")
+            return [row["venue"] for row in rows]
+
+    def search_concerts(
+        self,
+        text: str,
+        venues: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 50,
+    ) -> List[Dict]:
+        """
+        Search headliners, titles and support acts, best matches first
+
+        Args:
+            text (str): Words to search for, each matched as a prefix
+            venues (Iterable[str]): Only include these venues
+            limit (int): Most matches to return, or None for all
+
+        Returns:
+            list: Concert rows with their event details, ranked by relevance
+            with headliner matches weighted above title and support matches,
+            then in start order
+        """
+        query = match_query(text)
+        if query is None:
+            return []
+        params: List = [query]
+        venue_clause = ""
+        if venues is not None:
+            venues = list(venues)
+            venue_clause = f"AND concerts.venue IN ({', '.join('?' * len(venues))})"
+            params.extend(venues)
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS.values())
+        params.append(-1 if limit is None else limit)
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {_CONCERT_SELECT} FROM concerts_fts
+                JOIN concerts ON concerts.rowid = concerts_fts.rowid
+                {_DETAIL_JOIN}
+                WHERE concerts_fts MATCH ? {venue_clause}
+                ORDER BY bm25(concerts_fts, {weights}),
+                    concerts.starts_at IS NULL, concerts.starts_at
+                LIMIT ?
+            """,
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
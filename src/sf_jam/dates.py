@@ -0,0 +1,273 @@
+import calendar
+import re
+from datetime import date, time, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Formats seen across venue listings, tried after a venue's own hints
+DEFAULT_FORMATS = (
+    "%a %b %d",  # 'Fri Jan 24'
+    "%b %d %a",  # 'Jan 24 Fri'
+    "%a %b %d, %Y",  # 'Fri Jan 24, 2025'
+    "%a, %b %d, %Y",  # 'Sat, Feb 1, 2025'
+    "%m.%d %a",  # '2.17 Mon'
+    "%a %m.%d",  # 'Tue 2.18'
+)
+
+# How dates are shown, e.g. 'Sat, Feb 01, 2025'
+DISPLAY_FORMAT = "%a, %b %d, %Y"
+
+# A listing without a year is assumed to show upcoming events, so a date
+# further in the past than this belongs to next year
+PAST_GRACE = timedelta(days=30)
+
+# Show times like "8pm", "8:00 PM" or "Show: 7:30 p.m."
+_TIME_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s*m\b\.?", re.IGNORECASE)
+
+# Parsed strings remembered per parser before the memo is reset
+CACHE_SIZE = 4096
+
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_abbr)}
+WEEKDAYS = {name.lower(): number for number, name in enumerate(calendar.day_abbr)}
+
+# strptime directives supported by compile_format, as regex groups
+_DIRECTIVES = {
+    "a": r"(?P<weekday>[a-z]{3,9}\.?)",
+    "A": r"(?P<weekday>[a-z]{3,9}\.?)",
+    "b": r"(?P<month_name>[a-z]{3,9}\.?)",
+    "B": r"(?P<month_name>[a-z]{3,9}\.?)",
+    "d": r"(?P<day>\d{1,2})",
+    "m": r"(?P<month>\d{1,2})",
+    "Y": r"(?P<year>\d{4})",
+    "y": r"(?P<short_year>\d{2})",
+}
+
+
+@lru_cache(maxsize=None)
+def compile_format(fmt: str) -> re.Pattern:
+    """
+    Compile a strptime-style format into a regular expression
+
+    Whitespace in the format matches any run of whitespace, as with
+    strptime. A miss is a failed match rather than a raised ValueError.
+
+    Args:
+        fmt (str): Format using the directives %a %A %b %B %d %m %Y %y
+
+    Returns:
+        re.Pattern: Case-insensitive pattern with named groups per directive
+
+    Raises:
+        ValueError: If the format uses an unsupported directive
+    """
+    parts = []
+    chars = iter(fmt)
+    for char in chars:
+        if char == "%":
+            directive = next(chars, "")
+            if directive not in _DIRECTIVES:
+                raise ValueError(f"Unsupported date directive %{directive} in {fmt!r}")
+            parts.append(_DIRECTIVES[directive])
+        elif char.isspace():
+            parts.append(r"\s*")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def infer_year(
+    month: int,
+    day: int,
+    weekday: Optional[int],
+    today: date,
+    grace: timedelta = PAST_GRACE,
+) -> Optional[date]:
+    """
+    Pick the year of a month and day shown without one
+
+    Listings show upcoming events, so the first occurrence no more than
+    ``grace`` in the past wins: "Jan 10" seen in December is next January.
+    When the weekday is known, only years where the date falls on that
+    weekday are considered.
+
+    Args:
+        month (int): Month number
+        day (int): Day of the month
+        weekday (int): Weekday shown alongside, Monday being 0, or None
+        today (date): Date the listing was read
+        grace (timedelta): How far in the past an event may still be listed
+
+    Returns:
+        date: The inferred date, or None if the month has no such day
+    """
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    if weekday is not None:
+        matching = [d for d in candidates if d.weekday() == weekday]
+        candidates = matching or candidates
+    upcoming = [d for d in candidates if d >= today - grace]
+    if upcoming:
+        return upcoming[0]
+    return candidates[-1] if candidates else None
+
+
+def _name_number(value: Optional[str], names: Dict[str, int]) -> Optional[int]:
+    return names.get(value[:3].lower()) if value else None
+
+
+class DateParser:
+    """
+    Parse listing dates with a venue's known formats first.
+
+    Formats are compiled once and tried in order (the venue's hints, then
+    the shared defaults). Results are memoized per string, so repeated
+    dates on a listing are only matched once; the memo is reset daily since
+    year inference depends on the current date.
+    """
+
+    def __init__(
+        self,
+        formats: Sequence[str] = (),
+        today: Callable[[], date] = date.today,
+    ):
+        """
+        Args:
+            formats (Sequence[str]): Formats this venue is known to use
+            today (Callable): Returns the current date, for year inference
+        """
+        ordered = list(dict.fromkeys([*formats, *DEFAULT_FORMATS]))
+        self.patterns: List[Tuple[str, re.Pattern]] = [
+            (fmt, compile_format(fmt)) for fmt in ordered
+        ]
+        self.today = today
+        self._cache: Dict[str, Optional[date]] = {}
+        self._cache_day: Optional[date] = None
+
+    def parse(self, text: str) -> Optional[date]:
+        """
+        Parse a date string
+
+        Args:
+            text (str): Date as shown on the listing
+
+        Returns:
+            date: The parsed date, or None if no format matches
+        """
+        today = self.today()
+        if today != self._cache_day:
+            self._cache = {}
+            self._cache_day = today
+        key = " ".join(text.split())
+        if key in self._cache:
+            return self._cache[key]
+
+        parsed = self._match(key, today)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache = {}
+        self._cache[key] = parsed
+        return parsed
+
+    def parse_many(self, texts: Iterable[str]) -> List[Optional[date]]:
+        """Parse a batch of date strings, matching each distinct one once."""
+        return [self.parse(text) for text in texts]
+
+    def _match(self, text: str, today: date) -> Optional[date]:
+        for _, pattern in self.patterns:
+            match = pattern.fullmatch(text)
+            if match:
+                parsed = self._build(match.groupdict(), today)
+                if parsed:
+                    return parsed
+        return None
+
+    @staticmethod
+    def _build(groups: Dict[str, Optional[str]], today: date) -> Optional[date]:
+        """Turn matched groups into a date; None if they are not a real date."""
+        if groups.get("month"):
+            month = int(groups["month"])
+        else:
+            month = _name_number(groups.get("month_name"), MONTHS)
+        weekday = _name_number(groups.get("weekday"), WEEKDAYS)
+        if not month or (groups.get("weekday") and weekday is None):
+            return None
+        day = int(groups["day"])
+
+        year = groups.get("year")
+        if groups.get("short_year"):
+            year = 2000 + int(groups["short_year"])
+        if year:
+            try:
+                return date(int(year), month, day)
+            except ValueError:
+                return None
+        return infer_year(month, day, weekday, today)
+
+
+@lru_cache(maxsize=None)
+def get_parser(formats: Tuple[str, ...] = ()) -> DateParser:
+    """Return the shared parser for a set of format hints."""
+    return DateParser(formats)
+
+
+def parse_date(text: str, formats: Sequence[str] = ()) -> Optional[date]:
+    """
+    Parse a listing date, trying ``formats`` before the defaults
+
+    Args:
+        text (str): Date as shown on the listing
+        formats (Sequence[str]): The venue's known formats
+
+    Returns:
+        date: The parsed date, or None if no format matches
+    """
+    return get_parser(tuple(formats)).parse(text)
+
+
+def parse_dates(
+    texts: Iterable[str], formats: Sequence[str] = ()
+) -> List[Optional[date]]:
+    """Parse a batch of listing dates, see parse_date."""
+    return get_parser(tuple(formats)).parse_many(texts)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def display_date(value: date) -> str:
+    """Format a date the way it is displayed, e.g. 'Sat, Feb 01, 2025'."""
+    return value.strftime(DISPLAY_FORMAT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_time(text: Optional[str]) -> Optional[time]:
+    """
+    Read a 12-hour show time such as "8pm", "8:00 PM" or "Show: 7:30 p.m."
+
+    Returns:
+        time: The time, or None if the text holds no valid time
+    """
+    match = _TIME_RE.search(text) if text else None
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if not (1 <= hour <= 12 and minute < 60):
+        return None
+    hour = hour % 12 + (12 if match.group(3).lower() == "p" else 0)
+    return time(hour, minute)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def start_iso(date_iso: Optional[str], show_time: Optional[str]) -> Optional[str]:
+    """
+    Combine an ISO date and a show time into a sortable ISO start
+
+    Returns:
+        str: e.g. "2025-02-01T20:00", just the date when the time is unknown,
+        or None without a date
+    """
+    if not date_iso:
+        return None
+    parsed = parse_time(show_time)
+    return f"{date_iso}T{parsed:%H:%M}" if parsed else date_iso
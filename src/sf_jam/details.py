@@ -0,0 +1,242 @@
+import contextvars
+import html as html_lib
+import logging
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+import http_client
+from database import DETAIL_COLUMNS, ConcertDatabase
+from jsonld import extract_events, to_concert
+from offload import parse_page
+
+logger = logging.getLogger(__name__)
+
+# Concert fields filled in from event detail pages
+DETAIL_FIELDS = DETAIL_COLUMNS
+
+# URLs looked up per query, well below SQLite's bound parameter limit
+LOOKUP_BATCH = 500
+
+# Detail pages are read from their text once scripts and tags are dropped,
+# so a page never has to be parsed into a tree
+_HIDDEN_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_AGE_RE = re.compile(
+    r"\b(all ages|\d{2}\s*\+|\d{2} (?:and|&) (?:over|up))", re.IGNORECASE
+)
+_PRICE_RE = re.compile(r"\$\d+(?:\.\d{2})?(?:\s*[-–]\s*\$\d+(?:\.\d{2})?)?")
+_DOORS_RE = re.compile(
+    r"\bdoors?(?:\s+open)?(?:\s+at)?\s*:?\s*(\d{1,2}(?::\d{2})?\s*[ap]\.?m\.?)",
+    re.IGNORECASE,
+)
+_GENRE_RE = re.compile(r"\bgenres?\s*:\s*([^|\n]{2,60}?)(?:\s{2,}|$|\|)", re.IGNORECASE)
+
+
+def _offer_price(offers) -> Optional[str]:
+    """Format the price range of schema.org offers, e.g. "$25 - $40"."""
+    offers = offers if isinstance(offers, list) else [offers]
+    prices = []
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        for key in ("price", "lowPrice", "highPrice"):
+            try:
+                prices.append(float(offer[key]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    if not prices:
+        return None
+    low, high = (
+        f"${price:g}" if price.is_integer() else f"${price:.2f}"
+        for price in (min(prices), max(prices))
+    )
+    return low if low == high else f"{low} - {high}"
+
+
+def _event_genre(event: Dict) -> Optional[str]:
+    """Read a genre from an event or its first performer."""
+    for source in (event, event.get("performer")):
+        if isinstance(source, list):
+            source = source[0] if source else None
+        if isinstance(source, dict):
+            genre = source.get("genre")
+            if isinstance(genre, list):
+                genre = ", ".join(g for g in genre if isinstance(g, str))
+            if isinstance(genre, str) and genre.strip():
+                return genre.strip()
+    return None
+
+
+def _search(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    if not match:
+        return None
+    return " ".join((match.group(1) if match.groups() else match.group(0)).split())
+
+
+def parse_details(html: str) -> Dict[str, Optional[str]]:
+    """
+    Extract the age restriction, price range, genre and door time of an event
+
+    Embedded JSON-LD is read first; fields it does not provide are searched
+    for in the page text.
+
+    Args:
+        html (str): HTML of the event's ticket or detail page
+
+    Returns:
+        dict: Values for DETAIL_FIELDS, None where not found
+    """
+    details: Dict[str, Optional[str]] = dict.fromkeys(DETAIL_FIELDS)
+    events = extract_events(html)
+    if events:
+        event = events[0]
+        concert = to_concert(event) or {}
+        age = event.get("typicalAgeRange")
+        details.update(
+            age_restriction=age if isinstance(age, str) and age else None,
+            price_range=_offer_price(event.get("offers")),
+            genre=_event_genre(event),
+            door_time=concert.get("door_time"),
+        )
+
+    if not all(details.values()):
+        text = html_lib.unescape(_TAG_RE.sub(" ", _HIDDEN_RE.sub(" ", html)))
+        details["age_restriction"] = details["age_restriction"] or _search(
+            _AGE_RE, text
+        )
+        details["price_range"] = details["price_range"] or _search(_PRICE_RE, text)
+        details["genre"] = details["genre"] or _search(_GENRE_RE, text)
+        details["door_time"] = details["door_time"] or _search(_DOORS_RE, text)
+    return details
+
+
+class DetailStore:
+    """Event details fetched from detail pages, cached per ticket URL."""
+
+    def __init__(self, db: ConcertDatabase):
+        """
+        Args:
+            db (ConcertDatabase): Database whose connections the store shares
+        """
+        self.db = db
+
+    def get_many(
+        self, ticket_urls: Iterable[str], max_age: Optional[timedelta] = None
+    ) -> Dict[str, Dict]:
+        """
+        Return stored details for the given URLs, keyed by ticket URL
+
+        Args:
+            ticket_urls (Iterable[str]): URLs to look up
+            max_age (timedelta): Ignore details fetched longer ago than this
+
+        Returns:
+            dict: Details of each URL found
+        """
+        cutoff = (
+            (datetime.now() - max_age).isoformat(timespec="seconds") if max_age else ""
+        )
+        found = {}
+        urls = iter(ticket_urls)
+        with self.db.get_read_connection() as conn:
+            while batch := list(islice(urls, LOOKUP_BATCH)):
+                placeholders = ", ".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT * FROM event_details WHERE fetched_at >= ? "
+                    f"AND ticket_url IN ({placeholders})",
+                    [cutoff, *batch],
+                )
+                found.update((row["ticket_url"], dict(row)) for row in rows)
+        return found
+
+    def save_many(self, details: Dict[str, Dict]):
+        """Store details keyed by ticket URL in a single transaction."""
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (url, *(values.get(key) for key in DETAIL_FIELDS), fetched_at)
+            for url, values in details.items()
+        ]
+        try:
+            with self.db.get_connection() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO event_details VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save details for {len(rows)} events: {e}")
+            raise
+
+
+class DetailEnricher:
+    """
+    Fetch event detail pages for concerts not seen recently.
+
+    Pages are fetched on a bounded thread pool and parsed like listing pages.
+    Details are cached by ticket URL for ``ttl``, so a daily run only fetches
+    events it has not seen before. Failed pages are skipped and retried on
+    the next run.
+    """
+
+    def __init__(
+        self,
+        db: ConcertDatabase,
+        max_workers: int = 4,
+        ttl: timedelta = timedelta(days=7),
+    ):
+        self.store = DetailStore(db)
+        self.max_workers = max_workers
+        self.ttl = ttl
+
+    def enrich(self, ticket_urls: Iterable[str]) -> int:
+        """
+        Fetch and store details for ticket URLs missing from the cache
+
+        Args:
+            ticket_urls (Iterable[str]): Ticket URLs of saved concerts
+
+        Returns:
+            int: Number of detail pages fetched
+        """
+        urls = list(dict.fromkeys(url for url in ticket_urls if url))
+        cached = self.store.get_many(urls, self.ttl)
+        missing = [url for url in urls if url not in cached]
+        if not missing:
+            return 0
+
+        details: Dict[str, Dict] = {}
+        failures: List[str] = []
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="details"
+        ) as executor:
+            # Tasks run in a copy of the caller's context to keep its time
+            # budget and parse pool
+            futures = {
+                executor.submit(contextvars.copy_context().run, self._fetch, url): url
+                for url in missing
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    details[url] = future.result()
+                except Exception as e:
+                    logger.debug(f"Could not fetch details from {url}: {e}")
+                    failures.append(url)
+
+        if details:
+            self.store.save_many(details)
+        logger.info(
+            f"Fetched details for {len(details)} events "
+            f"({len(cached)} cached, {len(failures)} failed)"
+        )
+        return len(details)
+
+    @staticmethod
+    def _fetch(url: str) -> Dict[str, Optional[str]]:
+        response = http_client.get(url)
+        return parse_page(parse_details, response.text)
@@ -0,0 +1,218 @@
+import codecs
+import contextvars
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import budget
+import requests
+from headers import headers
+from requests.adapters import HTTPAdapter
+from throttle import get_guard
+from validators import NotModified, ValidatorStore
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds applied to every request
+DEFAULT_TIMEOUT = (5, 20)
+
+# Bytes read from the socket at a time when streaming a page
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Number of distinct hosts to keep connection pools for, and the number of
+# keep-alive connections kept open to each host
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 4
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_validators: Optional[ValidatorStore] = None
+
+# Responses already fetched for the venue being scraped, keyed by URL
+_payloads: contextvars.ContextVar[
+    Optional[Dict[str, requests.Response]]
+] = contextvars.ContextVar("payloads", default=None)
+
+
+def _build_session() -> requests.Session:
+    """Create a session with pooled adapters and the default headers."""
+    session = requests.Session()
+    session.headers.update(headers)
+
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared HTTP session, creating it on first use
+
+    Returns:
+        requests.Session: Session reused by every venue module
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def set_validator_store(store: Optional[ValidatorStore]):
+    """Use ``store`` to remember and send cache validators for fetched URLs."""
+    global _validators
+    _validators = store
+
+
+@contextmanager
+def reuse_payloads(payloads: Dict[str, requests.Response]):
+    """
+    Serve repeated GETs inside this block from ``payloads``
+
+    Successful responses are added to ``payloads``, so a retried scrape does
+    not download pages that were already fetched.
+    """
+    token = _payloads.set(payloads)
+    try:
+        yield
+    finally:
+        _payloads.reset(token)
+
+
+def _send(url: str, cached: Optional[dict], **kwargs) -> requests.Response:
+    """
+    Send a GET with any cached validators and raise on 304 or HTTP errors.
+    Requests wait for the host's rate limit and fail fast with
+    CircuitOpenError while the host's circuit is open. Timeouts are clipped
+    to what is left of the scrape's time budget.
+    """
+    kwargs["timeout"] = budget.request_timeout(kwargs.get("timeout", DEFAULT_TIMEOUT))
+    if cached:
+        request_headers = dict(kwargs.pop("headers", None) or {})
+        if cached["etag"]:
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+        kwargs["headers"] = request_headers
+
+    guard = get_guard(urlsplit(url).netloc)
+    guard.before_request()
+    try:
+        response = get_session().get(url, **kwargs)
+    except Exception:
+        # Any request that ends without a response is a failure, which also
+        # releases a half-open circuit's probe
+        guard.record(None)
+        raise
+    guard.record(response)
+    logger.debug(f"GET {url} -> {response.status_code}")
+    if response.status_code == 304:
+        response.close()
+        raise NotModified(url)
+    response.raise_for_status()
+    return response
+
+
+def get(url: str, conditional: bool = False, **kwargs) -> requests.Response:
+    """
+    GET a URL through the shared session and raise on HTTP errors
+
+    When a validator store is configured, every successful response gets an
+    ``unchanged`` attribute telling whether its body matches the last
+    committed fetch. With ``conditional`` set, stored ETag/Last-Modified
+    values are sent and NotModified is raised on a 304 or identical body.
+
+    Args:
+        url (str): URL to fetch
+        conditional (bool): Skip unchanged pages by raising NotModified
+        **kwargs: Extra arguments passed to requests, e.g. params or timeout
+
+    Returns:
+        requests.Response: The successful response
+    """
+    payloads = _payloads.get()
+    if payloads is not None and url in payloads:
+        return payloads[url]
+
+    store = _validators
+    cached = store.get(url) if store else None
+    response = _send(url, cached if conditional else None, **kwargs)
+
+    if store:
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        response.unchanged = bool(cached) and cached["body_hash"] == body_hash
+        store.stage(
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            body_hash,
+        )
+        if conditional and response.unchanged:
+            raise NotModified(url)
+
+    if payloads is not None:
+        payloads[url] = response
+    return response
+
+
+def stream(url: str, conditional: bool = False, **kwargs) -> Iterator[str]:
+    """
+    GET a URL and yield its decoded text as it arrives
+
+    The request is only sent once the generator is first advanced. With
+    ``conditional`` set, NotModified is raised on a 304; the body hash can
+    only be checked after the last chunk, so it is recorded but never used
+    to skip a streamed page.
+
+    Args:
+        url (str): URL to fetch
+        conditional (bool): Send stored validators and stop on a 304
+        **kwargs: Extra arguments passed to requests, e.g. params or timeout
+
+    Yields:
+        str: Chunks of the response body
+    """
+    store = _validators
+    cached = store.get(url) if store and conditional else None
+    response = _send(url, cached, stream=True, **kwargs)
+
+    # Without a declared charset requests assumes ISO-8859-1 for text/html,
+    # while the venue sites all serve UTF-8
+    declared = "charset" in response.headers.get("Content-Type", "").lower()
+    encoding = response.encoding if declared and response.encoding else "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    body_hash = hashlib.sha256()
+
+    with response:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            # The read timeout bounds each chunk, not the whole body
+            budget.check()
+            body_hash.update(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    if store:
+        store.stage(
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            body_hash.hexdigest(),
+        )
+
+
+def close():
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
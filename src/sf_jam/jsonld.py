@@ -0,0 +1,182 @@
+import html as html_lib
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from dates import display_date
+from models import Concert
+
+logger = logging.getLogger(__name__)
+
+# schema.org types describing a single show
+EVENT_TYPES = {
+    "Event",
+    "MusicEvent",
+    "ComedyEvent",
+    "DanceEvent",
+    "Festival",
+    "TheaterEvent",
+}
+
+# JSON-LD blocks are located with a regex so the page never has to be parsed
+# into a tree when they cover the whole listing
+_SCRIPT_RE = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _walk(node) -> Iterator[Dict]:
+    """Yield every event object in a JSON-LD document."""
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+    elif isinstance(node, dict):
+        node_type = node.get("@type")
+        types = node_type if isinstance(node_type, list) else [node_type]
+        if EVENT_TYPES.intersection(t for t in types if isinstance(t, str)):
+            yield node
+            return
+        for key in ("@graph", "itemListElement", "item", "event", "events"):
+            if key in node:
+                yield from _walk(node[key])
+
+
+def extract_events(html: str) -> List[Dict]:
+    """
+    Find the schema.org Event objects embedded in a page
+
+    Args:
+        html (str): HTML of the page
+
+    Returns:
+        list: Raw JSON-LD event objects, in page order
+    """
+    events = []
+    for block in _SCRIPT_RE.findall(html):
+        try:
+            document = json.loads(block.strip())
+        except ValueError:
+            logger.debug("Skipping malformed JSON-LD block")
+            continue
+        events.extend(_walk(document))
+    return events
+
+
+def _first(value):
+    """Return the first item of a list, or the value itself."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _name(value) -> Optional[str]:
+    """Read a name from a string or a schema.org Thing."""
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get("name")
+    return html_lib.unescape(value).strip() if isinstance(value, str) else None
+
+
+def _url(value) -> Optional[str]:
+    """Read a URL from a string, a list or an object with a url."""
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get("url") or value.get("contentUrl")
+    return value if isinstance(value, str) and value else None
+
+
+def _parse_iso(value) -> Optional[datetime]:
+    """Parse an ISO 8601 date or datetime, or return None."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _format_time(value: datetime) -> str:
+    """Format a time like the listing pages do, e.g. "8:00 PM"."""
+    return value.strftime("%I:%M %p").lstrip("0")
+
+
+def to_concert(event: Dict, venue: Optional[str] = None) -> Optional[Concert]:
+    """
+    Convert a JSON-LD event into a concert record
+
+    Args:
+        event (dict): A schema.org Event object
+        venue (str): Venue name to store, or None to use the event's location
+
+    Returns:
+        Concert: Concert data, or None if the event has no name or start date
+    """
+    title = _name(event.get("name"))
+    start = _parse_iso(event.get("startDate"))
+    if not (title and start):
+        return None
+
+    performers = event.get("performer") or []
+    if not isinstance(performers, list):
+        performers = [performers]
+    performer_names = [name for name in map(_name, performers) if name]
+
+    has_time = "T" in event["startDate"]
+    door = _parse_iso(event.get("doorTime"))
+    concert = {
+        "title": title,
+        "date": display_date(start),
+        "date_iso": start.date().isoformat(),
+        "headliner": performer_names[0] if performer_names else title,
+        "venue": venue or _name(event.get("location")),
+        "show_time": _format_time(start) if has_time else None,
+        "ticket_url": _url(event.get("offers")) or _url(event.get("url")),
+        "image_url": _url(event.get("image")),
+    }
+    if len(performer_names) > 1:
+        concert["support"] = ", ".join(performer_names[1:])
+    if door:
+        concert["door_time"] = _format_time(door)
+    return concert
+
+
+def parse_with_fallback(
+    html: str,
+    fallback: Callable[[str], List[Concert]],
+    venue: Optional[str] = None,
+    card_marker: Union[str, re.Pattern, None] = None,
+) -> List[Concert]:
+    """
+    Read concerts from embedded JSON-LD, falling back to the venue's parser
+
+    JSON-LD is only trusted when it covers the listing: it must contain at
+    least as many events as ``card_marker`` (the listing card's class
+    attribute) occurs in the page, so a page embedding only a featured show
+    is still parsed from its markup.
+
+    Args:
+        html (str): HTML of the concert listings page
+        fallback (Callable): The venue's HTML parser
+        venue (str): Venue name to store on JSON-LD concerts
+        card_marker (str | re.Pattern): Text, or a pattern, matching once
+            per listing card
+
+    Returns:
+        list: List of Concert objects
+    """
+    concerts = [
+        concert
+        for concert in (to_concert(event, venue) for event in extract_events(html))
+        if concert
+    ]
+    if isinstance(card_marker, re.Pattern):
+        expected = len(card_marker.findall(html))
+    else:
+        expected = html.count(card_marker) if card_marker else 0
+    if concerts and len(concerts) >= expected:
+        logger.debug(f"Read {len(concerts)} concerts from JSON-LD")
+        return concerts
+    return fallback(html)
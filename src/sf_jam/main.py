@@ -6,6 +6,7 @@ import traceback
 from datetime import datetime
 
 import schedule  # type: ignore
+from database import ConcertDatabase
 from scraper import ConcertScraper
 
 # Set up logging
@@ -16,6 +17,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Comma-separated venue names to scrape instead of every registered venue
+VENUES_ENV = "SF_JAM_VENUES"
+
+
+def selected_venues():
+    """Return the venues named in SF_JAM_VENUES, or None to scrape them all."""
+    value = os.environ.get(VENUES_ENV, "")
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    return names or None
+
 
 def run_scheduler():
     """Run the scheduler with proper error handling and shutdown capability."""
@@ -34,35 +45,62 @@ def run_scheduler():
 def scrape_task():
     try:
         scraper = ConcertScraper()
-        results = scraper.scrape_all_venues()
-
-        # Log overall results
-        success_count = sum(1 for success in results.values() if success)
-        logger.info(
-            f"Scraping completed at {datetime.now()}. "
-            f"{success_count}/{len(results)} venues successful"
-        )
-
-        for venue, success in results.items():
-            status = "✓" if success else "✗"
-            logger.info(f"{status} {venue}")
+        try:
+            results = scraper.scrape_all_venues(
+                venues=selected_venues(), stale_only=True
+            )
+
+            # Log overall results
+            success_count = sum(1 for success in results.values() if success)
+            logger.info(
+                f"Scraping completed at {datetime.now()}. "
+                f"{success_count}/{len(results)} venues successful"
+            )
+
+            for venue, success in results.items():
+                status = "✓" if success else "✗"
+                duration = scraper.durations.get(venue, 0.0)
+                timed_out = " timed out" if venue in results.timed_out else ""
+                logger.info(f"{status} {venue} ({duration:.1f}s){timed_out}")
+
+            for host, state in results.breakers.items():
+                if state != "closed":
+                    logger.warning(f"Circuit {state} for {host}")
+        finally:
+            scraper.close()
 
     except Exception as e:
         logger.error(f"Critical error in scrape_task: {e}\n{traceback.format_exc()}")
         time.sleep(300)  # Wait 5 minutes before next attempt
 
 
+def maintenance_task():
+    """Archive past concerts, prune old changes and compact the database."""
+    try:
+        db = ConcertDatabase()
+        try:
+            db.archive_past_concerts()
+            db.prune_changes()
+            db.compact()
+        finally:
+            db.close()
+    except Exception as e:
+        logger.error(f"Database maintenance failed: {e}\n{traceback.format_exc()}")
+
+
 def run_scraper():
     try:
-        # Run initial scrape if concerts have not been populated
-        if not os.path.exists("concerts.db"):
-            logger.info("Starting initial scrape...")
-            scrape_task()
-        else:
-            logger.info("Concerts database exists. Skipping initial scrape.")
+        # Refresh venues whose data is missing or stale, most stale first
+        logger.info("Starting initial scrape of stale venues...")
+        scrape_task()
+
+        # Keep only upcoming concerts in the live table
+        maintenance_task()
 
         # Schedule daily scrape
         schedule.every().day.at("14:30").do(scrape_task)  # Runs at 6:30 AM
+        # Schedule daily archiving and compaction
+        schedule.every().day.at("11:00").do(maintenance_task)  # Runs at 3:00 AM
 
         # Create and start scheduler thread
         scheduler_thread = threading.Thread(target=run_scheduler)
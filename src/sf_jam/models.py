@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 
 @dataclass
@@ -9,6 +10,98 @@ class VenueConfig:
     name: str
     retrieval_func: Callable[[], List[Dict]]
     db_name: str
+    host: Optional[str] = None
+    stream_func: Optional[Callable[[], Iterator[Dict]]] = None
+
+
+@dataclass
+class VenueSpec:
+    """
+    Where to find a venue's scraper, so its module is only imported when the
+    venue is scraped. Functions are named by attribute on ``module``.
+    """
+
+    name: str
+    module: str
+    retrieval_func: str
+    db_name: str
+    host: Optional[str] = None
+    stream_func: Optional[str] = None
+
+
+@dataclass
+class VenueRun:
+    """State of one venue's scrape, kept across its retry attempts."""
+
+    config: VenueConfig
+    attempts: int = 0
+    # Concerts retrieved by an earlier attempt, so a failed save is retried
+    # without fetching or parsing again
+    concerts: Optional[List[Dict]] = None
+    # Pages fetched by earlier attempts, keyed by URL
+    payloads: Dict[str, Any] = field(default_factory=dict)
+    success: Optional[bool] = None
+    duration: float = 0.0
+    # Monotonic time by which the venue has to finish, set on its first attempt
+    deadline: Optional[float] = None
+    timed_out: bool = False
+    # Held while the venue is saved and marked fresh, and while the run
+    # cancels it, so an attempt never saves a venue already cancelled
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+    # Rows saved and content fingerprint of the successful attempt
+    row_count: Optional[int] = None
+    fingerprint: Optional[str] = None
+    # Ticket URLs of the saved concerts, for fetching event details
+    ticket_urls: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SaveResult:
+    """What saving a venue's listing changed in the database."""
+
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    # Concerts that could not be saved
+    errors: int = 0
+
+    @property
+    def row_count(self) -> int:
+        """Number of concerts the venue has once the listing is saved."""
+        return self.added + self.changed + self.unchanged
+
+
+@dataclass
+class ConcertPage:
+    """One page of a concert query."""
+
+    concerts: List[Dict]
+    # Concerts matching the query across all pages
+    total: int
+    # Pass as ``after`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class ScrapeResults(dict):
+    """
+    Success of each venue in a run, keyed by venue name, along with the
+    circuit breaker state ("closed", "open" or "half_open") of each host
+    contacted, in ``breakers``, and the venues cancelled for running over
+    their time budget, in ``timed_out``.
+    """
+
+    def __init__(
+        self,
+        results: Dict[str, bool],
+        breakers: Dict[str, str],
+        timed_out: Optional[List[str]] = None,
+    ):
+        super().__init__(results)
+        self.breakers = breakers
+        self.timed_out = timed_out or []
 
 
 @dataclass
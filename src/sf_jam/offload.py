@@ -0,0 +1,210 @@
+import contextvars
+import logging
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Callable, Optional, TypeVar
+
+import budget
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Extra seconds the parent waits past a task's own time limit before giving
+# up on it, e.g. when the worker is stuck inside C code that cannot be
+# interrupted
+TIMEOUT_GRACE = 5
+
+_current_pool: contextvars.ContextVar[Optional["ParsePool"]] = contextvars.ContextVar(
+    "parse_pool", default=None
+)
+
+
+class ParseTimeout(Exception):
+    """Raised when parsing a page takes longer than its time limit."""
+
+
+def _init_worker(memory_limit: Optional[int]):
+    """Cap the worker's address space so an oversized page fails on its own."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout("Parse time limit exceeded")
+
+
+def _run_limited(time_limit: Optional[float], func: Callable, *args, **kwargs):
+    """Run ``func`` in a worker, interrupting it after ``time_limit`` seconds."""
+    use_alarm = bool(time_limit) and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ParsePool:
+    """
+    Process pool running venue parse functions off the scraping threads.
+
+    Parsing with BeautifulSoup holds the GIL, so threads only overlap the
+    network half of a scrape. Raw HTML is sent to worker processes instead
+    and plain concert dicts come back. Each worker's memory is capped and
+    each task is interrupted once it exceeds its time limit, so a stuck or
+    oversized page fails on its own without stalling the run.
+    """
+
+    def __init__(
+        self,
+        processes: int = 2,
+        time_limit: Optional[float] = 30,
+        memory_limit_mb: Optional[int] = 512,
+    ):
+        """
+        Args:
+            processes (int): Number of worker processes
+            time_limit (float): Seconds a single parse may take, or None
+            memory_limit_mb (int): Address space limit per worker, or None
+        """
+        self.processes = processes
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 2**20 if memory_limit_mb else None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked workers, since the scraper forks from a
+        # process already running threads and holding sockets
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.memory_limit,),
+        )
+
+    def _replace(self, executor: ProcessPoolExecutor):
+        """Kill ``executor``'s workers and, unless already done, start anew."""
+        with self._lock:
+            if self._executor is executor and not self._closed:
+                self._executor = self._new_executor()
+        _terminate(executor)
+
+    def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a module-level parse function in a worker and wait for its result
+
+        A worker stuck past the time limit (e.g. inside C code, where the
+        alarm cannot interrupt it) is killed and the pool replaced, as it is
+        when a worker crashes. Tasks lost with the old pool are sent to the
+        new one once, so a crash only fails the task that caused it.
+
+        Raises:
+            ParseTimeout: If the task exceeds its time limit
+            MemoryError: If the worker runs out of its memory allowance
+            BrokenProcessPool: If the task's worker died twice
+            BudgetExceeded: If the scrape's time budget runs out first
+        """
+        for resend in (True, False):
+            executor = self._executor
+            try:
+                return self._run_on(executor, func, *args, **kwargs)
+            except BrokenProcessPool:
+                self._replace(executor)
+                if not resend:
+                    logger.error(f"Parse worker died running {func.__qualname__}")
+                    raise
+
+    def _run_on(
+        self, executor: ProcessPoolExecutor, func: Callable[..., T], *args, **kwargs
+    ) -> T:
+        try:
+            future = executor.submit(
+                _run_limited, self.time_limit, func, *args, **kwargs
+            )
+        except RuntimeError as e:
+            # Shut down by another thread replacing it
+            raise BrokenProcessPool(str(e)) from e
+        timeout = self.time_limit + TIMEOUT_GRACE if self.time_limit else None
+        left = budget.remaining()
+        # Stop waiting early when the scrape's budget runs out first
+        budget_bound = left is not None and (timeout is None or left < timeout)
+        try:
+            return future.result(timeout=max(left, 0) if budget_bound else timeout)
+        except FutureTimeout:
+            future.cancel()
+            if budget_bound:
+                raise budget.BudgetExceeded(
+                    f"Time budget ran out parsing with {func.__qualname__}"
+                )
+            # The worker ignored its own alarm and is still busy
+            logger.error(f"Killing parse worker stuck in {func.__qualname__}")
+            self._replace(executor)
+            raise ParseTimeout(f"{func.__qualname__} did not finish in {timeout}s")
+
+    def close(self):
+        """Shut the worker processes down, killing any still running a task."""
+        with self._lock:
+            self._closed = True
+        _terminate(self._executor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _terminate(executor: ProcessPoolExecutor):
+    """Shut an executor down without waiting, killing its live workers."""
+    # Workers are only reachable through the executor's internals; it has
+    # no public way to stop a busy worker
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+@contextmanager
+def use_pool(pool: Optional[ParsePool]):
+    """Send parse_page calls made inside this block to ``pool``."""
+    token = _current_pool.set(pool)
+    try:
+        yield
+    finally:
+        _current_pool.reset(token)
+
+
+def parse_page(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Parse a page in the active process pool, or inline when there is none
+
+    Args:
+        func (Callable): Module-level parse function, so it can be pickled
+        *args: Arguments for ``func``, typically the page HTML
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        The value returned by ``func``
+    """
+    budget.check()
+    pool = _current_pool.get()
+    if pool is None:
+        return func(*args, **kwargs)
+    return pool.run(func, *args, **kwargs)
@@ -0,0 +1,168 @@
+import contextvars
+import logging
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import http_client
+import offload
+import requests
+from models import Concert
+from validators import NotModified
+
+logger = logging.getLogger(__name__)
+
+# Hard stop in case a site never serves an empty page
+MAX_PAGES = 25
+
+
+def concert_key(concert: Dict) -> Tuple:
+    """Identity used to drop the same event listed on more than one page."""
+    return (concert.get("date"), concert.get("headliner"), concert.get("ticket_url"))
+
+
+def is_not_found(error: Exception) -> bool:
+    """Whether a page fetch failed because the page does not exist."""
+    response = getattr(error, "response", None)
+    return (
+        isinstance(error, requests.HTTPError)
+        and getattr(response, "status_code", None) == 404
+    )
+
+
+def last_page_from_links(param: str) -> Callable[[str], Optional[int]]:
+    """
+    Build a discovery function reading the highest page number linked from a page
+
+    Args:
+        param (str): Query parameter carrying the page number, e.g. "list1page"
+
+    Returns:
+        Callable: Function mapping page HTML to the last page number, or None
+    """
+    pattern = re.compile(rf"[?&;]{re.escape(param)}=(\d+)")
+
+    def last_page(html: str) -> Optional[int]:
+        pages = [int(page) for page in pattern.findall(html)]
+        return max(pages) if pages else None
+
+    return last_page
+
+
+def fetch_paginated(
+    page_url: Callable[[int], str],
+    parse_page: Callable[[str], List[Concert]],
+    last_page: Optional[Callable[[str], Optional[int]]] = None,
+    max_workers: int = 4,
+    max_pages: int = MAX_PAGES,
+) -> List[Concert]:
+    """
+    Fetch and parse a paginated listing with several pages in flight at once
+
+    Pages are requested ``max_workers`` at a time starting from page 1. The
+    page count is narrowed down from ``last_page`` (pagination links) when
+    available and otherwise by the first page that parses to no concerts or
+    is not found. Failures of pages past the listing are ignored. Results
+    are merged as pages arrive, dropping events already seen on another page.
+
+    Args:
+        page_url (Callable): Maps a 1-based page number to its URL
+        parse_page (Callable): Parses page HTML into concerts; module-level so
+            it can run in the parse pool
+        last_page (Callable): Optional discovery of the last page number
+        max_workers (int): Number of pages fetched concurrently
+        max_pages (int): Upper bound on the number of pages fetched
+
+    Returns:
+        list: Concerts from every page in page order, without duplicates
+
+    Raises:
+        NotModified: If every fetched page is unchanged since the last scrape
+        Exception: The first error within the listing, so a partial listing
+            is never saved
+    """
+    # First page number known to be past the listing, from an empty or missing
+    # page, the first page that failed and the highest page number linked so far
+    end = max_pages + 1
+    failed = max_pages + 1
+    linked_last = None
+    next_page = 1
+    pages: Dict[int, List[Concert]] = {}
+    seen = set()
+    unchanged = []
+    errors: Dict[int, Exception] = {}
+
+    def fetch_page(page: int) -> Tuple[str, bool, List[Concert]]:
+        response = http_client.get(page_url(page))
+        return (
+            response.text,
+            getattr(response, "unchanged", False),
+            offload.parse_page(parse_page, response.text),
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+
+        while True:
+            limit = min(end, failed)
+            if linked_last is not None:
+                limit = min(limit, linked_last + 1)
+            while next_page < limit and len(in_flight) < max_workers:
+                # Each task runs in a copy of the caller's context so fetches
+                # are tracked under the venue being scraped
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, fetch_page, next_page)
+                in_flight[future] = next_page
+                next_page += 1
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = in_flight.pop(future)
+                if page >= end:
+                    continue
+                try:
+                    html, page_unchanged, concerts = future.result()
+                except Exception as e:
+                    if page > 1 and is_not_found(e):
+                        # Requested ahead of discovery, past the last page
+                        end = min(end, page)
+                        continue
+                    logger.error(f"Error fetching page {page}: {e}")
+                    errors[page] = e
+                    failed = min(failed, page)
+                    continue
+
+                if not concerts:
+                    end = min(end, page)
+                    continue
+
+                # Pagination links may only show a window of nearby pages, so
+                # the last linked page can grow as later pages arrive
+                discovered = last_page(html) if last_page else None
+                if discovered:
+                    linked_last = max(linked_last or 0, discovered, page)
+
+                unchanged.append(page_unchanged)
+                pages[page] = []
+                for concert in concerts:
+                    key = concert_key(concert)
+                    if key not in seen:
+                        seen.add(key)
+                        pages[page].append(concert)
+
+    # Pages requested before discovery finished may lie past the listing, so
+    # their failures do not count
+    errors = {
+        page: e
+        for page, e in errors.items()
+        if page < end and (linked_last is None or page <= linked_last)
+    }
+    if errors:
+        raise errors[min(errors)]
+    if unchanged and all(unchanged):
+        raise NotModified(page_url(1))
+
+    return [concert for page in sorted(pages) if page < end for concert in pages[page]]
@@ -0,0 +1,57 @@
+import importlib.util
+import logging
+import os
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the parser used by every venue
+PARSER_ENV = "SF_JAM_HTML_PARSER"
+
+_default_parser: Optional[str] = None
+
+
+def default_parser() -> str:
+    """
+    Return the parser used when a venue does not choose one
+
+    Uses $SF_JAM_HTML_PARSER when set, otherwise the C-backed lxml parser
+    when it is installed and the pure-Python html.parser when it is not.
+
+    Returns:
+        str: A BeautifulSoup tree builder name
+    """
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = os.environ.get(PARSER_ENV) or (
+            "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+        )
+        logger.debug(f"Using {_default_parser} for HTML parsing")
+    return _default_parser
+
+
+def set_default_parser(parser: Optional[str]):
+    """Use ``parser`` for every venue without its own; None restores the default."""
+    global _default_parser
+    _default_parser = parser
+
+
+def make_soup(
+    html: str,
+    parse_only: Optional[SoupStrainer] = None,
+    parser: Optional[str] = None,
+) -> BeautifulSoup:
+    """
+    Parse a page, optionally building only the subtrees matched by a strainer
+
+    Args:
+        html (str): HTML of the page
+        parse_only (SoupStrainer): Only build tags matched by this strainer
+        parser (str): Tree builder to use instead of the default
+
+    Returns:
+        BeautifulSoup: The parsed document
+    """
+    return BeautifulSoup(html, parser or default_parser(), parse_only=parse_only)
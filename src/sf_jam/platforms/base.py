@@ -0,0 +1,251 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bs4 import SoupStrainer, Tag
+from dates import display_date, parse_date
+from jsonld import parse_with_fallback
+from models import Concert
+from parsing import make_soup
+from streaming import class_matcher, id_matcher, iter_cards
+
+logger = logging.getLogger(__name__)
+
+# Keys every saved concert needs, defaulted to None when a card lacks them
+CONCERT_KEYS = (
+    "title",
+    "date",
+    "headliner",
+    "venue",
+    "show_time",
+    "ticket_url",
+    "image_url",
+)
+
+
+def strip_show_prefix(text: str) -> str:
+    """Drop a leading "Show:" label from a show time."""
+    return text.replace("Show:", "", 1).strip() if text.startswith("Show:") else text
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    How to read one concert field from a tag in a listing card.
+
+    Attributes:
+        name: Concert field the value is stored under
+        attr: Attribute to read, or None for the tag's stripped text
+        tag: Only match tags with this name
+        child: Read from the first descendant with this tag name instead
+        match: Extra predicate a tag must satisfy
+        transform: Applied to the value before it is stored
+    """
+
+    name: str
+    attr: Optional[str] = None
+    tag: Optional[str] = None
+    child: Optional[str] = None
+    match: Optional[Callable[[Tag], bool]] = None
+    transform: Optional[Callable[[str], str]] = None
+
+    def read(self, tag: Tag) -> Optional[str]:
+        """Return the field's value from ``tag``, or None if it does not apply."""
+        if self.tag and tag.name != self.tag:
+            return None
+        if self.match and not self.match(tag):
+            return None
+        if self.child and tag.name != self.child:
+            tag = tag.find(self.child)
+            if tag is None:
+                return None
+
+        value = tag.get_text(strip=True) if self.attr is None else tag.get(self.attr)
+        if not value:
+            return None
+        return self.transform(value) if self.transform else value
+
+
+class CardExtractor:
+    """
+    Extract concerts from the listing cards of one ticketing platform.
+
+    Fields are looked up by CSS class (or by tag name for fallbacks) so every
+    field of a card is collected in a single walk over its descendants,
+    instead of one tree search per field. Class fields win over tag fields.
+    """
+
+    card_class: str = ""
+    class_fields: Dict[str, Field] = {}
+    tag_fields: Dict[str, Field] = {}
+    # Date formats the platform renders, tried before the shared defaults
+    date_formats: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        venue: Optional[str] = None,
+        container_class: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            venue (str): Venue name stored on every concert, or None to use
+                the venue named on each card
+            container_class (str): Only read cards inside this container
+            exclude_id (str): Skip cards nested in the element with this id
+        """
+        self.venue = venue
+        self.container_class = container_class
+        self.exclude_id = exclude_id
+        self._field_names = {field.name for field in self.class_fields.values()} | {
+            field.name for field in self.tag_fields.values()
+        }
+
+    @property
+    def strainer(self) -> Optional[SoupStrainer]:
+        """Strainer limiting parsing to the listing cards, when that is safe."""
+        if self.exclude_id:
+            # Excluding cards by ancestor needs the surrounding tree
+            return None
+        return SoupStrainer("div", class_=self.container_class or self.card_class)
+
+    def parse(self, html: str, parser: Optional[str] = None) -> List[Concert]:
+        """
+        Parse the concerts on a page, from embedded JSON-LD events when they
+        cover the listing and from the listing cards otherwise
+
+        Args:
+            html (str): HTML of the concert listings page
+            parser (str): Tree builder to use instead of the default
+
+        Returns:
+            list: List of Concert objects
+        """
+        return parse_with_fallback(
+            html,
+            lambda page: self.parse_cards(page, parser),
+            venue=self.venue,
+            card_marker=self.card_class,
+        )
+
+    def parse_cards(self, html: str, parser: Optional[str] = None) -> List[Concert]:
+        """
+        Parse every listing card on a page
+
+        Args:
+            html (str): HTML of the concert listings page
+            parser (str): Tree builder to use instead of the default
+
+        Returns:
+            list: List of Concert objects
+        """
+        soup = make_soup(html, self.strainer, parser)
+        concerts = []
+        for card in self.find_cards(soup):
+            concert = self.extract(card)
+            if concert:
+                concerts.append(concert)
+        return concerts
+
+    def stream(
+        self, chunks: Iterable[str], parser: Optional[str] = None
+    ) -> Iterator[Concert]:
+        """
+        Yield concerts while the page is still downloading
+
+        Each card is cut out of the stream, parsed on its own and freed once
+        extracted, so memory does not grow with the length of the page.
+        Embedded JSON-LD is not used on this path.
+
+        Args:
+            chunks (Iterable[str]): Decoded page text, in arrival order
+            parser (str): Tree builder to use instead of the default
+
+        Yields:
+            Concert: Concert data, card by card
+        """
+        within = class_matcher(self.container_class) if self.container_class else None
+        exclude = id_matcher(self.exclude_id) if self.exclude_id else None
+        cards = iter_cards(chunks, class_matcher(self.card_class), within, exclude)
+        for card_html in cards:
+            soup = make_soup(card_html, parser=parser)
+            card = soup.find("div")
+            concert = self.extract(card) if card else None
+            soup.decompose()
+            if concert:
+                yield concert
+
+    def find_cards(self, soup) -> Iterable[Tag]:
+        """Yield the listing cards in a parsed page."""
+        containers = (
+            soup.find_all("div", class_=self.container_class)
+            if self.container_class
+            else [soup]
+        )
+        for container in containers:
+            for card in container.find_all("div", class_=self.card_class):
+                if self.exclude_id and card.find_parent(id=self.exclude_id):
+                    continue
+                yield card
+
+    def collect(self, card: Tag) -> Dict[str, str]:
+        """Read every configured field of a card in one pass over its tags."""
+        values: Dict[str, str] = {}
+        fallbacks: Dict[str, str] = {}
+
+        for tag in card.descendants:
+            if not isinstance(tag, Tag):
+                continue
+
+            for css_class in tag.get("class") or ():
+                field = self.class_fields.get(css_class)
+                if field and field.name not in values:
+                    value = field.read(tag)
+                    if value:
+                        values[field.name] = value
+
+            field = self.tag_fields.get(tag.name)
+            if field and field.name not in fallbacks:
+                value = field.read(tag)
+                if value:
+                    fallbacks[field.name] = value
+
+            if len(values) == len(self._field_names):
+                break
+
+        return {**fallbacks, **values}
+
+    def extract(self, card: Tag) -> Optional[Concert]:
+        """
+        Parse a single listing card
+
+        Args:
+            card (Tag): A single concert listing div
+
+        Returns:
+            Concert: Concert data, or None if the card is not a concert
+        """
+        values = self.collect(card)
+        values = self.build(values)
+        if values is None or not values.get("date"):
+            return None
+
+        values.setdefault("headliner", values.get("title"))
+        if self.venue:
+            values["venue"] = self.venue
+        for key in CONCERT_KEYS:
+            values.setdefault(key, None)
+        return values
+
+    def build(self, values: Dict[str, str]) -> Optional[Dict]:
+        """Turn collected raw values into concert fields; None skips the card."""
+        if values.get("date"):
+            parsed = parse_date(values["date"], self.date_formats)
+            if parsed is None:
+                logger.warning(
+                    f"Skipping card with unparseable date {values['date']!r}"
+                )
+                return None
+            values["date"] = display_date(parsed)
+            values["date_iso"] = parsed.isoformat()
+        return values
@@ -0,0 +1,28 @@
+from platforms.base import CardExtractor, Field
+
+
+def strip_at(text: str) -> str:
+    """Drop the leading "at " from a SeeTickets venue line."""
+    return text[3:] if text.startswith("at ") else text
+
+
+class SeeTicketsExtractor(CardExtractor):
+    """Listing cards rendered by the SeeTickets WordPress plugin."""
+
+    card_class = "seetickets-list-event-container"
+    class_fields = {
+        "title": Field("title", tag="p"),
+        "event-title": Field("title"),
+        "headliners": Field("headliner"),
+        "supporting-talent": Field("support"),
+        "date": Field("date", tag="p"),
+        "event-date": Field("date"),
+        "venue": Field("venue", tag="p", transform=strip_at),
+        "see-doortime": Field("door_time"),
+        "see-showtime": Field("show_time"),
+        "seetickets-buy-btn": Field("ticket_url", attr="href"),
+        "seetickets-list-view-event-image": Field("image_url", attr="src"),
+    }
+    date_formats = ("%a %b %d",)  # 'Fri Jan 24'
+    # Older templates have no buy button class, so use the card's first link
+    tag_fields = {"a": Field("ticket_url", attr="href")}
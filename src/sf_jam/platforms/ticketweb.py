@@ -0,0 +1,33 @@
+from typing import Dict, Optional
+
+from platforms.base import CardExtractor, Field, strip_show_prefix
+
+
+class TicketWebExtractor(CardExtractor):
+    """Listing cards rendered by the TicketWeb ``tw-*`` WordPress theme."""
+
+    card_class = "tw-section"
+    class_fields = {
+        "tw-name": Field("title"),
+        "tw-day-of-week": Field("day_of_week"),
+        "tw-event-date": Field("event_date"),
+        "tw-event-time": Field("show_time", transform=strip_show_prefix),
+        "tw-support": Field("support"),
+        "tw-buy-tix-btn": Field("ticket_url", attr="href"),
+        "tw-image": Field("image_url", attr="src", child="img"),
+        "event-img": Field("image_url", attr="src", tag="img"),
+    }
+
+    date_formats = ("%a %m.%d",)  # 'Tue 2.18', built in build()
+
+    def build(self, values: Dict[str, str]) -> Optional[Dict]:
+        if values.get("title") == "Private Event":
+            return None
+
+        day_of_week = values.pop("day_of_week", None)
+        event_date = values.pop("event_date", None)
+        if not (day_of_week and event_date):
+            return None
+
+        values["date"] = f"{day_of_week} {event_date}"  # Format: "Tue 2.18"
+        return super().build(values)
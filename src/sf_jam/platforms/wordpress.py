@@ -0,0 +1,36 @@
+from bs4 import Tag
+from platforms.base import CardExtractor, Field, strip_show_prefix
+
+
+def is_ticket_link(tag: Tag) -> bool:
+    """Match the card's "Buy Tickets" button or its Ticketmaster link."""
+    return (
+        "ticketmaster.com" in tag.get("href", "")
+        or tag.get_text(strip=True) == "Buy Tickets"
+    )
+
+
+class WordPressListingExtractor(CardExtractor):
+    """
+    Listing cards of the WordPress event template shared by AEG venues
+    (``date-show`` / ``event__start-time`` / ``wp-post-image``).
+    """
+
+    class_fields = {
+        "show-title": Field("title"),
+        "date-show": Field("date"),
+        "event__start-time": Field("show_time", transform=strip_show_prefix),
+        "support": Field("support"),
+        "wp-post-image": Field("image_url", attr="src", tag="img"),
+    }
+    tag_fields = {"a": Field("ticket_url", attr="href", match=is_ticket_link)}
+    date_formats = ("%b %d %a",)  # 'Apr 04 Fri'
+
+    def __init__(self, venue: str, card_class: str):
+        """
+        Args:
+            venue (str): Venue name stored on every concert
+            card_class (str): Class of the listing card div on this venue's site
+        """
+        self.card_class = card_class
+        super().__init__(venue)
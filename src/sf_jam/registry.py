@@ -0,0 +1,160 @@
+import importlib
+import logging
+import threading
+from importlib.metadata import EntryPoint, entry_points
+from typing import Dict, List, Union
+
+from models import VenueConfig, VenueSpec
+
+logger = logging.getLogger(__name__)
+
+# Installed packages can add venues under this entry point group. Each entry
+# point is named after its venue and must load a VenueConfig
+ENTRY_POINT_GROUP = "sf_jam.venues"
+
+BUILTIN_VENUES = [
+    VenueSpec(
+        "The Chapel",
+        "venues.chapel",
+        "retrieve_chapel_concerts",
+        "The Chapel",
+        "www.thechapelsf.com",
+    ),
+    VenueSpec(
+        "The Fillmore",
+        "venues.fillmore",
+        "retrieve_fillmore_concerts",
+        "The Fillmore",
+        "www.ticketmaster.com",
+    ),
+    VenueSpec(
+        "The Warfield",
+        "venues.warfield",
+        "retrieve_warfield_concerts",
+        "The Warfield",
+        "www.thewarfieldtheatre.com",
+    ),
+    VenueSpec(
+        "Fox Theatre",
+        "venues.fox",
+        "retrieve_fox_concerts",
+        "Fox Theatre",
+        "thefoxoakland.com",
+        "stream_fox_concerts",
+    ),
+    VenueSpec(
+        "Greek Theatre",
+        "venues.greek",
+        "retrieve_greek_concerts",
+        "Greek Theatre",
+        "thegreekberkeley.com",
+        "stream_greek_concerts",
+    ),
+    VenueSpec(
+        "The Independent",
+        "venues.independent",
+        "retrieve_independent_concerts",
+        "The Independent",
+        "www.theindependentsf.com",
+        "stream_independent_concerts",
+    ),
+    VenueSpec(
+        "Cafe du Nord",
+        "venues.dunord",
+        "retrieve_dunord_concerts",
+        "Cafe du Nord",
+        "cafedunord.com",
+        "stream_dunord_concerts",
+    ),
+    VenueSpec(
+        "Great American",
+        "venues.great_american",
+        "retrieve_great_american_concerts",
+        "Great American",
+        "gamh.com",
+        "stream_great_american_concerts",
+    ),
+]
+
+
+def load_spec(spec: VenueSpec) -> VenueConfig:
+    """
+    Import a venue's module and build its configuration
+
+    Args:
+        spec (VenueSpec): Where the venue's scraper lives
+
+    Returns:
+        VenueConfig: Configuration with the venue's functions resolved
+    """
+    module = importlib.import_module(spec.module)
+    stream_func = getattr(module, spec.stream_func) if spec.stream_func else None
+    return VenueConfig(
+        spec.name,
+        getattr(module, spec.retrieval_func),
+        spec.db_name,
+        spec.host,
+        stream_func,
+    )
+
+
+class VenueRegistry:
+    """
+    Venues known to the scraper, loaded on first use.
+
+    Venue names are known up front, from the built-in specs and installed
+    entry points, but a venue's module (and the parsing libraries it pulls
+    in) is only imported when its configuration is first requested.
+    """
+
+    def __init__(self, discover: bool = True):
+        """
+        Args:
+            discover (bool): Also list venues from installed entry points
+        """
+        self._specs: Dict[str, Union[VenueSpec, VenueConfig, EntryPoint]] = {
+            spec.name: spec for spec in BUILTIN_VENUES
+        }
+        self._configs: Dict[str, VenueConfig] = {}
+        self._lock = threading.Lock()
+        if discover:
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                self._specs.setdefault(entry_point.name, entry_point)
+
+    def names(self) -> List[str]:
+        """Return every registered venue name, built-in venues first."""
+        return list(self._specs)
+
+    def register(self, venue: Union[VenueSpec, VenueConfig]):
+        """Add a venue, or replace the one registered under the same name."""
+        with self._lock:
+            self._configs.pop(venue.name, None)
+            if isinstance(venue, VenueConfig):
+                self._configs[venue.name] = venue
+            self._specs[venue.name] = venue
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def get(self, name: str) -> VenueConfig:
+        """
+        Return a venue's configuration, importing its module on first use
+
+        Raises:
+            KeyError: If no venue is registered under ``name``
+        """
+        with self._lock:
+            if name not in self._configs:
+                source = self._specs[name]
+                if isinstance(source, VenueSpec):
+                    config = load_spec(source)
+                else:
+                    # Venues registered as configs are already in _configs
+                    config = source.load()
+                    if not isinstance(config, VenueConfig):
+                        raise TypeError(
+                            f"Entry point for {name} did not load a VenueConfig"
+                        )
+                logger.debug(f"Loaded venue {name}")
+                self._configs[name] = config
+            return self._configs[name]
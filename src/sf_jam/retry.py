@@ -0,0 +1,104 @@
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from throttle import CircuitOpenError
+
+# Stages of a venue scrape a failure can come from
+FETCH = "fetch"
+PARSE = "parse"
+PERSIST = "persist"
+
+
+def failure_stage(error: Exception, saving: bool) -> str:
+    """
+    Classify an exception raised while scraping a venue
+
+    Args:
+        error (Exception): The exception raised
+        saving (bool): Whether concerts had already been retrieved
+
+    Returns:
+        str: FETCH, PARSE or PERSIST
+    """
+    if saving or isinstance(error, sqlite3.Error):
+        return PERSIST
+    if isinstance(error, requests.RequestException):
+        return FETCH
+    return PARSE
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the delay a 429/503 response asked for, in seconds."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_transient(error: Exception, stage: str) -> bool:
+    """
+    Whether retrying could fix the failure
+
+    Timeouts, dropped connections, 5xx and 429 responses are transient, as is
+    a locked database. Other HTTP errors and parse failures would fail the
+    same way again, and a host whose circuit is open is not retried until a
+    later run.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if stage == PERSIST:
+        return isinstance(error, sqlite3.OperationalError)
+    if stage == PARSE:
+        return False
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    status = response.status_code if response is not None else None
+    return status is not None and (status >= 500 or status == 429)
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff applied to transient failures only."""
+
+    max_attempts: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    # Database locks clear quickly, so persistence retries wait less
+    persist_delay: float = 0.5
+
+    def delay(self, attempt: int, error: Exception, stage: str) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up
+
+        Args:
+            attempt (int): Number of attempts made so far, starting at 1
+            error (Exception): The failure of the last attempt
+            stage (str): Stage the failure came from
+
+        Returns:
+            float: Delay before retrying, or None if the failure is final
+        """
+        if attempt >= self.max_attempts or not is_transient(error, stage):
+            return None
+
+        base = self.persist_delay if stage == PERSIST else self.base_delay
+        ceiling = min(self.max_delay, base * 2 ** (attempt - 1))
+        # Equal jitter: at least half the backoff, spread over the rest
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
@@ -1,100 +1,435 @@
+import heapq
+import itertools
 import logging
-from typing import Dict
+import math
+import sqlite3
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from database import ConcertDatabase
-from models import VenueConfig
-
-from venues.chapel import retrieve_chapel_concerts
-from venues.fillmore import retrieve_fillmore_concerts
-from venues.fox import retrieve_fox_concerts
-from venues.warfield import retrieve_warfield_concerts
-from venues.greek import retrieve_greek_concerts
-from venues.independent import retrieve_independent_concerts
-from venues.dunord import retrieve_dunord_concerts
-from venues.great_american import retrieve_great_american_concerts
+import budget
+from database import ConcertDatabase, concert_digest, fingerprint
+from models import ScrapeResults, VenueRun
+from offload import ParsePool, use_pool
+from registry import VenueRegistry
+from validators import NotModified, ValidatorStore
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for attempts still running when a run is cancelled, whose
+# requests and parses time out with the run's budget
+CANCEL_GRACE = 10
+
 
 class ConcertScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_per_host: int = 1,
+        streaming: bool = False,
+        parse_processes: int = 0,
+        parse_time_limit: Optional[float] = 30,
+        parse_memory_mb: Optional[int] = 512,
+        run_budget: Optional[float] = 900,
+        venue_budget: Optional[float] = 180,
+        max_age: Optional[float] = 12 * 3600,
+        enrich_details: bool = True,
+    ):
+        # HTTP and parsing modules are only imported once a scraper is made,
+        # not by importing this module
+        import http_client
+        from details import DetailEnricher
+        from retry import RetryPolicy
+
         self.db = ConcertDatabase()
-        self.venues = {
-            "The Chapel": VenueConfig(
-                "The Chapel", retrieve_chapel_concerts, "The Chapel"
-            ),
-            "The Fillmore": VenueConfig(
-                "The Fillmore", retrieve_fillmore_concerts, "The Fillmore"
-            ),
-            "The Warfield": VenueConfig(
-                "The Warfield", retrieve_warfield_concerts, "The Warfield"
-            ),
-            "Fox Theatre": VenueConfig(
-                "Fox Theatre", retrieve_fox_concerts, "Fox Theatre"
-            ),
-            "Greek Theatre": VenueConfig(
-                "Greek Theatre", retrieve_greek_concerts, "Greek Theatre"
-            ),
-            "The Independent": VenueConfig(
-                "The Independent", retrieve_independent_concerts, "The Independent"
-            ),
-            "Cafe du Nord": VenueConfig(
-                "Cafe du Nord", retrieve_dunord_concerts, "Cafe du Nord"
-            ),
-            "Great American": VenueConfig(
-                "Great American",
-                retrieve_great_american_concerts,
-                "Great American",
-            ),
-        }
+        self.validators = ValidatorStore(self.db)
+        http_client.set_validator_store(self.validators)
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        # Save concerts batch by batch while pages download, where supported
+        self.streaming = streaming
+        # Parse pages in this many worker processes (0 parses in the
+        # scraping threads), each task limited in time and memory
+        self.parse_processes = parse_processes
+        self.parse_time_limit = parse_time_limit
+        self.parse_memory_mb = parse_memory_mb
+        self._parse_pool: Optional[ParsePool] = None
+        self.retry_policy = RetryPolicy()
+        # Wall-clock seconds allowed for a whole scrape_all_venues run and
+        # for each venue within it, retries included (None for no limit)
+        self.run_budget = run_budget
+        self.venue_budget = venue_budget
+        self._run_deadline: Optional[float] = None
+        # Seconds after a venue's last successful scrape before it is stale
+        self.max_age = max_age
+        # Fetch detail pages of newly seen events once listings are saved
+        self.enrich_details = enrich_details
+        self.enricher = DetailEnricher(self.db)
+        # Seconds spent on each venue during the last scrape_all_venues run
+        self.durations: Dict[str, float] = {}
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limits_lock = threading.Lock()
+        # Venue modules are imported the first time each venue is scraped
+        self.registry = VenueRegistry()
+
+    def _host_limit(self, host: str) -> threading.BoundedSemaphore:
+        """Return the semaphore capping concurrent scrapes against a host."""
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def close(self):
+        """Close the database connections shared by the scraper's stores."""
+        import http_client
+
+        http_client.set_validator_store(None)
+        self.db.close()
 
     def scrape_venue(self, venue_name: str) -> bool:
         """Scrape a single venue and return success status."""
-        venue_config = self.venues.get(venue_name)
-        if not venue_config:
+        if venue_name not in self.registry:
             logger.error(f"Unknown venue: {venue_name}")
             return False
+        venue_config = self.registry.get(venue_name)
 
-        max_retries = 3
-        retry_count = 0
+        run = VenueRun(venue_config)
+        while True:
+            delay = self._timed_attempt(run)
+            if delay is None:
+                break
+            time.sleep(delay)
 
-        while retry_count < max_retries:
-            try:
-                logger.info(
-                    f"Starting scrape for {venue_name} (attempt {retry_count + 1})"
-                )
-                concerts = venue_config.retrieval_func()
+        if run.success:
+            self._enrich(run.ticket_urls)
+        return run.success
+
+    def _attempt(self, run: VenueRun) -> Optional[float]:
+        """
+        Make one attempt at retrieving and saving a venue's concerts.
+        Returns the delay before the next attempt, or None once the venue is
+        finished and run.success is set.
+        """
+        import http_client
+        from retry import failure_stage
 
-                if not concerts:
+        venue_config = run.config
+        venue_name = venue_config.name
+        run.attempts += 1
+        saving = run.concerts is not None
+
+        try:
+            logger.info(f"Starting scrape for {venue_name} (attempt {run.attempts})")
+            if self.streaming and venue_config.stream_func:
+                # Saves share the database's single write connection, which
+                # a streamed save only takes once its first batch is parsed
+                digests: List[bytes] = []
+                ticket_urls: List[str] = []
+                saved = self.db.save_concerts_stream(
+                    _tracking(venue_config.stream_func(), run, digests, ticket_urls),
+                    venue_config.db_name,
+                )
+                if not (saved.row_count or saved.errors):
                     logger.warning(f"No concerts retrieved for {venue_name}")
-                    return False
+                    run.success = False
+                    return None
+            else:
+                if run.concerts is None:
+                    with http_client.reuse_payloads(run.payloads):
+                        concerts = venue_config.retrieval_func()
 
-                inserted, errors = self.db.save_concerts(concerts, venue_config.db_name)
-                success = inserted > 0 and errors == 0
-                if success:
-                    return True
-                else:
-                    retry_count += 1
+                    if not concerts:
+                        logger.warning(f"No concerts retrieved for {venue_name}")
+                        run.success = False
+                        return None
+                    run.concerts = concerts
+                    run.payloads.clear()
 
-            except Exception as e:
-                retry_count += 1
-                wait_time = 2**retry_count  # Exponential backoff: 2, 4, 8 seconds
+                with run.lock:
+                    # A venue cancelled while fetching must not save afterwards
+                    _check_cancelled(run)
+                    budget.check()
+                    saving = True
+                    saved = self.db.save_concerts(run.concerts, venue_config.db_name)
+                digests = [concert_digest(concert) for concert in run.concerts]
+                ticket_urls = [concert.get("ticket_url") for concert in run.concerts]
+
+            # Rows that fail to insert would fail the same way again
+            run.success = saved.row_count > 0 and saved.errors == 0
+            run.row_count = saved.row_count
+            run.fingerprint = fingerprint(digests)
+            run.ticket_urls = [url for url in ticket_urls if url]
+            return None
+
+        except NotModified:
+            logger.info(f"{venue_name} listing unchanged, skipping save")
+            run.success = True
+            return None
+        except Exception as e:
+            stage = failure_stage(e, saving)
+            delay = self.retry_policy.delay(run.attempts, e, stage)
+            left = budget.remaining()
+            # Requests time out early once the budget is nearly spent, so any
+            # failure that leaves no time to retry counts as a timeout
+            if isinstance(e, budget.BudgetExceeded) or (
+                left is not None and left - (delay or 0) < budget.MIN_TIMEOUT
+            ):
                 logger.error(
-                    f"Error scraping {venue_name} (attempt {retry_count}): {e}\n"
-                    f"Waiting {wait_time} seconds before retry..."
+                    f"{venue_name} timed out after {run.attempts} attempt(s), "
+                    f"{stage} error: {e}"
                 )
-                time.sleep(wait_time)
+                run.timed_out = True
+                run.success = False
+                return None
+            if delay is None:
+                logger.error(
+                    f"Failed to scrape {venue_name} after {run.attempts} "
+                    f"attempt(s), {stage} error: {e}"
+                )
+                run.success = False
+                return None
+
+            logger.error(
+                f"Error scraping {venue_name} (attempt {run.attempts}), "
+                f"{stage} error: {e}\nRetrying in {delay:.1f} seconds..."
+            )
+            return delay
+
+    def _timed_attempt(self, run: VenueRun) -> Optional[float]:
+        """
+        Make one attempt under the venue's host limit and time budget,
+        tracking its time and committing fetched validators once the venue
+        is finished.
+        """
+        venue_name = run.config.name
+        host = run.config.host
+        host_limit = self._host_limit(host) if host else nullcontext()
+        if run.deadline is None and self.venue_budget:
+            run.deadline = time.monotonic() + self.venue_budget
+        deadlines = [d for d in (self._run_deadline, run.deadline) if d is not None]
+        deadline = min(deadlines, default=None)
+        with host_limit, use_pool(self._parse_pool), budget.deadline_at(deadline):
+            start = time.monotonic()
+            try:
+                with self.validators.track(venue_name):
+                    delay = self._attempt(run)
+            finally:
+                run.duration += time.monotonic() - start
+
+        if delay is None:
+            with run.lock:
+                # The run may have cancelled the venue while this attempt ran on
+                if run.timed_out:
+                    run.success = False
+                if run.success:
+                    self.validators.commit(venue_name)
+                    self._record_run(run)
+                else:
+                    self.validators.discard(venue_name)
+            self.durations[venue_name] = run.duration
+            logger.info(f"{venue_name} took {run.duration:.2f}s")
+        return delay
+
+    def _record_run(self, run: VenueRun):
+        """Store a venue's freshness; its concerts are already saved."""
+        try:
+            self.db.record_scrape_run(
+                run.config.name, run.duration, run.row_count, run.fingerprint
+            )
+        except sqlite3.Error:
+            # Already logged; the venue is rescraped on the next run instead
+            pass
+
+    def _enrich(self, ticket_urls: List[str]):
+        """
+        Fetch details of newly seen events within what is left of the run's
+        budget. Listings are already saved, so failures are only logged.
+        """
+        if not (self.enrich_details and ticket_urls):
+            return
+        with budget.deadline_at(self._run_deadline), use_pool(self._parse_pool):
+            left = budget.remaining()
+            if left is not None and left < budget.MIN_TIMEOUT:
+                logger.warning("No time left to fetch event details")
+                return
+            try:
+                self.enricher.enrich(ticket_urls)
+            except Exception as e:
+                logger.error(f"Event detail enrichment failed: {e}")
 
-        logger.error(f"Failed to scrape {venue_name} after {max_retries} attempts")
-        return False
+    def stale_venues(self, venues: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Return the venues due for a refresh, most stale first.
+        A venue is stale when its last successful scrape is older than
+        ``max_age``; venues never scraped successfully come first.
+        """
+        names = self.registry.names() if venues is None else list(venues)
+        last_runs = self.db.get_scrape_runs()
+        now = datetime.now()
+        ages = {}
+        for name in names:
+            last_run = last_runs.get(name)
+            age = (
+                (now - datetime.fromisoformat(last_run["last_success"])).total_seconds()
+                if last_run
+                else math.inf
+            )
+            if self.max_age is None or age >= self.max_age:
+                ages[name] = age
+        return sorted(ages, key=ages.get, reverse=True)
 
-    def scrape_all_venues(self) -> Dict[str, bool]:
+    def scrape_all_venues(
+        self,
+        max_workers: Optional[int] = None,
+        venues: Optional[Iterable[str]] = None,
+        stale_only: bool = False,
+    ) -> ScrapeResults:
         """
-        Scrape all configured venues.
-        Returns dict mapping venue names to success status.
+        Scrape all registered venues, or only those named in ``venues``.
+        With ``stale_only``, venues scraped successfully within ``max_age``
+        are skipped and the rest are started most stale first.
+        Venues are scraped concurrently on a thread pool of ``max_workers``
+        (defaulting to the scraper's setting), with at most ``max_per_host``
+        venues hitting the same host at once. Pass ``max_workers=1`` to
+        scrape one venue at a time. Retries wait on a schedule rather than in
+        a worker, so backoff never holds up other venues. The run is bounded
+        by ``run_budget`` and each venue by ``venue_budget``: request
+        timeouts are taken from the time left, and venues still running or
+        queued when their budget runs out are cancelled and reported in the
+        result's ``timed_out`` attribute. With ``parse_processes`` set,
+        fetched pages are parsed in a process pool shared by the run. Once
+        listings are saved, detail pages of events not seen recently are
+        fetched to fill in age restriction, price range, genre and door
+        time. Per-venue timings (excluding backoff) are stored in
+        ``durations``. Requests are rate limited per host, and a host that
+        keeps failing trips its circuit breaker so every venue behind it
+        fails fast until a probe request succeeds.
+        Returns dict mapping venue names to success status, with the state
+        of each host's breaker in its ``breakers`` attribute.
         """
-        results = {}
-        for venue_name in self.venues:
-            results[venue_name] = self.scrape_venue(venue_name)
-        return results
+        workers = max_workers or self.max_workers
+        self.durations = {}
+        names = self.registry.names() if venues is None else list(venues)
+        unknown = [name for name in names if name not in self.registry]
+        if unknown:
+            raise ValueError(f"Unknown venue(s): {', '.join(unknown)}")
+        if stale_only:
+            stale = self.stale_venues(names)
+            logger.info(
+                f"{len(stale)} of {len(names)} venues are stale, "
+                f"skipping {len(names) - len(stale)} fresh venue(s)"
+            )
+            names = stale
+        if self.run_budget:
+            self._run_deadline = time.monotonic() + self.run_budget
+
+        if self.parse_processes > 0:
+            self._parse_pool = ParsePool(
+                self.parse_processes, self.parse_time_limit, self.parse_memory_mb
+            )
+        try:
+            return self._run_all(names, max(workers, 1))
+        finally:
+            self._run_deadline = None
+            if self._parse_pool:
+                self._parse_pool.close()
+                self._parse_pool = None
+
+    def _run_all(self, names: List[str], workers: int) -> ScrapeResults:
+        """Scrape the named venues on ``workers`` threads, scheduling retries."""
+        runs = {name: VenueRun(self.registry.get(name)) for name in names}
+        # Venues waiting out a backoff, as (ready_at, order, venue_name)
+        waiting: List[Tuple[float, int, str]] = []
+        order = itertools.count()
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape")
+        futures = {
+            executor.submit(self._timed_attempt, run): name
+            for name, run in runs.items()
+        }
+        try:
+            while futures or waiting:
+                now = time.monotonic()
+                if self._run_deadline is not None and now >= self._run_deadline:
+                    break
+                while waiting and waiting[0][0] <= now:
+                    _, _, name = heapq.heappop(waiting)
+                    futures[executor.submit(self._timed_attempt, runs[name])] = name
+
+                timeout = max(waiting[0][0] - now, 0) if waiting else None
+                if self._run_deadline is not None:
+                    left = self._run_deadline - now
+                    timeout = left if timeout is None else min(timeout, left)
+                if not futures:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        delay = future.result()
+                    except Exception as e:
+                        logger.error(f"Unexpected error scraping {name}: {e}")
+                        runs[name].success = False
+                        delay = None
+                    if delay is not None:
+                        heapq.heappush(
+                            waiting, (time.monotonic() + delay, next(order), name)
+                        )
+        finally:
+            # Out of budget: cancel the venues left before letting go of their
+            # attempts, so one still running cannot save or be marked fresh
+            for name in itertools.chain(futures.values(), (w[2] for w in waiting)):
+                logger.error(f"{name} cancelled, scrape run out of time")
+                run = runs[name]
+                with run.lock:
+                    run.timed_out = True
+                    run.success = False
+            executor.shutdown(wait=not (futures or waiting), cancel_futures=True)
+            # Running attempts time out with the budget; let them finish before
+            # the caller goes on to close the database
+            _, running = wait(futures, timeout=CANCEL_GRACE)
+            if running:
+                logger.warning(f"{len(running)} cancelled venue(s) still running")
+
+        self._enrich(
+            [url for run in runs.values() if run.success for url in run.ticket_urls]
+        )
+
+        from throttle import breaker_states
+
+        # Keep results in configuration order regardless of completion order
+        return ScrapeResults(
+            {name: bool(run.success) for name, run in runs.items()},
+            breaker_states(),
+            [name for name, run in runs.items() if run.timed_out],
+        )
+
+
+def _check_cancelled(run: VenueRun):
+    """Raise if the run has cancelled the venue."""
+    if run.timed_out:
+        raise budget.BudgetExceeded(f"{run.config.name} was cancelled")
+
+
+def _tracking(
+    concerts: Iterator[Dict],
+    run: VenueRun,
+    digests: List[bytes],
+    ticket_urls: List[str],
+) -> Iterator[Dict]:
+    """
+    Pass concerts through, collecting their digests and ticket URLs, and stop
+    the save, rolling it back, once the venue is cancelled
+    """
+    for concert in concerts:
+        _check_cancelled(run)
+        digests.append(concert_digest(concert))
+        ticket_urls.append(concert.get("ticket_url"))
+        yield concert
+    # Checked once more before the save commits
+    _check_cancelled(run)
@@ -0,0 +1,149 @@
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Predicate on a start tag's name and attributes
+TagMatcher = Callable[[str, Dict[str, Optional[str]]], bool]
+
+
+def class_matcher(css_class: str) -> TagMatcher:
+    """
+    Match divs the way ``find_all("div", class_=css_class)`` does
+
+    Args:
+        css_class (str): A single class, or the card's full class attribute
+
+    Returns:
+        TagMatcher: Predicate for CardStreamParser
+    """
+
+    def matches(tag: str, attrs: Dict[str, Optional[str]]) -> bool:
+        value = attrs.get("class") or ""
+        return tag == "div" and (value == css_class or css_class in value.split())
+
+    return matches
+
+
+def id_matcher(element_id: str) -> TagMatcher:
+    """Match the element with the given id."""
+    return lambda tag, attrs: attrs.get("id") == element_id
+
+
+class CardStreamParser(HTMLParser):
+    """
+    Cut listing cards out of a page as it is fed in chunks.
+
+    Only the raw markup of each card is kept; everything else is discarded
+    as soon as it is seen, so memory stays bounded by the largest card no
+    matter how long the page is. Nesting is tracked by counting divs, which
+    unlike <p> or <li> are never left unclosed by listing templates.
+    """
+
+    def __init__(
+        self,
+        is_card: TagMatcher,
+        within: Optional[TagMatcher] = None,
+        exclude: Optional[TagMatcher] = None,
+    ):
+        """
+        Args:
+            is_card (TagMatcher): Matches the div that starts a card
+            within (TagMatcher): Only cut cards inside a div matching this
+            exclude (TagMatcher): Skip cards inside a div matching this
+        """
+        super().__init__(convert_charrefs=False)
+        self.is_card = is_card
+        self.within = within
+        self.exclude = exclude
+        self._cards: List[str] = []
+        self._card: Optional[List[str]] = None
+        self._div_depth = 0
+        # Div depth at which the current card, container and excluded
+        # region started, or None when outside of one
+        self._card_depth: Optional[int] = None
+        self._within_depth: Optional[int] = None
+        self._exclude_depth: Optional[int] = None
+
+    def pop_cards(self) -> List[str]:
+        """Return and forget the cards completed so far."""
+        cards, self._cards = self._cards, []
+        return cards
+
+    def _append(self, markup: str):
+        if self._card is not None:
+            self._card.append(markup)
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "div":
+            self._append(self.get_starttag_text())
+            return
+
+        self._div_depth += 1
+        if self._card is not None:
+            self._card.append(self.get_starttag_text())
+            return
+
+        attr_map = dict(attrs)
+        if self.exclude and self._exclude_depth is None and self.exclude(tag, attr_map):
+            self._exclude_depth = self._div_depth
+        if self.within and self._within_depth is None and self.within(tag, attr_map):
+            self._within_depth = self._div_depth
+
+        in_scope = self._exclude_depth is None and (
+            self.within is None or self._within_depth is not None
+        )
+        if in_scope and self.is_card(tag, attr_map):
+            self._card = [self.get_starttag_text()]
+            self._card_depth = self._div_depth
+
+    def handle_startendtag(self, tag, attrs):
+        self._append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        self._append(f"</{tag}>")
+        if tag != "div":
+            return
+
+        if self._card is not None and self._div_depth == self._card_depth:
+            self._cards.append("".join(self._card))
+            self._card = None
+            self._card_depth = None
+        if self._div_depth == self._exclude_depth:
+            self._exclude_depth = None
+        if self._div_depth == self._within_depth:
+            self._within_depth = None
+        self._div_depth = max(self._div_depth - 1, 0)
+
+    def handle_data(self, data):
+        self._append(data)
+
+    def handle_entityref(self, name):
+        self._append(f"&{name};")
+
+    def handle_charref(self, name):
+        self._append(f"&#{name};")
+
+
+def iter_cards(
+    chunks: Iterable[str],
+    is_card: TagMatcher,
+    within: Optional[TagMatcher] = None,
+    exclude: Optional[TagMatcher] = None,
+) -> Iterator[str]:
+    """
+    Yield the markup of each listing card as soon as it has been received
+
+    Args:
+        chunks (Iterable[str]): Decoded page text, in arrival order
+        is_card (TagMatcher): Matches the div that starts a card
+        within (TagMatcher): Only yield cards inside a div matching this
+        exclude (TagMatcher): Skip cards inside a div matching this
+
+    Yields:
+        str: HTML of one card
+    """
+    parser = CardStreamParser(is_card, within, exclude)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.pop_cards()
+    parser.close()
+    yield from parser.pop_cards()
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Requests per second allowed to a single host, and how many may be sent in
+# a burst after it has been idle
+RATE_PER_SECOND = 2.0
+BURST = 4
+
+# Consecutive failures that open a host's circuit, and seconds it stays open
+# before a single probe request is let through
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 60.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host that keeps failing."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket spacing out requests to one host."""
+
+    def __init__(self, rate: float = RATE_PER_SECOND, capacity: int = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail immediately. Once ``reset_timeout`` has passed a single
+    probe is allowed through (half-open): success closes the circuit again,
+    failure re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+            # Half-open: only one probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+
+class HostGuard:
+    """Rate limiter and circuit breaker for a single host."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.bucket = TokenBucket()
+        self.breaker = CircuitBreaker()
+
+    def before_request(self):
+        """
+        Wait for the host's rate limit, or fail fast if its circuit is open
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.host}, not sending request")
+        self.bucket.acquire()
+
+    def record(self, response: Optional[requests.Response]):
+        """Record the outcome of a request; None means it never got a response."""
+        failed = response is None or (
+            response.status_code >= 500 or response.status_code == 429
+        )
+        was_open = self.breaker.state != CLOSED
+        if failed:
+            self.breaker.record_failure()
+            if self.breaker.state == OPEN and not was_open:
+                logger.warning(f"Circuit opened for {self.host}")
+        else:
+            self.breaker.record_success()
+            if was_open:
+                logger.info(f"Circuit closed for {self.host}")
+
+
+_guards: Dict[str, HostGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(host: str) -> HostGuard:
+    """Return the guard for a host, creating it on first use."""
+    with _guards_lock:
+        if host not in _guards:
+            _guards[host] = HostGuard(host)
+        return _guards[host]
+
+
+def breaker_states() -> Dict[str, str]:
+    """Return the circuit state of every host contacted so far."""
+    with _guards_lock:
+        return {host: guard.breaker.state for host, guard in _guards.items()}
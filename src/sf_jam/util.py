@@ -1,44 +1,23 @@
-from datetime import datetime
+from typing import Sequence
 
+from dates import display_date, parse_date
 
-def parse_concert_date(date_string):
+
+def parse_concert_date(date_string: str, formats: Sequence[str] = ()) -> str:
     """
-    Parse various concert date formats into a consistent datetime object.
+    Parse various concert date formats into a consistent display string.
 
     Args:
         date_string (str): The date string to parse
+        formats (Sequence[str]): Formats to try before the defaults
 
     Returns:
-        datetime: A standardized datetime object
-    """
-    # Remove any extra whitespace
-    date_string = date_string.strip()
-
-    # List of possible date formats to try
-    formats = [
-        "%a %b %d",  # 'Fri Jan 24'
-        "%b %d %a",  # 'Jan 24 Fri'
-        "%a %b %d, %Y",  # 'Fri Jan 24, 2025'
-        "%a, %b %d, %Y",  # 'Sat, Feb 1, 2025'
-        "%m.%d %a",  # '2.17 Mon
-        "%a %m.%d",  # 'Tue 2.18'
-    ]
-
-    # Current year as fallback
-    current_year = datetime.now().year
+        str: The date formatted like 'Sat, Feb 01, 2025'
 
-    for fmt in formats:
-        try:
-            # Try parsing with the current format
-            parsed_date = datetime.strptime(date_string, fmt)
-
-            # If no year is specified, use the current year
-            if parsed_date.year == 1900:
-                parsed_date = parsed_date.replace(year=current_year)
-
-            return parsed_date.strftime("%a, %b %d, %Y")
-        except ValueError:
-            continue
-
-    # If no format matches, raise an error
-    raise ValueError(f"Unable to parse date string: {date_string}")
+    Raises:
+        ValueError: If no format matches
+    """
+    parsed = parse_date(date_string, formats)
+    if parsed is None:
+        raise ValueError(f"Unable to parse date string: {date_string}")
+    return display_date(parsed)
@@ -0,0 +1,134 @@
+import contextvars
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+from database import ConcertDatabase
+
+logger = logging.getLogger(__name__)
+
+# Name of the venue whose fetches are currently being tracked
+_current_scope: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "validator_scope", default=None
+)
+
+
+class NotModified(Exception):
+    """Raised when a conditionally fetched page has not changed."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Not modified: {url}")
+        self.url = url
+
+
+class ValidatorStore:
+    """
+    Persist HTTP cache validators (ETag, Last-Modified and body hash) per URL.
+
+    Validators seen while scraping a venue are staged under that venue's
+    scope and only written once the venue has been saved, so a failed
+    parse or save never causes the next run to skip a page.
+    """
+
+    def __init__(self, db: ConcertDatabase):
+        """
+        Args:
+            db (ConcertDatabase): Database whose connections the store shares
+        """
+        self.db = db
+        self._pending: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize the validator table."""
+        try:
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS http_validators (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        body_hash TEXT,
+                        updated_at TEXT
+                    )
+                """
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Validator table initialization failed: {e}")
+            raise
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored validators for a URL, if any."""
+        with self.db.get_read_connection() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body_hash FROM http_validators "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    @contextmanager
+    def track(self, scope: str):
+        """Stage validators recorded inside this block under ``scope``."""
+        token = _current_scope.set(scope)
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+
+    def stage(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: str,
+    ):
+        """Remember validators for a URL until its scope is committed."""
+        scope = _current_scope.get()
+        if scope is None:
+            return
+        with self._lock:
+            self._pending.setdefault(scope, {})[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_hash": body_hash,
+            }
+
+    def commit(self, scope: str):
+        """
+        Write the validators staged under ``scope`` to the database.
+        The scope's concerts are already saved, so a failed write is only
+        logged; its pages are fetched in full on the next run instead.
+        """
+        with self._lock:
+            pending = self._pending.pop(scope, {})
+        if not pending:
+            return
+
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with self.db.get_connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO http_validators
+                    VALUES (:url, :etag, :last_modified, :body_hash, :updated_at)
+                """,
+                    [
+                        {"url": url, "updated_at": updated_at, **validators}
+                        for url, validators in pending.items()
+                    ],
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save validators for {scope}: {e}")
+
+    def discard(self, scope: str):
+        """Drop the validators staged under ``scope``."""
+        with self._lock:
+            self._pending.pop(scope, None)
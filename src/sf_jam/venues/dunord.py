@@ -1,11 +1,38 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
 from models import Concert
+from offload import parse_page
+from platforms.base import Field
+from platforms.ticketweb import TicketWebExtractor
 
-from util import parse_concert_date
+# Parser for this venue, or None to use the default
+PARSER = None
+
+URL = "https://cafedunord.com/"
+
+
+class CafeDuNordExtractor(TicketWebExtractor):
+    """
+    TicketWeb cards as Cafe du Nord renders them, where the support acts may
+    only be listed in the first span of the attractions block.
+    """
+
+    class_fields = {
+        **TicketWebExtractor.class_fields,
+        "tw-attractions": Field("attractions", child="span"),
+    }
+
+    def build(self, values: Dict[str, str]) -> Optional[Dict]:
+        attractions = values.pop("attractions", None)
+        if attractions and not values.get("support"):
+            values["support"] = attractions
+        return super().build(values)
+
+
+EXTRACTOR = CafeDuNordExtractor(
+    "Cafe du Nord", container_class="event-listing-container"
+)
 
 
 def retrieve_dunord_concerts():
@@ -15,7 +42,17 @@ def retrieve_dunord_concerts():
     Returns
         (List[Concert]): List of Concert objects
     """
-    return fetch_and_parse_concerts("https://cafedunord.com/")
+    return fetch_and_parse_concerts(URL)
+
+
+def stream_dunord_concerts() -> Iterator[Concert]:
+    """
+    Yield concert listings from the Cafe du Nord website as the page downloads
+
+    Returns
+        (Iterator[Concert]): Concert objects, card by card
+    """
+    return EXTRACTOR.stream(http_client.stream(URL, conditional=True), PARSER)
 
 
 def fetch_and_parse_concerts(url: str) -> List[Concert]:
@@ -27,94 +64,30 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
-    """
-    sessions = requests.Session()
-    concerts = []
-
-    try:
-        # Fetch the page
-        response = sessions.get(url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all concert listings within event-listing-container
-        event_container = soup.find("div", class_="event-listing-container")
-        concert_divs = (
-            event_container.find_all("div", class_="tw-section")
-            if event_container
-            else []
-        )
 
-        # if concert_divs:
-        # print(concert_divs[0])
-
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            if concert_data:
-                concerts.append(concert_data)
-
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
+    """
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
 
-    return concerts
+    # Parse the listing cards, in the parse pool when one is active
+    return parse_page(parse_concerts, response.text)
 
 
-def parse_concert_listing(concert_div) -> Concert:
+def parse_concerts(html: str) -> List[Concert]:
     """
-    Parse a single concert listing div and extract the concert data
+    Parse all concerts from a page of concert listings
 
     Args:
-        concert_div (BeautifulSoup): A single concert listing div
+        html (str): HTML of the concert listings page
 
     Returns:
-        Concert: Concert data
+        list: List of Concert objects
     """
-    event = {}
-
-    # Extract title/headliner
-    title_elem = concert_div.select_one(".tw-name span")
-    if title_elem.text.strip() == "Private Event":
-        return None
-    if title_elem:
-        event["title"] = title_elem.text.strip()
-        event["headliner"] = title_elem.text.strip()
-
-    # Extract date
-    date_div = concert_div.select_one(".tw-event-datetime")
-    if date_div:
-        day = date_div.select_one(".tw-day-of-week").text.strip()
-        date = date_div.select_one(".tw-event-date").text.strip()
-        concert_date = f"{day} {date}"  # Format: "Tue 2.18"
-        event["date"] = parse_concert_date(concert_date)
-
-    # Extract show time
-    time_div = concert_div.select_one(".tw-event-time")
-    if time_div:
-        event["show_time"] = time_div.text.replace("Show: ", "").strip()
-
-    # Extract support acts
-    support_div = concert_div.select_one(".tw-attractions span")
-    if support_div:
-        event["support"] = support_div.text.strip()
-
-    # Extract ticket URL
-    ticket_link = concert_div.select_one(".tw-buy-tix-btn")
-    if ticket_link:
-        event["ticket_url"] = ticket_link["href"]
-
-    # Extract image URL
-    image = concert_div.select_one("img.event-img")
-    if image:
-        event["image_url"] = image["src"]
-
-    # Set venue
-    event["venue"] = "Cafe du Nord"
-
-    return event
+    return EXTRACTOR.parse(html, PARSER)
+
+
+# Single cards are parsed by the shared TicketWeb extractor
+parse_concert_listing = EXTRACTOR.extract
@@ -1,11 +1,18 @@
-from datetime import datetime
 from typing import List
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
+from bs4 import SoupStrainer
+from dates import display_date, parse_date
+from jsonld import parse_with_fallback
 from models import Concert
-from util import parse_concert_date
+from offload import parse_page
+from parsing import make_soup
+
+# Parser for this venue, or None to use the default
+PARSER = None
+
+# Only the listing cards are built into the tree
+LISTINGS = SoupStrainer("div", class_="sc-fyofxi-0 MDVIb")
 
 
 def retrieve_fillmore_concerts():
@@ -30,35 +37,42 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
+
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
     """
-    session = requests.Session()
-    concerts = []
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
+
+    # Prefer embedded JSON-LD events over walking the listing markup,
+    # parsing in the parse pool when one is active
+    return parse_page(
+        parse_with_fallback,
+        response.text,
+        parse_concerts,
+        venue="The Fillmore",
+        card_marker="sc-fyofxi-0 MDVIb",
+    )
 
-    try:
-        # Fetch the page
-        response = session.get(url, headers=headers)
-        # print(response.status_code)
-        response.raise_for_status()
 
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
+def parse_concerts(html: str) -> List[Concert]:
+    """
+    Parse all concerts from the listing markup of a page
 
-        # Find all concert listings
-        concert_divs = soup.find_all("div", class_="sc-fyofxi-0 MDVIb")
+    Args:
+        html (str): HTML of the concert listings page
 
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            concerts.append(concert_data)
+    Returns:
+        list: List of Concert objects
+    """
+    soup = make_soup(html, LISTINGS, PARSER)
 
-        return concerts
+    # Find all concert listings
+    concert_divs = soup.find_all("div", class_="sc-fyofxi-0 MDVIb")
 
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    # Parse each concert listing
+    return [parse_concert_listing(concert_div) for concert_div in concert_divs]
 
 
 def parse_concert_listing(concert_div) -> Concert:
@@ -79,22 +93,19 @@ def parse_concert_listing(concert_div) -> Concert:
     if month_span and day_span:
         month = month_span.text
         day = day_span.text
-        # Get the year from the hidden span that contains full date
+        # The hidden span holds the full date, e.g. "1/24/25"; without it
+        # the year is inferred from the month and day
         full_date_span = concert_div.select_one(".VisuallyHidden-sc-8buqks-0 span")
-        year = "2025"  # Default to 2025 if not found
+        parsed = None
         if full_date_span:
-            # Extract year from format like "1/24/25"
-            date_text = full_date_span.text.strip()
-            if "/" in date_text:
-                year = "20" + date_text.split("/")[-1]
-
-        # Create datetime object to get day of week
-        try:
-            date_obj = datetime.strptime(f"{month} {day} {year}", "%b %d %Y")
-            date = date_obj.strftime("%a %b %d")  # Format: "Fri Jan 24"
-            formatted_date = parse_concert_date(date)
-            event["date"] = formatted_date
-        except ValueError:
+            parsed = parse_date(full_date_span.text, ("%m/%d/%y",))
+        if parsed is None:
+            parsed = parse_date(f"{month} {day}", ("%b %d",))
+
+        if parsed:
+            event["date"] = display_date(parsed)
+            event["date_iso"] = parsed.isoformat()
+        else:
             event["date"] = f"{month} {day}"  # Fallback to original format
 
     # Extract show time
@@ -112,52 +123,9 @@ def parse_concert_listing(concert_div) -> Concert:
     ticket_link = concert_div.select_one('a[data-testid="event-list-link"]')
     if ticket_link:
         event["ticket_url"] = ticket_link["href"]
-        # Optionally fetch additional details from ticket page
-        # try:
-        #     event.update(fetch_ticket_details(event["ticket_url"]))
-        # except Exception as e:
-        #     print(f"Error fetching ticket details: {e}")
 
     # Initialize fields that aren't in the provided HTML
     event.setdefault("venue", "The Fillmore")
     event.setdefault("image_url", None)
 
     return event
-
-
-# def fetch_ticket_details(ticket_url):
-#     """
-#     Fetch additional details from the ticket page
-
-#     Args:
-#         ticket_url (str): URL of the ticket page
-
-#     Returns:
-#         dict: Additional event details
-#     """
-
-#     try:
-#         response = requests.get(ticket_url, headers=headers)
-#         response.raise_for_status()
-#         soup = BeautifulSoup(response.text, "html.parser")
-
-#         details = {}
-
-#         # Note: These selectors would need to be adjusted based on the actual ticket page HTML structure
-#         # This is just an example of what could be extracted
-
-#         # Example price range extraction (adjust selectors as needed)
-#         price_elem = soup.select_one(".price-range")  # Adjust selector
-#         if price_elem:
-#             details["price_range"] = price_elem.text.strip()
-
-#         # Example age restriction extraction
-#         age_elem = soup.select_one(".age-restriction")  # Adjust selector
-#         if age_elem:
-#             details["age_restriction"] = age_elem.text.strip()
-
-#         return details
-
-#     except Exception as e:
-#         print(f"Error fetching ticket page: {e}")
-#         return {}
@@ -1,10 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
 from models import Concert
-from util import parse_concert_date
+from offload import parse_page
+from platforms.wordpress import WordPressListingExtractor
+
+# Parser for this venue, or None to use the default
+PARSER = None
+
+URL = "https://thefoxoakland.com/listing/"
+
+EXTRACTOR = WordPressListingExtractor("Fox Theatre", "mix detail-information")
 
 
 def retrieve_fox_concerts():
@@ -14,7 +20,17 @@ def retrieve_fox_concerts():
     Returns
         (List[Concert]): List of Concert objects
     """
-    return fetch_and_parse_concerts("https://thefoxoakland.com/listing/")
+    return fetch_and_parse_concerts(URL)
+
+
+def stream_fox_concerts() -> Iterator[Concert]:
+    """
+    Yield concert listings from the Fox Theatre website as the page downloads
+
+    Returns
+        (Iterator[Concert]): Concert objects, card by card
+    """
+    return EXTRACTOR.stream(http_client.stream(URL, conditional=True), PARSER)
 
 
 def fetch_and_parse_concerts(url: str) -> List[Concert]:
@@ -26,71 +42,30 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
+
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
     """
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
+
+    # Parse the listing cards, in the parse pool when one is active
+    return parse_page(parse_concerts, response.text)
+
+
+def parse_concerts(html: str) -> List[Concert]:
+    """
+    Parse all concerts from a page of concert listings
+
+    Args:
+        html (str): HTML of the concert listings page
+
+    Returns:
+        list: List of Concert objects
+    """
+    return EXTRACTOR.parse(html, PARSER)
+
 
-    sessions = requests.Session()
-    concerts = []
-
-    try:
-        # Fetch the page
-        response = sessions.get(url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all concert listings
-        concert_divs = soup.find_all("div", class_="mix detail-information")
-        # print(concert_divs)
-
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            concerts.append(concert_data)
-    except requests.RequestException as e:
-        print(f"Error fetch {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
-
-    return concerts
-
-
-def parse_concert_listing(concert_div) -> Concert:
-    # Extract title
-    title = concert_div.find("h2", class_="show-title")
-    title = title.text.strip() if title else None
-
-    # Extract date
-    formatted_date = None
-    date_elem = concert_div.find("div", class_="date-show")
-    if date_elem:
-        formatted_date = parse_concert_date(date_elem.text.strip())
-
-    # Extract time information
-    time_elem = concert_div.find("div", class_="time-show")
-    show_time = None
-    if time_elem:
-        show_time_elem = time_elem.find("span", class_="event__start-time")
-        show_time = (
-            show_time_elem.text.replace("Show:", "").strip() if show_time_elem else None
-        )
-
-    # Extract ticket and more info URLs
-    ticket_url = concert_div.find("a", class_="button", text="Buy Tickets")
-    ticket_url = ticket_url["href"] if ticket_url else None
-
-    # Extract image URL
-    image_elem = concert_div.find("img", class_="wp-post-image")
-    image_url = image_elem["src"] if image_elem else None
-
-    return {
-        "title": title,
-        "date": formatted_date,
-        "headliner": title,
-        "venue": "Fox Theatre",
-        "show_time": show_time,
-        "ticket_url": ticket_url,
-        "image_url": image_url,
-    }
+# Single cards are parsed by the shared WordPress listing extractor
+parse_concert_listing = EXTRACTOR.extract
@@ -1,11 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
 from models import Concert
+from offload import parse_page
+from platforms.seetickets import SeeTicketsExtractor
 
-from util import parse_concert_date
+# Parser for this venue, or None to use the default
+PARSER = None
+
+URL = "https://gamh.com/calendar/"
+
+EXTRACTOR = SeeTicketsExtractor("Great American")
 
 
 def retrieve_great_american_concerts():
@@ -15,7 +20,17 @@ def retrieve_great_american_concerts():
     Returns
         (List[Concert]): List of Concert objects
     """
-    return fetch_and_parse_concerts("https://gamh.com/calendar/")
+    return fetch_and_parse_concerts(URL)
+
+
+def stream_great_american_concerts() -> Iterator[Concert]:
+    """
+    Yield concert listings from the Great American Music Hall website as the page downloads
+
+    Returns
+        (Iterator[Concert]): Concert objects, card by card
+    """
+    return EXTRACTOR.stream(http_client.stream(URL, conditional=True), PARSER)
 
 
 def fetch_and_parse_concerts(url: str) -> List[Concert]:
@@ -27,90 +42,30 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
-    """
-    sessions = requests.Session()
-    concerts = []
 
-    try:
-        # Fetch the page
-        response = sessions.get(url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all concert listings
-        concert_divs = soup.find_all("div", class_="seetickets-list-event-container")
-
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            if concert_data:
-                concerts.append(concert_data)
-
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
+    """
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
 
-    return concerts
+    # Parse the listing cards, in the parse pool when one is active
+    return parse_page(parse_concerts, response.text)
 
 
-def parse_concert_listing(concert_div) -> Concert:
+def parse_concerts(html: str) -> List[Concert]:
     """
-    Parse a single concert listing div and extract the concert data
+    Parse all concerts from a page of concert listings
 
     Args:
-        concert_div (BeautifulSoup): A single concert listing div
+        html (str): HTML of the concert listings page
 
     Returns:
-        Concert: Concert data
+        list: List of Concert objects
     """
-    event = {}
-
-    # Extract title/headliner
-    title_elem = concert_div.select_one(".event-title a")
-    if title_elem:
-        event["title"] = title_elem.text.strip()
-
-    # Extract headliner (separate from title as it might be different)
-    headliner_elem = concert_div.select_one(".headliners")
-    if headliner_elem:
-        event["headliner"] = headliner_elem.text.strip()
-
-    # Extract support acts
-    support_elem = concert_div.select_one(".supporting-talent")
-    if support_elem and support_elem.text.strip():
-        event["support"] = support_elem.text.strip()
-
-    # Extract date
-    date_elem = concert_div.select_one(".event-date")
-    if date_elem:
-        event["date"] = parse_concert_date(date_elem.text.strip())
-
-    # Extract show time and door time
-    time_elem = concert_div.select_one(".doortime-showtime")
-    if time_elem:
-        door_time = time_elem.select_one(".see-doortime")
-        show_time = time_elem.select_one(".see-showtime")
-        if door_time:
-            event["door_time"] = door_time.text.strip()
-        if show_time:
-            event["show_time"] = show_time.text.strip()
-
-    # Extract ticket URL
-    ticket_link = concert_div.select_one(".seetickets-buy-btn")
-    if ticket_link:
-        event["ticket_url"] = ticket_link["href"]
-
-    # Extract image URL
-    image = concert_div.select_one(".seetickets-list-view-event-image")
-    if image:
-        event["image_url"] = image["src"]
-
-    # Set venue
-    event["venue"] = "Great American"
-
-    return event
+    return EXTRACTOR.parse(html, PARSER)
+
+
+# Single cards are parsed by the shared SeeTickets extractor
+parse_concert_listing = EXTRACTOR.extract
@@ -1,11 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
 from models import Concert
+from offload import parse_page
+from platforms.wordpress import WordPressListingExtractor
 
-from util import parse_concert_date
+# Parser for this venue, or None to use the default
+PARSER = None
+
+URL = "https://thegreekberkeley.com/event-listing/"
+
+EXTRACTOR = WordPressListingExtractor("Greek Theatre", "content-information")
 
 
 def retrieve_greek_concerts():
@@ -15,7 +20,17 @@ def retrieve_greek_concerts():
     Returns
         (List[Concert]): List of Concert objects
     """
-    return fetch_and_parse_concerts("https://thegreekberkeley.com/event-listing/")
+    return fetch_and_parse_concerts(URL)
+
+
+def stream_greek_concerts() -> Iterator[Concert]:
+    """
+    Yield concert listings from The Greek Theatre website as the page downloads
+
+    Returns
+        (Iterator[Concert]): Concert objects, card by card
+    """
+    return EXTRACTOR.stream(http_client.stream(URL, conditional=True), PARSER)
 
 
 def fetch_and_parse_concerts(url: str) -> List[Concert]:
@@ -27,81 +42,30 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
-    """
-    sessions = requests.Session()
-    concerts = []
 
-    try:
-        # Fetch the page
-        response = sessions.get(url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all concert listings
-        concert_divs = soup.find_all("div", class_="content-information")
-
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            concerts.append(concert_data)
-
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
+    """
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
 
-    return concerts
+    # Parse the listing cards, in the parse pool when one is active
+    return parse_page(parse_concerts, response.text)
 
 
-def parse_concert_listing(concert_div) -> Concert:
+def parse_concerts(html: str) -> List[Concert]:
     """
-    Parse a single concert listing div and extract the concert data
+    Parse all concerts from a page of concert listings
 
     Args:
-        concert_div (BeautifulSoup): A single concert listing div
+        html (str): HTML of the concert listings page
 
     Returns:
-        dict: Concert data
+        list: List of Concert objects
     """
-    event = {}
-
-    # Extract date
-    date_div = concert_div.select_one(".date-show")
-    if date_div:
-        concert_date = date_div.text.strip()  # Format: "Apr 04 Fri"
-        event["date"] = parse_concert_date(concert_date)
-
-    # Extract show time
-    time_div = concert_div.select_one(".event__start-time")
-    if time_div:
-        event["show_time"] = time_div.text.replace("Show: ", "").strip()
-
-    # Extract title/headliner
-    title_elem = concert_div.select_one(".show-title")
-    if title_elem:
-        event["title"] = title_elem.text.strip()
-        event["headliner"] = title_elem.text.strip()
-
-    # Extract support acts
-    support_div = concert_div.select_one(".support")
-    if support_div:
-        event["support"] = support_div.text.strip()
-
-    # Extract ticket URL
-    ticket_link = concert_div.select_one('.event-data a[href*="ticketmaster.com"]')
-    if ticket_link:
-        event["ticket_url"] = ticket_link["href"]
-
-    # Extract image URL
-    image = concert_div.select_one("img.wp-post-image")
-    if image:
-        event["image_url"] = image["src"]
-
-    # Set venue
-    event["venue"] = "The Greek Theatre"
-
-    return event
+    return EXTRACTOR.parse(html, PARSER)
+
+
+# Single cards are parsed by the shared WordPress listing extractor
+parse_concert_listing = EXTRACTOR.extract
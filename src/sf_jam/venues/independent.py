@@ -1,11 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
-import requests
-from bs4 import BeautifulSoup
-from headers import headers
+import http_client
 from models import Concert
+from offload import parse_page
+from platforms.ticketweb import TicketWebExtractor
 
-from util import parse_concert_date
+# Parser for this venue, or None to use the default
+PARSER = None
+
+URL = "https://www.theindependentsf.com/"
+
+EXTRACTOR = TicketWebExtractor("The Independent")
 
 
 def retrieve_independent_concerts():
@@ -15,7 +20,17 @@ def retrieve_independent_concerts():
     Returns
         (List[Concert]): List of Concert objects
     """
-    return fetch_and_parse_concerts("https://www.theindependentsf.com/")
+    return fetch_and_parse_concerts(URL)
+
+
+def stream_independent_concerts() -> Iterator[Concert]:
+    """
+    Yield concert listings from The Independent website as the page downloads
+
+    Returns
+        (Iterator[Concert]): Concert objects, card by card
+    """
+    return EXTRACTOR.stream(http_client.stream(URL, conditional=True), PARSER)
 
 
 def fetch_and_parse_concerts(url: str) -> List[Concert]:
@@ -27,96 +42,30 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
-    """
-    sessions = requests.Session()
-    concerts = []
 
-    try:
-        # Fetch the page
-        response = sessions.get(url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all concert listings
-        concert_divs = soup.find_all("div", class_="tw-section")
-
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            if concert_data:
-                concerts.append(concert_data)
-
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
+    """
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
 
-    return concerts
+    # Parse the listing cards, in the parse pool when one is active
+    return parse_page(parse_concerts, response.text)
 
 
-def parse_concert_listing(concert_div) -> Concert:
+def parse_concerts(html: str) -> List[Concert]:
     """
-    Parse a single concert listing div and extract the concert data
+    Parse all concerts from a page of concert listings
 
     Args:
-        concert_div (BeautifulSoup): A single concert listing div
+        html (str): HTML of the concert listings page
 
     Returns:
-        dict: Concert data
+        list: List of Concert objects
     """
-    event = {}
-
-    # Extract date
-    date_elem = concert_div.select_one(".tw-event-date-complete")
-
-    if not date_elem:
-        return None  # Skip this concert if no date is found
-
-    if date_elem:
-        day_of_week = concert_div.select_one(".tw-day-of-week").text.strip()
-        date = date_elem.select_one(".tw-event-date").text.strip()
-
-        if not (day_of_week and date):
-            return None  # Skip if either component is missing
-
-        concert_date = f"{date} {day_of_week}"  # Format: "2.17 Mon"
-        event["date"] = parse_concert_date(concert_date)
-
-    # Extract show time
-    time_elem = concert_div.select_one(".tw-event-time")
-    if time_elem:
-        event["show_time"] = time_elem.text.strip()
-
-    # Extract title/headliner
-    title_elem = concert_div.select_one(".tw-name a")
-    if title_elem:
-        event["title"] = title_elem.text.strip()
-        event["headliner"] = title_elem.text.strip()
-
-    # Extract support acts
-    support_elem = concert_div.select_one(".tw-artist.tw-support")
-    if support_elem:
-        event["support"] = support_elem.text.strip()
-
-    # Extract ticket URL
-    ticket_link = concert_div.select_one(".tw-buy-tix-btn")
-    if ticket_link and ticket_link.has_attr("href"):
-        event["ticket_url"] = ticket_link["href"]
-    else:
-        event["ticket_url"] = None
-
-    # Extract image URL
-    image = concert_div.select_one(".tw-image img")
-    if image and image.has_attr("src"):
-        event["image_url"] = image["src"]
-    else:
-        event["image_url"] = None
-
-    # Set venue
-    event["venue"] = "The Independent"
-
-    return event
+    return EXTRACTOR.parse(html, PARSER)
+
+
+# Single cards are parsed by the shared TicketWeb extractor
+parse_concert_listing = EXTRACTOR.extract
@@ -1,9 +1,32 @@
+import re
 from typing import List
 
-import requests
-from bs4 import BeautifulSoup
+import http_client
+from bs4 import SoupStrainer
+from dates import display_date, parse_date
+from jsonld import parse_with_fallback
 from models import Concert
-from util import parse_concert_date
+from offload import parse_page
+from parsing import make_soup
+
+
+def is_listing_class(css_class) -> bool:
+    """Match the class attribute of a Warfield listing card."""
+    return bool(css_class) and {"warfield", "clearfix"} <= set(css_class.split())
+
+
+# Parser for this venue, or None to use the default
+PARSER = None
+
+# Class attribute of a listing card, with "warfield" and "clearfix" in any
+# order, so JSON-LD is only trusted when it lists every card
+CARD_MARKER = re.compile(r'class="(?=[^"]*\bwarfield\b)(?=[^"]*\bclearfix\b)[^"]*"')
+
+# Only the listing cards are built into the tree
+LISTINGS = SoupStrainer("div", class_=is_listing_class)
+
+# Listing dates look like 'Fri, Jan 24'
+DATE_FORMATS = ("%a, %b %d", "%a %b %d")
 
 
 def retrieve_warfield_concerts():
@@ -25,36 +48,42 @@ def fetch_and_parse_concerts(url: str) -> List[Concert]:
 
     Returns:
         list: List of Concert objects
+
+    Raises:
+        NotModified: If the page has not changed since the last scrape
+        requests.RequestException: If the page cannot be fetched
     """
-    sessions = requests.Session()
-    concerts = []
+    # Fetch the page
+    response = http_client.get(url, conditional=True)
 
-    try:
-        # Fetch the page
-        response = sessions.get(url)
-        response.raise_for_status()
+    # Prefer embedded JSON-LD events over walking the listing markup,
+    # parsing in the parse pool when one is active
+    return parse_page(
+        parse_with_fallback,
+        response.text,
+        parse_concerts,
+        venue="The Warfield",
+        card_marker=CARD_MARKER,
+    )
 
-        # Parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        # Find all concert listings
-        concert_divs = soup.find_all(
-            "div",
-            class_=lambda x: x and "warfield" in x.split() and "clearfix" in x.split(),
-        )
+def parse_concerts(html: str) -> List[Concert]:
+    """
+    Parse all concerts from the listing markup of a page
+
+    Args:
+        html (str): HTML of the concert listings page
+
+    Returns:
+        list: List of Concert objects
+    """
+    soup = make_soup(html, LISTINGS, PARSER)
 
-        # Parse each concert listing
-        for concert_div in concert_divs:
-            concert_data = parse_concert_listing(concert_div)
-            concerts.append(concert_data)
+    # Find all concert listings
+    concert_divs = soup.find_all("div", class_=is_listing_class)
 
-        return concerts
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing concert data: {e}")
-        return None
+    # Parse each concert listing
+    return [parse_concert_listing(concert_div) for concert_div in concert_divs]
 
 
 def parse_concert_listing(concert_div) -> Concert:
@@ -101,9 +130,10 @@ def parse_concert_listing(concert_div) -> Concert:
     if date_container:
         date_span = date_container.find("span", class_="date")
         if date_span:
-            date = date_span.text.strip().replace("Fri, ", "Fri ")
-            formatted_date = parse_concert_date(date)
-            event_data["date"] = formatted_date
+            parsed = parse_date(date_span.text, DATE_FORMATS)
+            if parsed:
+                event_data["date"] = display_date(parsed)
+                event_data["date_iso"] = parsed.isoformat()
 
         time_span = date_container.find("span", class_="time")
         if time_span:
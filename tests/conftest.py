@@ -0,0 +1,55 @@
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Modules in src/sf_jam import each other by their flat names
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "sf_jam"))
+
+
+class Site:
+    """Pages served by a local HTTP server, and the requests made for them."""
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = {}
+        self.requests = []
+
+    def page(self, path, body="", status=200, headers=None):
+        self.pages[path] = (status, headers or {}, body)
+        return self.url + path
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        site = self.server.site
+        site.requests.append((self.path, dict(self.headers), self.client_address))
+        status, headers, body = site.pages.get(self.path, (404, {}, "Not found"))
+        if callable(body):
+            status, headers, body = body(self.headers)
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.site = Site(f"http://127.0.0.1:{server.server_address[1]}")
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server.site
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,22 @@
+from artists import HEADLINER, SUPPORT, artist_key, artist_roles, split_support
+
+
+def test_artist_key_folds_case_accents_and_punctuation():
+    assert artist_key("Beyoncé") == artist_key("BEYONCE") == artist_key("Beyonce!")
+    assert artist_key("Simon & Garfunkel") == "simon and garfunkel"
+    assert artist_key("  The   National ") == "the national"
+    assert artist_key("!!!") == ""
+
+
+def test_split_support_separates_listed_acts():
+    assert split_support("with Foo, Bar / Baz") == ["Foo", "Bar", "Baz"]
+    assert split_support("Special Guests: Foo; Bar") == ["Foo", "Bar"]
+    assert split_support("w/ AC/DC") == ["AC/DC"]
+    assert split_support(None) == []
+    assert split_support(" , ") == []
+
+
+def test_artist_roles_keep_the_headliner_whole_and_first():
+    roles = artist_roles("Crosby, Stills & Nash", "with Foo, crosby stills and nash")
+    assert roles == [(HEADLINER, "Crosby, Stills & Nash"), (SUPPORT, "Foo")]
+    assert artist_roles(None, "Foo") == [(SUPPORT, "Foo")]
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import budget
+import pytest
+
+
+def test_no_deadline_leaves_timeouts_alone():
+    assert budget.remaining() is None
+    assert budget.request_timeout(10) == 10
+    assert budget.request_timeout((3, 10)) == (3, 10)
+
+
+def test_timeouts_are_clipped_to_the_time_left():
+    with budget.deadline_at(time.monotonic() + 2):
+        assert budget.request_timeout(10) <= 2
+        connect, read = budget.request_timeout((1, 10))
+        assert connect == 1
+        assert read <= 2
+        assert 1 < budget.request_timeout(None) <= 2
+
+
+def test_deadlines_only_tighten():
+    with budget.deadline_at(time.monotonic() + 2):
+        with budget.deadline_at(time.monotonic() + 60):
+            assert budget.remaining() <= 2
+        with budget.deadline_at(None):
+            assert budget.remaining() <= 2
+    assert budget.remaining() is None
+
+
+def test_spent_budget_raises():
+    with budget.deadline_at(time.monotonic() + budget.MIN_TIMEOUT / 2):
+        with pytest.raises(budget.BudgetExceeded):
+            budget.check()
+        with pytest.raises(budget.BudgetExceeded):
+            budget.request_timeout(10)
+
+
+def test_deadline_is_per_thread():
+    seen = []
+    with budget.deadline_at(time.monotonic() + 2):
+        thread = threading.Thread(target=lambda: seen.append(budget.remaining()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
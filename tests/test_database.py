@@ -0,0 +1,552 @@
+import sqlite3
+from datetime import date
+
+import database
+import pytest
+from database import MIGRATIONS, ConcertDatabase, concert_digest, fingerprint
+from details import DetailStore
+from models import SaveResult
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ConcertDatabase(str(tmp_path / "concerts.db"))
+    yield database
+    database.close()
+
+
+def concert(headliner, date_iso, **fields):
+    return {
+        "title": headliner,
+        "headliner": headliner,
+        "venue": "The Chapel",
+        "date_iso": date_iso,
+        **fields,
+    }
+
+
+def listing(*headliners):
+    return [
+        {"title": name, "headliner": name, "date": "Fri, Jan 24"} for name in headliners
+    ]
+
+
+def test_fingerprint_ignores_order_but_not_content():
+    def of(concerts):
+        return fingerprint(concert_digest(concert) for concert in concerts)
+
+    assert of(listing("A", "B")) == of(listing("B", "A"))
+    assert of(listing("A", "B")) != of(listing("A", "C"))
+    changed = listing("A", "B")
+    changed[0]["show_time"] = "9:00 PM"
+    assert of(changed) != of(listing("A", "B"))
+
+
+def test_scrape_runs_keep_the_last_saved_listing(db):
+    db.record_scrape_run("The Chapel", 1.5, 12, "abc")
+    first = db.get_scrape_runs()["The Chapel"]
+    # An unchanged listing records the run without a count or fingerprint
+    db.record_scrape_run("The Chapel", 0.5)
+
+    runs = db.get_scrape_runs()
+    assert list(runs) == ["The Chapel"]
+    assert runs["The Chapel"]["duration"] == 0.5
+    assert runs["The Chapel"]["row_count"] == 12
+    assert runs["The Chapel"]["fingerprint"] == "abc"
+    assert runs["The Chapel"]["last_success"] >= first["last_success"]
+
+
+def baseline_database(path):
+    """Create a database with the schema from before any migration."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE concerts (
+            title TEXT,
+            date TEXT,
+            headliner TEXT,
+            venue TEXT,
+            show_time TEXT,
+            ticket_url TEXT,
+            image_url TEXT,
+            scraped_date TEXT,
+            UNIQUE(venue, date, headliner)
+        )
+    """
+    )
+    return conn
+
+
+def test_migrates_baseline_schema(tmp_path):
+    path = str(tmp_path / "concerts.db")
+    conn = baseline_database(path)
+    conn.executemany(
+        "INSERT INTO concerts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("B", "Sat, Feb 01, 2031", "B", "V", "8PM", None, None, "2030-12-01"),
+            ("A", "Fri, Jan 24, 2031", "A", "V", "Show: 7:30 pm", None, None, "x"),
+            ("C", "TBA", "C", "V", None, None, None, "x"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    db = ConcertDatabase(path)
+    try:
+        concerts = db.get_concerts()
+        assert [c["headliner"] for c in concerts] == ["A", "B", "C"]
+        assert concerts[0]["date_iso"] == "2031-01-24"
+        assert concerts[0]["starts_at"] == "2031-01-24T19:30"
+        assert concerts[2]["date_iso"] is None
+        assert [c["headliner"] for c in db.search_concerts("b")] == ["B"]
+        with db.get_read_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == len(MIGRATIONS)
+    finally:
+        db.close()
+    # Opening a migrated database again leaves it as it is
+    db = ConcertDatabase(path)
+    try:
+        assert db.get_concerts() == concerts
+    finally:
+        db.close()
+
+
+def test_get_concerts_filters_by_date_and_venue(db):
+    db.save_concerts(
+        [concert("A", "2031-01-24"), concert("B", None, date="Sat, Feb 01, 2031")],
+        "The Chapel",
+    )
+    db.save_concerts([concert("C", "2031-01-25", venue="Fox")], "Fox")
+
+    def headliners(**filters):
+        return [c["headliner"] for c in db.get_concerts(**filters)]
+
+    assert headliners(start=date(2031, 1, 25)) == ["C", "B"]
+    assert headliners(end=date(2031, 1, 31)) == ["A", "C"]
+    assert headliners(venues=["The Chapel"]) == ["A", "B"]
+    assert db.get_concerts()[-1]["date_iso"] == "2031-02-01"
+
+
+def test_get_concerts_reads_cached_event_details(db):
+    db.save_concerts(
+        [concert("A", "2031-01-24", ticket_url="t/a"), concert("B", "2031-01-25")],
+        "The Chapel",
+    )
+    DetailStore(db).save_many({"t/a": {"genre": "Jazz", "door_time": "7pm"}})
+
+    a, b = db.get_concerts()
+    assert (a["genre"], a["door_time"], a["price_range"]) == ("Jazz", "7pm", None)
+    assert b["genre"] is None
+
+
+def test_bulk_save_skips_duplicates_and_malformed_concerts(db):
+    concerts = [
+        concert("A", "2031-01-24"),
+        concert("A", "2031-01-24", show_time="9:00 PM"),
+        concert("B", "not a date"),
+        concert("C", "2031-01-25"),
+    ]
+
+    result = db.save_concerts(iter(concerts), "The Chapel")
+
+    assert (result.added, result.errors) == (2, 1)
+    assert [c["show_time"] for c in db.get_concerts()] == [None, None]
+
+
+def test_connections_use_wal_and_tuned_pragmas(db):
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+
+def rowids(db):
+    with db.get_read_connection() as conn:
+        return dict(conn.execute("SELECT headliner, rowid FROM concerts"))
+
+
+def test_save_concerts_adds_changes_and_removes(db):
+    first = db.save_concerts(
+        [concert("A", "2031-01-01"), concert("B", "2031-01-02")], "The Chapel"
+    )
+    assert (first.added, first.changed, first.removed) == (2, 0, 0)
+    before = rowids(db)
+
+    second = db.save_concerts(
+        [
+            concert("A", "2031-01-01", show_time="9:00 PM"),
+            concert("C", "2031-01-03"),
+        ],
+        "The Chapel",
+    )
+
+    assert (second.added, second.changed, second.removed) == (1, 1, 1)
+    assert second.row_count == 2
+    after = rowids(db)
+    assert set(after) == {"A", "C"}
+    # Changed events keep their rows
+    assert after["A"] == before["A"]
+    assert db.get_concerts()[0]["show_time"] == "9:00 PM"
+
+    again = db.save_concerts(
+        [
+            concert("A", "2031-01-01", show_time="9:00 PM"),
+            concert("C", "2031-01-03"),
+        ],
+        "The Chapel",
+    )
+    assert again == SaveResult(unchanged=2)
+
+
+def test_rows_are_saved_under_the_venue_they_are_saved_for(db):
+    listing = [concert("A", "2031-01-01", venue="The Greek Theatre")]
+
+    db.save_concerts(listing, "Greek Theatre")
+    again = db.save_concerts(listing, "Greek Theatre")
+
+    assert again.unchanged == 1
+    assert [c["venue"] for c in db.get_concerts()] == ["Greek Theatre"]
+
+
+def test_migration_moves_greek_rows_to_the_venue_name(tmp_path):
+    path = str(tmp_path / "concerts.db")
+    conn = baseline_database(path)
+    conn.executemany(
+        "INSERT INTO concerts (title, date, headliner, venue) VALUES (?, ?, ?, ?)",
+        [
+            ("A", "Fri, Jan 24, 2031", "A", "The Greek Theatre"),
+            ("B", "Sat, Jan 25, 2031", "B", "The Greek Theatre"),
+            ("B", "Sat, Jan 25, 2031", "B", "Greek Theatre"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    db = ConcertDatabase(path)
+    try:
+        venues = [c["venue"] for c in db.get_concerts()]
+    finally:
+        db.close()
+
+    assert venues == ["Greek Theatre", "Greek Theatre"]
+
+
+def test_reads_share_a_pool_of_read_only_connections(tmp_path):
+    db = ConcertDatabase(str(tmp_path / "concerts.db"), read_pool_size=1)
+    try:
+        with db.get_read_connection() as conn:
+            first = conn
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("DELETE FROM concerts")
+        with db.get_read_connection() as conn:
+            assert conn is first
+    finally:
+        db.close()
+
+
+def test_failed_write_leaves_no_transaction_open(db):
+    with pytest.raises(sqlite3.Error):
+        with db.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO missing VALUES (1)")
+
+    assert db.save_concerts([concert("A", "2031-01-01")], "The Chapel").added == 1
+
+
+def test_close_releases_every_connection(tmp_path):
+    db = ConcertDatabase(str(tmp_path / "concerts.db"))
+    db.save_concerts([concert("A", "2031-01-01")], "The Chapel")
+    with db.get_read_connection() as reader:
+        reader.execute("SELECT 1")
+    with db.get_connection() as writer:
+        pass
+
+    db.close()
+
+    for conn in (reader, writer):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_match_query_quotes_words_as_prefixes():
+    assert database.match_query("arc fi") == '"arc"* "fi"*'
+    assert database.match_query('AND "OR" NEAR(') == '"AND"* "OR"* "NEAR"*'
+    assert database.match_query(" -- ") is None
+
+
+def test_search_ranks_headliners_above_titles_and_support(db):
+    db.save_concerts(
+        [
+            concert("Opener Band", "2031-01-01", title="Tour", support="Arcade Fire"),
+            concert("Someone", "2031-01-02", title="Arcade Fire Tribute"),
+            concert("Arcade Fire", "2031-01-03", ticket_url="t/af"),
+            concert("Unrelated", "2031-01-04"),
+        ],
+        "The Chapel",
+    )
+    db.save_concerts([concert("Arcade Fire", "2031-01-05", venue="Fox")], "Fox")
+    DetailStore(db).save_many({"t/af": {"genre": "Indie"}})
+
+    found = db.search_concerts("arc fi")
+    assert [c["headliner"] for c in found[:2]] == ["Arcade Fire", "Arcade Fire"]
+    assert [c["headliner"] for c in found[2:]] == ["Someone", "Opener Band"]
+    assert found[0]["genre"] == "Indie"
+    assert len(db.search_concerts("arc", venues=["Fox"])) == 1
+    assert len(db.search_concerts("arc", limit=1)) == 1
+    assert db.search_concerts("?!") == []
+
+
+def test_search_index_follows_changes(db):
+    db.save_concerts([concert("Old Name", "2031-01-01")], "The Chapel")
+    db.save_concerts(
+        [concert("Old Name", "2031-01-01", title="Renamed Show")], "The Chapel"
+    )
+    assert [c["title"] for c in db.search_concerts("renamed")] == ["Renamed Show"]
+
+    db.save_concerts([concert("Other", "2031-01-02")], "The Chapel")
+    assert db.search_concerts("old") == []
+    assert db.search_concerts("renamed") == []
+
+
+def test_query_concerts_pages_through_every_match(db):
+    db.save_concerts(
+        [concert(f"Band {i}", f"2031-01-{i + 1:02d}") for i in range(7)],
+        "The Chapel",
+    )
+
+    headliners, cursor, pages = [], None, 0
+    while True:
+        page = db.query_concerts(after=cursor, page_size=3)
+        assert page.total == 7
+        headliners += [c["headliner"] for c in page.concerts]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert headliners == [c["headliner"] for c in db.get_concerts()]
+
+    with pytest.raises(ValueError):
+        db.query_concerts(after="not a cursor")
+    with pytest.raises(ValueError):
+        db.query_concerts(sort="popularity")
+
+
+def test_query_concerts_filters_and_sorts(db):
+    db.save_concerts(
+        [
+            concert("Arcade Fire", "2031-01-02", ticket_url="t/af"),
+            concert("Beach House", "2031-01-01"),
+            concert("Undated", None, date="Someday"),
+        ],
+        "The Chapel",
+    )
+    db.save_concerts([concert("Arcade Fire", "2031-01-03", venue="Fox")], "Fox")
+    DetailStore(db).save_many({"t/af": {"genre": "Indie"}})
+
+    def headliners(**query):
+        return [c["headliner"] for c in db.query_concerts(**query).concerts]
+
+    assert headliners() == ["Beach House", "Arcade Fire", "Arcade Fire", "Undated"]
+    assert headliners(sort="date_desc")[0] == "Undated"
+    assert headliners(sort="venue") == [
+        "Arcade Fire",
+        "Beach House",
+        "Arcade Fire",
+        "Undated",
+    ]
+    assert headliners(venues=["Fox"], start=date(2031, 1, 3)) == ["Arcade Fire"]
+    assert headliners(end=date(2031, 1, 2)) == ["Beach House", "Arcade Fire"]
+
+    page = db.query_concerts(search="arc", venues=["The Chapel"])
+    assert page.total == 1
+    assert page.concerts[0]["genre"] == "Indie"
+    assert db.query_concerts(search="?!").total == 0
+    assert db.get_venues() == ["Fox", "The Chapel"]
+
+
+def test_archive_moves_past_concerts_out_of_the_live_table(db):
+    db.save_concerts(
+        [
+            concert("Past", "2031-01-01", support="Opener"),
+            concert("Future", "2031-03-01"),
+            concert("Undated", None, date="TBA"),
+        ],
+        "The Chapel",
+    )
+    db.save_concerts([concert("Gone", "2031-01-02", venue="Fox")], "Fox")
+
+    assert db.archive_past_concerts(before=date(2031, 2, 1)) == 2
+    assert [c["headliner"] for c in db.get_concerts()] == ["Future", "Undated"]
+    assert db.search_concerts("opener") == []
+
+    archived = db.get_archived_concerts()
+    assert [c["headliner"] for c in archived] == ["Gone", "Past"]
+    assert archived[1]["support"] == "Opener"
+    assert archived[1]["archived_at"]
+    past = db.get_archived_concerts(venues=["The Chapel"], end=date(2031, 1, 1))
+    assert [c["headliner"] for c in past] == ["Past"]
+    assert len(db.get_archived_concerts(limit=1)) == 1
+
+
+def test_archived_concerts_still_listed_are_not_added_again(db):
+    listed = [concert("Past", "2031-01-01"), concert("Future", "2031-03-01")]
+    db.save_concerts(listed, "The Chapel")
+    db.archive_past_concerts(before=date(2031, 2, 1))
+
+    result = db.save_concerts([*listed, concert("New", "2031-04-01")], "The Chapel")
+    assert (result.added, result.changed, result.removed) == (1, 0, 0)
+    assert result.unchanged == 2
+    assert [c["headliner"] for c in db.get_concerts()] == ["Future", "New"]
+    assert [c["headliner"] for c in db.get_archived_concerts()] == ["Past"]
+
+
+def test_compact_converts_old_databases_to_incremental_vacuum(tmp_path):
+    path = str(tmp_path / "concerts.db")
+    baseline_database(path).close()
+    db = ConcertDatabase(path)
+    try:
+        db.save_concerts(
+            [concert(f"Band {i}", f"2031-01-{i + 1:02d}") for i in range(20)],
+            "The Chapel",
+        )
+        db.save_concerts([concert("Band 19", "2031-01-20")], "The Chapel")
+        db.compact()
+
+        with db.get_read_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert [c["headliner"] for c in db.search_concerts("19")] == ["Band 19"]
+        db.compact()
+    finally:
+        db.close()
+
+
+def test_new_databases_use_incremental_vacuum(db):
+    with db.get_read_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_saves_log_each_change_once(db):
+    db.save_concerts(
+        [concert("A", "2031-01-01"), concert("B", "2031-01-02")], "The Chapel"
+    )
+    db.save_concerts(
+        [concert("A", "2031-01-01", show_time="9pm"), concert("C", "2031-01-03")],
+        "The Chapel",
+    )
+    db.save_concerts(
+        [concert("A", "2031-01-01", show_time="9pm"), concert("C", "2031-01-03")],
+        "The Chapel",
+    )
+
+    changes = db.get_changes()
+    kinds = [(change["kind"], change["headliner"]) for change in changes]
+    assert kinds[:2] == [("added", "A"), ("added", "B")]
+    assert sorted(kinds[2:]) == [("added", "C"), ("changed", "A"), ("removed", "B")]
+
+    by_kind = {change["kind"]: change for change in changes[2:]}
+    assert by_kind["changed"]["before"]["show_time"] is None
+    assert by_kind["changed"]["after"]["show_time"] == "9pm"
+    assert by_kind["removed"]["after"] is None
+    assert by_kind["removed"]["before"]["headliner"] == "B"
+    assert by_kind["added"]["before"] is None
+
+    assert db.get_changes(since=changes[1]["seq"]) == changes[2:]
+    assert db.get_changes(limit=1) == changes[:1]
+
+
+def test_archived_concerts_are_not_logged_as_removed(db):
+    db.save_concerts([concert("Past", "2031-01-01")], "The Chapel")
+    db.archive_past_concerts(before=date(2031, 2, 1))
+    db.save_concerts([concert("Past", "2031-01-01")], "The Chapel")
+
+    assert [change["kind"] for change in db.get_changes()] == ["added"]
+
+
+def test_prune_changes_drops_old_entries(db):
+    db.save_concerts(
+        [concert("A", "2031-01-01"), concert("B", "2031-01-02")], "The Chapel"
+    )
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE concert_changes SET changed_at = '2000-01-01' "
+            "WHERE headliner = 'A'"
+        )
+        conn.commit()
+
+    assert db.prune_changes() == 1
+    assert [change["headliner"] for change in db.get_changes()] == ["B"]
+    assert db.prune_changes() == 0
+
+
+def test_concerts_are_linked_to_their_artists(db):
+    db.save_concerts(
+        [
+            concert("Beyoncé", "2031-01-01", support="with Foo, Bar", ticket_url="t/b"),
+            concert("Foo", "2031-01-02"),
+        ],
+        "The Chapel",
+    )
+    db.save_concerts([concert("BEYONCE", "2031-01-03", venue="Fox")], "Fox")
+    DetailStore(db).save_many({"t/b": {"genre": "Pop"}})
+
+    played = db.get_artist_concerts("beyonce")
+    assert [(c["venue"], c["role"]) for c in played] == [
+        ("The Chapel", "headliner"),
+        ("Fox", "headliner"),
+    ]
+    assert played[0]["genre"] == "Pop"
+    foo = db.get_artist_concerts("Foo")
+    assert [(c["headliner"], c["role"]) for c in foo] == [
+        ("Beyoncé", "support"),
+        ("Foo", "headliner"),
+    ]
+
+    db.save_concerts(
+        [
+            concert("Foo", "2031-02-01", venue="Fox"),
+            concert("Foo", "2031-02-02", venue="Fox", support="Bar"),
+            concert("Bar", "2031-02-03", venue="Fox"),
+        ],
+        "Fox",
+    )
+    artists = db.get_venue_artists("Fox")
+    counts = [(a["name"], a["role"], a["concerts"]) for a in artists]
+    assert counts[0] == ("Foo", "headliner", 2)
+    assert sorted(counts[1:]) == [("Bar", "headliner", 1), ("Bar", "support", 1)]
+    support = db.get_venue_artists("The Chapel", role="support")
+    assert [a["name"] for a in support] == ["Bar", "Foo"]
+
+
+def test_artist_links_follow_changes(db):
+    db.save_concerts([concert("A", "2031-01-01", support="Foo")], "The Chapel")
+    db.save_concerts([concert("A", "2031-01-01", support="Bar")], "The Chapel")
+    assert db.get_artist_concerts("Foo") == []
+    assert len(db.get_artist_concerts("Bar")) == 1
+
+    db.save_concerts([], "The Chapel")
+    assert db.get_artist_concerts("A") == []
+    assert db.get_venue_artists("The Chapel") == []
+
+
+def test_migration_links_artists_of_saved_concerts(tmp_path):
+    path = str(tmp_path / "concerts.db")
+    conn = baseline_database(path)
+    conn.execute(
+        "INSERT INTO concerts VALUES "
+        "('A', 'Fri, Jan 24, 2031', 'A', 'V', NULL, NULL, NULL, 'x')"
+    )
+    conn.commit()
+    conn.close()
+
+    db = ConcertDatabase(path)
+    try:
+        assert [c["role"] for c in db.get_artist_concerts("a")] == ["headliner"]
+        # Converting to incremental vacuum may renumber rowids
+        db.compact()
+        assert [c["headliner"] for c in db.get_artist_concerts("a")] == ["A"]
+    finally:
+        db.close()
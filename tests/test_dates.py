@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+from dates import DateParser, display_date, infer_year
+from util import parse_concert_date
+
+
+def test_infer_year_rolls_over_to_next_year():
+    assert infer_year(1, 10, None, date(2025, 12, 20)) == date(2026, 1, 10)
+
+
+def test_infer_year_keeps_recent_past_dates():
+    assert infer_year(12, 1, None, date(2025, 12, 20)) == date(2025, 12, 1)
+
+
+def test_infer_year_matches_weekday():
+    today = date(2024, 3, 1)
+    assert infer_year(2, 18, None, today) == date(2024, 2, 18)
+    # Feb 18 is a Tuesday in 2025 only
+    assert infer_year(2, 18, 1, today) == date(2025, 2, 18)
+
+
+def test_infer_year_rejects_impossible_dates():
+    assert infer_year(2, 30, None, date(2025, 6, 1)) is None
+
+
+def test_parser_matches_every_default_format():
+    parser = DateParser(today=lambda: date(2025, 1, 10))
+
+    assert (
+        parser.parse_many(
+            [
+                "Fri Jan 24",
+                "Jan 24 Fri",
+                "Fri Jan 24, 2025",
+                "Fri, Jan 24, 2025",
+                "1.24 Fri",
+                "Fri 1.24",
+            ]
+        )
+        == [date(2025, 1, 24)] * 6
+    )
+
+
+def test_parser_tries_venue_formats_and_normalizes_text():
+    parser = DateParser(["%d/%m/%y"], today=lambda: date(2025, 1, 10))
+
+    assert parser.parse("24/01/25") == date(2025, 1, 24)
+    assert parser.parse("  Saturday   February  1, 2025 ") == date(2025, 2, 1)
+    assert parser.parse("Sat.  Feb. 1") == date(2025, 2, 1)
+    assert parser.parse("Funday Jan 24") is None
+    assert parser.parse("not a date") is None
+
+
+def test_memo_is_reset_when_the_day_changes():
+    today = [date(2025, 12, 20)]
+    parser = DateParser(["%b %d"], today=lambda: today[0])
+
+    assert parser.parse("Jan 10") == date(2026, 1, 10)
+    today[0] = date(2026, 12, 20)
+    assert parser.parse("Jan 10") == date(2027, 1, 10)
+
+
+def test_parse_concert_date_formats_for_display():
+    assert parse_concert_date("Fri Jan 24, 2025") == "Fri, Jan 24, 2025"
+    assert display_date(date(2025, 2, 1)) == "Sat, Feb 01, 2025"
+    with pytest.raises(ValueError):
+        parse_concert_date("someday")
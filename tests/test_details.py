@@ -0,0 +1,95 @@
+import json
+from datetime import timedelta
+
+import http_client
+import pytest
+from database import ConcertDatabase
+from details import DetailEnricher, DetailStore, parse_details
+
+EVENT = {
+    "@context": "https://schema.org",
+    "@type": "MusicEvent",
+    "name": "Night Shift",
+    "startDate": "2031-01-24T20:00",
+    "doorTime": "2031-01-24T19:00",
+    "typicalAgeRange": "21+",
+    "offers": [{"price": "25"}, {"price": "40.50"}],
+    "performer": {"@type": "MusicGroup", "name": "Night Shift", "genre": "Indie"},
+}
+
+
+def event_page(event):
+    return (
+        '<html><script type="application/ld+json">'
+        f"{json.dumps(event)}</script><body>Doors 6pm</body></html>"
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ConcertDatabase(str(tmp_path / "concerts.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def enricher(db):
+    http_client.close()
+    yield DetailEnricher(db, max_workers=2)
+    http_client.close()
+
+
+def test_details_are_read_from_json_ld():
+    details = parse_details(event_page(EVENT))
+
+    assert details["age_restriction"] == "21+"
+    assert details["price_range"] == "$25 - $40.50"
+    assert details["genre"] == "Indie"
+    assert details["door_time"]
+
+
+def test_missing_details_are_searched_for_in_the_text():
+    html = """
+        <script>var price = "$999";</script>
+        <div>All Ages</div><p>Tickets $15 - $20</p>
+        <p>Doors open at 7:30 p.m.</p><span>Genre: Jazz  </span>
+    """
+
+    assert parse_details(html) == {
+        "age_restriction": "All Ages",
+        "price_range": "$15 - $20",
+        "genre": "Jazz",
+        "door_time": "7:30 p.m.",
+    }
+    assert parse_details("<p>Nothing here</p>") == dict.fromkeys(
+        ["age_restriction", "price_range", "genre", "door_time"]
+    )
+
+
+def test_store_ignores_details_older_than_max_age(db):
+    store = DetailStore(db)
+    store.save_many({"https://t/1": {"genre": "Rock"}})
+
+    assert (
+        store.get_many(["https://t/1", "https://t/2"])["https://t/1"]["genre"] == "Rock"
+    )
+    assert store.get_many(["https://t/1"], timedelta(days=1))
+    assert store.get_many(["https://t/1"], timedelta(seconds=-60)) == {}
+
+
+def test_enrich_fetches_only_uncached_pages(site, enricher):
+    cached = site.page("/cached", event_page(EVENT))
+    fresh = site.page("/fresh", event_page({**EVENT, "typicalAgeRange": "18+"}))
+    missing = site.page("/missing", status=404)
+    enricher.store.save_many({cached: {"age_restriction": "All Ages"}})
+
+    assert enricher.enrich([cached, fresh, fresh, missing, None]) == 1
+
+    paths = sorted(path for path, _, _ in site.requests)
+    assert paths == ["/fresh", "/missing"]
+    found = enricher.store.get_many([cached, fresh, missing])
+    assert found[cached]["age_restriction"] == "All Ages"
+    assert found[fresh]["age_restriction"] == "18+"
+    assert missing not in found
+    # Everything is cached now, and the failed page is retried next time
+    assert enricher.enrich([cached, fresh]) == 0
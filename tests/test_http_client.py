@@ -0,0 +1,42 @@
+import http_client
+import pytest
+import requests
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.close()
+    yield
+    http_client.close()
+
+
+def test_requests_reuse_pooled_connections(site):
+    url = site.page("/events", "<html></html>")
+
+    for _ in range(3):
+        assert http_client.get(url).text == "<html></html>"
+
+    ports = {client[1] for _, _, client in site.requests}
+    assert len(site.requests) == 3
+    assert len(ports) == 1
+
+
+def test_session_sends_default_headers(site):
+    url = site.page("/events")
+
+    http_client.get(url)
+
+    _, headers, _ = site.requests[0]
+    assert headers["User-Agent"] == http_client.get_session().headers["User-Agent"]
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_http_errors_raise(site):
+    with pytest.raises(requests.HTTPError):
+        http_client.get(site.url + "/missing")
+
+
+def test_close_drops_the_session(site):
+    session = http_client.get_session()
+    http_client.close()
+    assert http_client.get_session() is not session
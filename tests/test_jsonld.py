@@ -0,0 +1,96 @@
+import json
+
+from jsonld import extract_events, parse_with_fallback, to_concert
+from venues import warfield
+
+EVENT = {
+    "@type": "MusicEvent",
+    "name": "Artist &amp; Friends",
+    "startDate": "2031-01-24T20:00:00-08:00",
+    "doorTime": "2031-01-24T19:00:00-08:00",
+    "performer": [{"name": "Artist"}, {"name": "Opener"}, {"name": "Second"}],
+    "location": {"@type": "Place", "name": "The Warfield"},
+    "offers": [{"url": "https://tickets.example.com/1"}],
+    "image": ["https://img.example.com/1.jpg"],
+}
+
+
+def script(document):
+    return f'<script type="application/ld+json">{json.dumps(document)}</script>'
+
+
+def card(name, css_class="warfield clearfix"):
+    return f'<div class="{css_class}"><h3>{name}</h3></div>'
+
+
+def named(name, day=24):
+    return {"@type": "Event", "name": name, "startDate": f"2031-01-{day:02d}"}
+
+
+def test_to_concert_reads_event_fields():
+    assert to_concert(EVENT) == {
+        "title": "Artist & Friends",
+        "date": "Fri, Jan 24, 2031",
+        "date_iso": "2031-01-24",
+        "headliner": "Artist",
+        "support": "Opener, Second",
+        "venue": "The Warfield",
+        "show_time": "8:00 PM",
+        "door_time": "7:00 PM",
+        "ticket_url": "https://tickets.example.com/1",
+        "image_url": "https://img.example.com/1.jpg",
+    }
+
+
+def test_to_concert_needs_a_name_and_start():
+    assert to_concert({"@type": "Event", "name": "No date"}) is None
+    assert to_concert({"@type": "Event", "startDate": "2031-01-24"}) is None
+
+
+def test_extract_events_walks_graphs_and_lists():
+    html = (
+        script({"@graph": [{"@type": "WebPage"}, named("A")]})
+        + '<script type="application/ld+json">{not json</script>'
+        + script(
+            {
+                "@type": "ItemList",
+                "itemListElement": [{"item": named("B")}, {"item": named("C")}],
+            }
+        )
+    )
+
+    assert [event["name"] for event in extract_events(html)] == ["A", "B", "C"]
+
+
+def test_json_ld_covering_every_card_is_used():
+    html = script([named("A"), named("B", 25)]) + card("x") + card("y")
+
+    concerts = parse_with_fallback(
+        html, lambda page: [], venue="Hall", card_marker="warfield clearfix"
+    )
+
+    assert [(c["title"], c["venue"]) for c in concerts] == [
+        ("A", "Hall"),
+        ("B", "Hall"),
+    ]
+
+
+def test_listing_is_parsed_when_json_ld_lists_fewer_events_than_cards():
+    html = script(named("Featured")) + card("x") + card("y")
+
+    concerts = parse_with_fallback(
+        html, lambda page: ["from cards"], card_marker="warfield clearfix"
+    )
+
+    assert concerts == ["from cards"]
+
+
+def test_warfield_counts_cards_whatever_the_class_order():
+    featured = script(named("Featured"))
+    html = featured + card("x", "clearfix warfield") + card("y", "warfield clearfix")
+
+    assert len(warfield.CARD_MARKER.findall(html)) == 2
+    concerts = parse_with_fallback(
+        html, lambda page: ["from cards"], card_marker=warfield.CARD_MARKER
+    )
+    assert concerts == ["from cards"]
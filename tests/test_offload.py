@@ -0,0 +1,92 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from offload import ParsePool, ParseTimeout, parse_page, use_pool
+
+
+def count_cards(html):
+    return html.count("card")
+
+
+def crash(html):
+    os._exit(1)
+
+
+def hang(html):
+    # Stuck the way a parse inside C code is: deaf to the time limit's alarm
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(60)
+
+
+def spin(html):
+    while True:
+        pass
+
+
+@pytest.fixture
+def pool():
+    parse_pool = ParsePool(processes=1, time_limit=1, memory_limit_mb=None)
+    yield parse_pool
+    parse_pool.close()
+
+
+def test_parse_page_runs_inline_without_a_pool():
+    assert parse_page(count_cards, "card card") == 2
+
+
+def test_parse_page_uses_the_active_pool(pool):
+    with use_pool(pool):
+        assert parse_page(count_cards, "card card card") == 3
+
+
+def test_time_limit_interrupts_a_parse(pool):
+    with pytest.raises(ParseTimeout):
+        pool.run(spin, "")
+    assert pool.run(count_cards, "card") == 1
+
+
+def test_pool_recovers_from_a_crashed_worker(pool):
+    with pytest.raises(BrokenProcessPool):
+        pool.run(crash, "")
+    assert pool.run(count_cards, "card") == 1
+
+
+def test_stuck_worker_is_killed(pool, monkeypatch):
+    monkeypatch.setattr("offload.TIMEOUT_GRACE", 0.5)
+    pool.run(count_cards, "")
+    stuck = list(pool._executor._processes.values())
+    with pytest.raises(ParseTimeout):
+        pool.run(hang, "")
+    time.sleep(0.5)
+    assert stuck and not any(process.is_alive() for process in stuck)
+    assert pool.run(count_cards, "card") == 1
+
+
+def test_close_kills_busy_workers():
+    pool = ParsePool(processes=1, time_limit=None, memory_limit_mb=None)
+    errors = []
+
+    def parse():
+        try:
+            pool.run(hang, "")
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=parse)
+    thread.start()
+    while not pool._executor._processes:
+        time.sleep(0.05)
+    workers = list(pool._executor._processes.values())
+    time.sleep(1)
+    pool.close()
+    thread.join(5)
+    for process in workers:
+        process.join(5)
+
+    assert not thread.is_alive()
+    assert [type(e) for e in errors] == [BrokenProcessPool]
+    assert workers and not any(process.is_alive() for process in workers)
@@ -0,0 +1,88 @@
+import http_client
+import pytest
+import requests
+from pagination import fetch_paginated, last_page_from_links
+
+
+def parse_lines(html):
+    """Read one concert per "date|headliner" line, ignoring page links."""
+    return [
+        {"date": date, "headliner": headliner, "ticket_url": None}
+        for date, headliner in (
+            line.split("|") for line in html.splitlines() if "|" in line
+        )
+    ]
+
+
+def listing(site, *pages, links=None):
+    for number, headliners in enumerate(pages, start=1):
+        body = "\n".join(f"2031-01-{number:02d}|{name}" for name in headliners)
+        if links:
+            body += "\n" + " ".join(f"?page={page}" for page in range(1, links + 1))
+        site.page(f"/list?page={number}", body)
+    return lambda page: f"{site.url}/list?page={page}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.close()
+    yield
+    http_client.close()
+
+
+def test_fetches_pages_until_an_empty_page(site):
+    page_url = listing(site, ["A", "B"], ["C"], ["D"], [])
+
+    concerts = fetch_paginated(page_url, parse_lines, max_workers=2)
+
+    assert [c["headliner"] for c in concerts] == ["A", "B", "C", "D"]
+
+
+def test_missing_page_ends_the_listing(site):
+    page_url = listing(site, ["A"], ["B"])
+
+    concerts = fetch_paginated(page_url, parse_lines, max_workers=4)
+
+    assert [c["headliner"] for c in concerts] == ["A", "B"]
+
+
+def test_linked_last_page_stops_requests(site):
+    page_url = listing(site, ["A"], ["B"], ["C"], links=3)
+    # A page past the linked last one would never end the listing
+    site.page("/list?page=4", "2031-01-04|D")
+
+    concerts = fetch_paginated(
+        page_url, parse_lines, last_page_from_links("page"), max_workers=1
+    )
+
+    assert [c["headliner"] for c in concerts] == ["A", "B", "C"]
+    assert [path for path, _, _ in site.requests][-1] == "/list?page=3"
+
+
+def test_failures_past_the_listing_are_ignored(site):
+    page_url = listing(site, ["A"], ["B"], links=2)
+    site.page("/list?page=3", status=500)
+    site.page("/list?page=4", status=500)
+
+    concerts = fetch_paginated(
+        page_url, parse_lines, last_page_from_links("page"), max_workers=4
+    )
+
+    assert [c["headliner"] for c in concerts] == ["A", "B"]
+
+
+def test_failure_within_the_listing_raises(site):
+    page_url = listing(site, ["A"], ["B"], ["C"], [])
+    site.page("/list?page=2", status=500)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_paginated(page_url, parse_lines, max_workers=1)
+
+
+def test_events_listed_twice_are_kept_once(site):
+    page_url = listing(site, ["A", "B"], [])
+    site.page("/list?page=2", "2031-01-01|B\n2031-01-02|C")
+
+    concerts = fetch_paginated(page_url, parse_lines)
+
+    assert [c["headliner"] for c in concerts] == ["A", "B", "C"]
@@ -0,0 +1,77 @@
+import parsing
+import pytest
+from bs4 import SoupStrainer
+from parsing import PARSER_ENV, default_parser, make_soup
+from venues import chapel
+
+CARD = """
+<div class="seetickets-list-event-container">
+  <a href="https://wl.seetickets.us/{i}">Tickets</a>
+  <img class="seetickets-list-view-event-image" src="/img/{i}.jpg">
+  <div class="event-info-block">
+    <p class="title">Artist {i} Live</p>
+    <p class="date">Fri Jan 24, 2031</p>
+    <p class="headliners">Artist {i}</p>
+    <p class="venue">at The Chapel</p>
+    <span class="see-showtime">8:00PM</span>
+  </div>
+</div>
+"""
+
+PAGE = f"""
+<html><body>
+<nav><a href="/music/?list1page=2">2</a></nav>
+<div id="list-view-events">{CARD.format(i=0)}</div>
+{CARD.format(i=1)}
+{CARD.format(i=2)}
+</body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def restore_default_parser():
+    parsing.set_default_parser(None)
+    yield
+    parsing.set_default_parser(None)
+
+
+def test_default_parser_prefers_lxml(monkeypatch):
+    monkeypatch.delenv(PARSER_ENV, raising=False)
+    assert default_parser() == "lxml"
+
+
+def test_environment_overrides_the_default_parser(monkeypatch):
+    monkeypatch.setenv(PARSER_ENV, "html.parser")
+    assert default_parser() == "html.parser"
+
+
+def test_strainer_builds_only_matching_tags():
+    soup = make_soup(PAGE, SoupStrainer("p", class_="headliners"))
+
+    assert [p.text for p in soup.find_all("p")] == [
+        "Artist 0",
+        "Artist 1",
+        "Artist 2",
+    ]
+    assert soup.find("nav") is None
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_venue_parse_is_the_same_with_either_parser(parser):
+    parsing.set_default_parser(parser)
+
+    concerts = chapel.parse_concerts(PAGE)
+
+    assert concerts == [
+        {
+            "title": f"Artist {i} Live",
+            "date": "Fri, Jan 24, 2031",
+            "date_iso": "2031-01-24",
+            "headliner": f"Artist {i}",
+            "venue": "The Chapel",
+            "show_time": "8:00PM",
+            "ticket_url": f"https://wl.seetickets.us/{i}",
+            "image_url": f"/img/{i}.jpg",
+        }
+        for i in (1, 2)
+    ]
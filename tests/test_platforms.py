@@ -0,0 +1,145 @@
+from venues import chapel, dunord, fox, great_american, independent
+
+
+def page(*cards, container=None):
+    body = "".join(cards)
+    if container:
+        body = f'<div class="{container}">{body}</div>'
+    return f"<html><body><nav>menu</nav>{body}</body></html>"
+
+
+def ticketweb_card(name, attractions="", day="Mon", date="2.17"):
+    return f"""
+    <div class="tw-section">
+      <div class="tw-name"><a href="/e/1">{name}</a></div>
+      <span class="tw-day-of-week">{day}</span><span class="tw-event-date">{date}</span>
+      <span class="tw-event-time">Show: 8:00 pm</span>
+      <div class="tw-attractions">{attractions}</div>
+      <a class="tw-buy-tix-btn" href="https://www.ticketweb.com/1">Buy</a>
+      <div class="tw-image"><img src="/img/1.jpg"></div>
+    </div>
+    """
+
+
+def test_ticketweb_reads_support_from_tw_support_only():
+    card = ticketweb_card(
+        "Headliner",
+        '<span>Headliner</span><div class="tw-artist tw-support">Opener</div>',
+    )
+
+    [concert] = independent.parse_concerts(page(card))
+
+    assert concert["title"] == concert["headliner"] == "Headliner"
+    assert concert["support"] == "Opener"
+    assert concert["venue"] == "The Independent"
+    assert concert["show_time"] == "8:00 pm"
+    assert concert["ticket_url"] == "https://www.ticketweb.com/1"
+    assert concert["image_url"] == "/img/1.jpg"
+    assert "Feb 17" in concert["date"]
+
+
+def test_ticketweb_without_support_has_none():
+    [concert] = independent.parse_concerts(page(ticketweb_card("Solo")))
+
+    assert concert.get("support") is None
+
+
+def test_ticketweb_skips_private_and_undated_events():
+    cards = [
+        ticketweb_card("Private Event"),
+        ticketweb_card("No Date", date=""),
+        ticketweb_card("Public"),
+    ]
+
+    concerts = independent.parse_concerts(page(*cards))
+
+    assert [c["title"] for c in concerts] == ["Public"]
+
+
+def test_cafe_du_nord_falls_back_to_the_attractions_span():
+    cards = [
+        ticketweb_card("A", "<span>Opener A</span>"),
+        ticketweb_card("B", '<span>B</span><div class="tw-support">Opener B</div>'),
+    ]
+
+    html = page(*cards, container="event-listing-container")
+    concerts = dunord.parse_concerts(html)
+
+    assert [c["support"] for c in concerts] == ["Opener A", "Opener B"]
+    assert {c["venue"] for c in concerts} == {"Cafe du Nord"}
+
+
+def test_cafe_du_nord_only_reads_its_listing_container():
+    html = page(ticketweb_card("Elsewhere")) + page(
+        ticketweb_card("Listed"), container="event-listing-container"
+    )
+
+    assert [c["title"] for c in dunord.parse_concerts(html)] == ["Listed"]
+
+
+def test_seetickets_card():
+    card = """
+    <div class="seetickets-list-event-container">
+      <p class="event-title"><a href="/event/1">Artist Live</a></p>
+      <p class="headliners">Artist</p>
+      <p class="supporting-talent">Opener</p>
+      <p class="event-date">Fri Jan 24, 2031</p>
+      <span class="see-doortime">7:00PM</span><span class="see-showtime">8:00PM</span>
+      <a class="seetickets-buy-btn" href="https://wl.seetickets.us/1">Buy</a>
+      <img class="seetickets-list-view-event-image" src="/img/1.jpg">
+    </div>
+    """
+
+    [concert] = great_american.parse_concerts(page(card))
+
+    assert concert == {
+        "title": "Artist Live",
+        "headliner": "Artist",
+        "support": "Opener",
+        "date": "Fri, Jan 24, 2031",
+        "date_iso": "2031-01-24",
+        "door_time": "7:00PM",
+        "show_time": "8:00PM",
+        "ticket_url": "https://wl.seetickets.us/1",
+        "image_url": "/img/1.jpg",
+        "venue": "Great American",
+    }
+
+
+def test_seetickets_falls_back_to_the_first_link_and_card_venue():
+    card = """
+    <div class="seetickets-list-event-container">
+      <a href="https://wl.seetickets.us/2">Artist</a>
+      <p class="title">Artist</p>
+      <p class="date">Sat Jan 25, 2031</p>
+      <p class="venue">at The Chapel</p>
+    </div>
+    """
+    excluded = f'<div id="list-view-events">{card}</div>'
+
+    [concert] = chapel.parse_concerts(page(excluded, card))
+
+    assert concert["ticket_url"] == "https://wl.seetickets.us/2"
+    assert concert["venue"] == "The Chapel"
+    assert concert["headliner"] == "Artist"
+
+
+def test_wordpress_listing_card():
+    card = """
+    <div class="mix detail-information">
+      <h2 class="show-title">Artist</h2>
+      <div class="date-show">Fri Jan 24, 2031</div>
+      <span class="event__start-time">Show: 8:00 pm</span>
+      <a class="button" href="/more">More Info</a>
+      <a class="button" href="https://www.ticketmaster.com/1">Buy Tickets</a>
+      <img class="wp-post-image" src="/img/1.jpg">
+    </div>
+    """
+
+    [concert] = fox.parse_concerts(page(card))
+
+    assert concert["title"] == concert["headliner"] == "Artist"
+    assert concert["show_time"] == "8:00 pm"
+    assert concert["ticket_url"] == "https://www.ticketmaster.com/1"
+    assert concert["image_url"] == "/img/1.jpg"
+    assert concert["venue"] == "Fox Theatre"
@@ -0,0 +1,105 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+import registry
+from models import VenueConfig, VenueSpec
+from registry import VenueRegistry
+from scraper import ConcertScraper
+
+SRC = Path(__file__).resolve().parents[1] / "src" / "sf_jam"
+
+VENUE_MODULE = """
+from models import VenueConfig
+
+
+def retrieve():
+    return []
+
+
+VENUE = VenueConfig("Plugin", retrieve, "Plugin", "plugin.example.com")
+NOT_A_VENUE = object()
+"""
+
+
+@pytest.fixture
+def venue_module(tmp_path, monkeypatch):
+    """A venue module importable as ``fake_venue``, not yet imported."""
+    (tmp_path / "fake_venue.py").write_text(VENUE_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "fake_venue", raising=False)
+    yield "fake_venue"
+    sys.modules.pop("fake_venue", None)
+
+
+def test_importing_the_scraper_loads_no_fetch_or_parse_libraries():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, scraper; print(' '.join(sys.modules))",
+        ],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    for module in ("requests", "bs4", "lxml", "http_client", "venues.chapel"):
+        assert module not in loaded
+
+
+def test_builtin_venues_are_listed_in_order():
+    names = VenueRegistry(discover=False).names()
+
+    assert names == [spec.name for spec in registry.BUILTIN_VENUES]
+    assert names[0] == "The Chapel"
+
+
+def test_venue_module_is_imported_on_first_use(venue_module):
+    venues = VenueRegistry(discover=False)
+    venues.register(VenueSpec("Plugin", venue_module, "retrieve", "Plugin Hall"))
+
+    assert "Plugin" in venues
+    assert venue_module not in sys.modules
+    config = venues.get("Plugin")
+    assert venue_module in sys.modules
+    assert config.retrieval_func() == []
+    assert config.db_name == "Plugin Hall"
+    assert config.stream_func is None
+    assert venues.get("Plugin") is config
+
+
+def test_entry_points_add_venues(venue_module, monkeypatch):
+    found = [
+        EntryPoint("Plugin", f"{venue_module}:VENUE", registry.ENTRY_POINT_GROUP),
+        EntryPoint("Broken", f"{venue_module}:NOT_A_VENUE", registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(registry, "entry_points", lambda group: found)
+
+    venues = VenueRegistry()
+
+    assert venues.names()[-2:] == ["Plugin", "Broken"]
+    assert venues.get("Plugin").host == "plugin.example.com"
+    with pytest.raises(TypeError):
+        venues.get("Broken")
+
+
+def test_scrapes_only_the_named_venues(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = ConcertScraper()
+    scraped = []
+    for name in ("A", "B"):
+        scraper.registry.register(
+            VenueConfig(name, lambda name=name: scraped.append(name), name)
+        )
+
+    with pytest.raises(ValueError, match="Unknown venue"):
+        scraper.scrape_all_venues(venues=["A", "Nowhere"])
+    results = scraper.scrape_all_venues(venues=["B"])
+    scraper.close()
+
+    assert list(results) == ["B"]
+    assert scraped == ["B"]
@@ -0,0 +1,74 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+import retry
+from retry import FETCH, PARSE, PERSIST
+
+
+def http_error(status, **headers):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    return requests.HTTPError(response=response)
+
+
+def test_failure_stage():
+    assert retry.failure_stage(requests.ConnectionError(), saving=False) == FETCH
+    assert retry.failure_stage(ValueError(), saving=False) == PARSE
+    assert retry.failure_stage(sqlite3.OperationalError(), saving=False) == PERSIST
+    assert retry.failure_stage(ValueError(), saving=True) == PERSIST
+
+
+@pytest.mark.parametrize(
+    "error, stage, transient",
+    [
+        (requests.Timeout(), FETCH, True),
+        (requests.ConnectionError(), FETCH, True),
+        (http_error(503), FETCH, True),
+        (http_error(429), FETCH, True),
+        (http_error(404), FETCH, False),
+        (ValueError(), PARSE, False),
+        (sqlite3.OperationalError("database is locked"), PERSIST, True),
+        (sqlite3.IntegrityError(), PERSIST, False),
+    ],
+)
+def test_only_transient_failures_are_retried(error, stage, transient):
+    assert retry.is_transient(error, stage) is transient
+
+
+def test_retry_after_reads_seconds_and_dates():
+    assert retry.retry_after(http_error(503, **{"Retry-After": "7"})) == 7.0
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry.retry_after(
+        http_error(503, **{"Retry-After": format_datetime(later)})
+    )
+    assert 25 < delay <= 30
+    assert retry.retry_after(http_error(503)) is None
+
+
+def test_delay_backs_off_with_jitter_and_gives_up():
+    policy = retry.RetryPolicy(max_attempts=4, base_delay=2, max_delay=5)
+    error = requests.Timeout()
+
+    assert 1 <= policy.delay(1, error, FETCH) <= 2
+    assert 2 <= policy.delay(2, error, FETCH) <= 4
+    assert 2.5 <= policy.delay(3, error, FETCH) <= 5
+    assert policy.delay(4, error, FETCH) is None
+    assert policy.delay(1, ValueError(), PARSE) is None
+
+
+def test_delay_honours_retry_after_up_to_the_maximum():
+    policy = retry.RetryPolicy(base_delay=1, max_delay=60)
+
+    assert policy.delay(1, http_error(429, **{"Retry-After": "30"}), FETCH) == 30
+    assert policy.delay(1, http_error(429, **{"Retry-After": "600"}), FETCH) == 60
+
+
+def test_persist_failures_back_off_briefly():
+    policy = retry.RetryPolicy(persist_delay=0.5)
+    error = sqlite3.OperationalError("database is locked")
+
+    assert 0.25 <= policy.delay(1, error, PERSIST) <= 0.5
@@ -0,0 +1,249 @@
+import sqlite3
+import threading
+import time
+
+import http_client
+import pytest
+import requests
+from models import VenueConfig
+from retry import RetryPolicy
+from scraper import ConcertScraper
+
+
+def concert(venue):
+    return {
+        "title": venue,
+        "date": "Fri, Jan 24, 2031",
+        "headliner": venue,
+        "venue": venue,
+        "show_time": "8:00 PM",
+        "ticket_url": None,
+        "image_url": None,
+    }
+
+
+class Tracker:
+    """Count how many scrapes run at once, overall and per host."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+
+    def venue(self, name, host, delay=0.2):
+        def retrieve():
+            with self.lock:
+                self.running[host] = self.running.get(host, 0) + 1
+                total = sum(self.running.values())
+                self.peak[host] = max(self.peak.get(host, 0), self.running[host])
+                self.peak[None] = max(self.peak.get(None, 0), total)
+            time.sleep(delay)
+            with self.lock:
+                self.running[host] -= 1
+            return [concert(name)]
+
+        return VenueConfig(name, retrieve, name, host)
+
+
+def register(scraper, *configs):
+    """Register test venues and return their names to scrape."""
+    for config in configs:
+        scraper.registry.register(config)
+    return [config.name for config in configs]
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = ConcertScraper(max_workers=4)
+    yield scraper
+    scraper.close()
+
+
+def test_scrapes_venues_concurrently_within_host_limits(scraper):
+    tracker = Tracker()
+    venues = register(
+        scraper,
+        *(
+            tracker.venue(name, host)
+            for name, host in [
+                ("A", "a.example.com"),
+                ("B", "b.example.com"),
+                ("C", "shared.example.com"),
+                ("D", "shared.example.com"),
+            ]
+        ),
+    )
+
+    results = scraper.scrape_all_venues(venues=venues)
+
+    assert results == {"A": True, "B": True, "C": True, "D": True}
+    assert list(results) == ["A", "B", "C", "D"]
+    assert tracker.peak[None] >= 2
+    assert tracker.peak["shared.example.com"] == 1
+    assert set(scraper.durations) == set(results)
+    assert all(duration >= 0.2 for duration in scraper.durations.values())
+
+
+def test_max_workers_one_scrapes_sequentially(scraper):
+    tracker = Tracker()
+    venues = register(
+        scraper,
+        *(tracker.venue(name, f"{name}.example.com", delay=0.05) for name in "ABC"),
+    )
+
+    assert all(scraper.scrape_all_venues(max_workers=1, venues=venues).values())
+    assert tracker.peak[None] == 1
+
+
+def flaky(name, failures):
+    """A venue failing with each of ``failures`` before it succeeds."""
+    calls = []
+
+    def retrieve():
+        calls.append(len(calls))
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return [concert(name)]
+
+    return VenueConfig(name, retrieve, name, f"{name}.example.com"), calls
+
+
+def test_transient_failures_are_retried(scraper):
+    scraper.retry_policy = RetryPolicy(base_delay=0.01)
+    fetch, fetch_calls = flaky("Fetch", [requests.ConnectionError("reset")])
+    parse, parse_calls = flaky("Parse", [ValueError("bad markup")])
+    venues = register(scraper, fetch, parse)
+
+    assert scraper.scrape_all_venues(venues=venues) == {"Fetch": True, "Parse": False}
+    assert len(fetch_calls) == 2
+    assert len(parse_calls) == 1
+
+
+def test_failed_save_is_retried_without_fetching_again(scraper, monkeypatch):
+    scraper.retry_policy = RetryPolicy(persist_delay=0.01)
+    venue, calls = flaky("Venue", [])
+    venues = register(scraper, venue)
+    save = scraper.db.save_concerts
+    saves = []
+
+    def locked_once(concerts, venue):
+        saves.append(venue)
+        if len(saves) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return save(concerts, venue)
+
+    monkeypatch.setattr(scraper.db, "save_concerts", locked_once)
+
+    assert scraper.scrape_all_venues(venues=venues) == {"Venue": True}
+    assert len(calls) == 1
+    assert len(saves) == 2
+
+
+def slow(name, delay, finished):
+    def retrieve():
+        time.sleep(delay)
+        finished.append(name)
+        return [concert(name)]
+
+    return VenueConfig(name, retrieve, name, f"{name}.example.com")
+
+
+def test_venue_cancelled_mid_fetch_is_not_saved(scraper, monkeypatch):
+    finished = []
+    scraper.run_budget = 1
+    venues = register(scraper, slow("Fast", 0, finished), slow("Slow", 1.5, finished))
+    save = scraper.db.save_concerts
+    saved = []
+
+    def recording(concerts, venue):
+        saved.append(venue)
+        return save(concerts, venue)
+
+    monkeypatch.setattr(scraper.db, "save_concerts", recording)
+
+    results = scraper.scrape_all_venues(venues=venues)
+
+    assert results == {"Fast": True, "Slow": False}
+    assert results.timed_out == ["Slow"]
+    # The cancelled attempt is waited for, and stops short of saving
+    assert "Slow" in finished
+    assert saved == ["Fast"]
+
+
+def test_venue_budget_cuts_off_retries(scraper):
+    scraper.venue_budget = 0.8
+    scraper.retry_policy = RetryPolicy(base_delay=0.2, max_attempts=10)
+    venue, calls = flaky("Venue", [requests.ConnectionError("reset")] * 10)
+    venues = register(scraper, venue)
+
+    results = scraper.scrape_all_venues(venues=venues)
+
+    assert results == {"Venue": False}
+    assert results.timed_out == ["Venue"]
+    assert 1 < len(calls) < 10
+
+
+def test_stale_only_skips_fresh_venues(scraper, monkeypatch):
+    tracker = Tracker()
+    venues = register(
+        scraper, *(tracker.venue(name, f"{name}.example.com", 0) for name in "ABC")
+    )
+    assert scraper.scrape_all_venues(venues=["A", "B"]) == {"A": True, "B": True}
+    runs = scraper.db.get_scrape_runs()
+    assert set(runs) == {"A", "B"}
+    assert runs["A"]["row_count"] == 1
+    assert runs["A"]["fingerprint"]
+
+    assert scraper.stale_venues(venues) == ["C"]
+    assert list(scraper.scrape_all_venues(venues=venues, stale_only=True)) == ["C"]
+
+    scraper.max_age = 0
+    monkeypatch.setattr(scraper.db, "get_scrape_runs", lambda: {"B": runs["B"]})
+    # Venues never scraped successfully come first
+    assert scraper.stale_venues(venues) == ["A", "C", "B"]
+
+
+def test_failed_venue_is_not_marked_fresh(scraper):
+    venue, _ = flaky("Venue", [ValueError("bad markup")])
+    register(scraper, venue)
+
+    assert scraper.scrape_all_venues(venues=["Venue"]) == {"Venue": False}
+    assert scraper.db.get_scrape_runs() == {}
+    assert scraper.stale_venues(["Venue"]) == ["Venue"]
+
+
+def test_details_are_fetched_for_saved_venues_only(scraper, monkeypatch):
+    def listing(name):
+        return lambda: [{**concert(name), "ticket_url": f"https://{name}/1"}]
+
+    good = VenueConfig("Good", listing("Good"), "Good")
+    bad, _ = flaky("Bad", [ValueError("bad markup")])
+    venues = register(scraper, good, bad)
+    enriched = []
+    monkeypatch.setattr(scraper.enricher, "enrich", enriched.append)
+
+    assert scraper.scrape_all_venues(venues=venues) == {"Good": True, "Bad": False}
+    assert enriched == [["https://Good/1"]]
+
+
+def test_rescraping_an_unchanged_listing_succeeds(scraper):
+    venues = register(scraper, Tracker().venue("Venue", "venue.example.com", 0))
+
+    assert scraper.scrape_all_venues(venues=venues) == {"Venue": True}
+    assert scraper.scrape_all_venues(venues=venues) == {"Venue": True}
+    assert scraper.db.get_scrape_runs()["Venue"]["row_count"] == 1
+
+
+def test_close_releases_the_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = ConcertScraper()
+    assert http_client._validators is scraper.validators
+    with scraper.db.get_connection() as writer:
+        pass
+
+    scraper.close()
+
+    assert http_client._validators is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        writer.execute("SELECT 1")
@@ -0,0 +1,158 @@
+import sqlite3
+
+import http_client
+import pytest
+from database import ConcertDatabase
+from streaming import class_matcher, iter_cards
+from validators import ValidatorStore
+from venues import chapel, dunord, fox, great_american, independent
+
+SEETICKETS_CARD = """
+<div class="seetickets-list-event-container">
+  <p class="event-title"><a href="/event/{i}">Artist {i} &amp; Band</a></p>
+  <p class="headliners">Artist {i}</p>
+  <p class="event-date">Fri Jan 24, 2031</p>
+  <span class="see-showtime">8:00PM</span>
+  <div class="buttons"><a class="seetickets-buy-btn" href="/buy/{i}">Buy</a></div>
+  <img class="seetickets-list-view-event-image" src="/img/{i}.jpg"/>
+</div>
+"""
+
+TICKETWEB_CARD = """
+<div class="tw-section">
+  <div class="tw-name"><a href="/e/{i}">Artist {i}</a></div>
+  <span class="tw-day-of-week">Fri</span><span class="tw-event-date">1.24</span>
+  <div class="tw-attractions"><span>Opener {i}</span></div>
+  <a class="tw-buy-tix-btn" href="https://www.ticketweb.com/{i}">Buy</a>
+</div>
+"""
+
+WORDPRESS_CARD = """
+<div class="mix detail-information">
+  <h2 class="show-title">Artist {i} &#8211; Live</h2>
+  <div class="date-show">Fri Jan 24, 2031</div>
+  <a class="button" href="https://www.ticketmaster.com/{i}">Buy Tickets</a>
+</div>
+"""
+
+
+def page(card, count=5, container=None, excluded=None):
+    cards = "".join(card.format(i=i) for i in range(count))
+    if container:
+        cards = f'<div class="{container}">{cards}</div>'
+    if excluded:
+        cards = f'<div id="{excluded}">{card.format(i=99)}</div>{cards}'
+    return f"<html><body><div class='nav'><p>menu</div>{cards}</body></html>"
+
+
+def chunked(text, size=7):
+    for start in range(0, len(text), size):
+        end = start + size
+        yield text[start:end]
+
+
+@pytest.mark.parametrize(
+    "module, html",
+    [
+        (great_american, page(SEETICKETS_CARD)),
+        (chapel, page(SEETICKETS_CARD, excluded="list-view-events")),
+        (independent, page(TICKETWEB_CARD)),
+        (dunord, page(TICKETWEB_CARD, container="event-listing-container")),
+        (fox, page(WORDPRESS_CARD)),
+    ],
+)
+def test_streamed_cards_match_the_parsed_page(module, html):
+    parsed = module.EXTRACTOR.parse_cards(html)
+
+    assert len(parsed) == 5
+    assert list(module.EXTRACTOR.stream(chunked(html))) == parsed
+
+
+def test_iter_cards_yields_cards_as_they_complete():
+    html = page(TICKETWEB_CARD, count=2)
+    first_card_end = html.index("</div>\n<div") + len("</div>")
+    chunks = iter([html[:first_card_end], html[first_card_end:]])
+
+    cards = iter_cards(chunks, class_matcher("tw-section"))
+
+    assert "Artist 0" in next(cards)
+    assert "Artist 1" in next(cards)
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ConcertDatabase(str(tmp_path / "concerts.db"))
+    yield database
+    database.close()
+
+
+def test_stream_decodes_utf8_split_across_chunks(site, db, monkeypatch):
+    http_client.close()
+    monkeypatch.setattr(http_client, "STREAM_CHUNK_SIZE", 3)
+    store = ValidatorStore(db)
+    http_client.set_validator_store(store)
+    url = site.page("/events", "<p>Café Nørd</p>".encode(), headers={"ETag": '"1"'})
+    try:
+        with store.track("Cafe du Nord"):
+            assert "".join(http_client.stream(url)) == "<p>Café Nørd</p>"
+        store.commit("Cafe du Nord")
+        assert store.get(url)["etag"] == '"1"'
+    finally:
+        http_client.set_validator_store(None)
+        http_client.close()
+
+
+def concert(headliner):
+    return {
+        "title": headliner,
+        "date": "Fri, Jan 24, 2031",
+        "headliner": headliner,
+        "venue": "Fox Theatre",
+        "show_time": None,
+        "ticket_url": None,
+        "image_url": None,
+    }
+
+
+def saved(db):
+    with db.get_connection() as conn:
+        return sorted(row[0] for row in conn.execute("SELECT headliner FROM concerts"))
+
+
+def test_save_concerts_stream_replaces_the_venue_in_batches(db):
+    db.save_concerts([concert("Old")], "Fox Theatre")
+
+    result = db.save_concerts_stream(
+        (concert(f"Band {i}") for i in range(5)), "Fox Theatre", batch_size=2
+    )
+
+    assert (result.added, result.removed, result.errors) == (5, 1, 0)
+    assert saved(db) == [f"Band {i}" for i in range(5)]
+
+
+def test_failed_or_empty_stream_keeps_the_venue(db):
+    db.save_concerts([concert("Old")], "Fox Theatre")
+
+    def failing():
+        yield concert("New")
+        raise ConnectionError("dropped")
+
+    with pytest.raises(ConnectionError):
+        db.save_concerts_stream(failing(), "Fox Theatre", batch_size=1)
+    db.save_concerts_stream(iter(()), "Fox Theatre")
+
+    assert saved(db) == ["Old"]
+
+
+def test_failed_validator_commit_is_only_logged(db, monkeypatch, caplog):
+    store = ValidatorStore(db)
+    with store.track("Fox Theatre"):
+        store.stage("https://example.com/", None, None, "hash")
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db, "get_connection", locked)
+    store.commit("Fox Theatre")
+
+    assert "database is locked" in caplog.text
@@ -0,0 +1,87 @@
+import time
+
+import http_client
+import pytest
+import requests
+import throttle
+from throttle import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.close()
+    yield
+    http_client.close()
+
+
+def test_token_bucket_spaces_requests_after_a_burst():
+    bucket = throttle.TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two tokens come from the burst, the other two at 20 per second
+    assert 0.08 <= time.monotonic() - start < 0.5
+
+
+def test_breaker_opens_after_repeated_failures_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN and not breaker.allow()
+
+
+def test_server_errors_open_the_circuit(site):
+    url = site.page("/events", status=503)
+    guard = throttle.get_guard(site.url.split("//")[1])
+    guard.bucket = throttle.TokenBucket(rate=1000, capacity=10)
+
+    for _ in range(throttle.FAILURE_THRESHOLD):
+        with pytest.raises(requests.HTTPError):
+            http_client.get(url)
+    with pytest.raises(CircuitOpenError):
+        http_client.get(url)
+
+    assert len(site.requests) == throttle.FAILURE_THRESHOLD
+    assert throttle.breaker_states()[guard.host] == OPEN
+
+
+def test_any_request_error_counts_as_a_failure(site, monkeypatch):
+    url = site.page("/events")
+    guard = throttle.get_guard(site.url.split("//")[1])
+    guard.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+
+    def redirect_loop(*args, **kwargs):
+        raise requests.TooManyRedirects("loop")
+
+    monkeypatch.setattr(http_client.get_session(), "get", redirect_loop)
+    with pytest.raises(requests.TooManyRedirects):
+        http_client.get(url)
+
+    # The probe was released, so the next request is let through
+    assert guard.breaker.state == OPEN
+    monkeypatch.undo()
+    assert http_client.get(url).status_code == 200
+    assert guard.breaker.state == CLOSED
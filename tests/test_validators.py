@@ -0,0 +1,69 @@
+import http_client
+import pytest
+from database import ConcertDatabase
+from validators import NotModified, ValidatorStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    http_client.close()
+    db = ConcertDatabase(str(tmp_path / "concerts.db"))
+    store = ValidatorStore(db)
+    http_client.set_validator_store(store)
+    yield store
+    http_client.set_validator_store(None)
+    http_client.close()
+    db.close()
+
+
+def etag_page(etag, body):
+    def respond(headers):
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, ""
+        return 200, {"ETag": etag}, body
+
+    return respond
+
+
+def test_unchanged_page_is_not_modified_once_committed(site, store):
+    url = site.page("/events", etag_page('"v1"', "<html>v1</html>"))
+
+    with store.track("The Chapel"):
+        assert http_client.get(url, conditional=True).text == "<html>v1</html>"
+    # Nothing is stored until the venue is committed
+    assert store.get(url) is None
+    with store.track("The Chapel"):
+        http_client.get(url, conditional=True)
+    store.commit("The Chapel")
+    assert store.get(url)["etag"] == '"v1"'
+
+    with store.track("The Chapel"), pytest.raises(NotModified):
+        http_client.get(url, conditional=True)
+    _, headers, _ = site.requests[-1]
+    assert headers["If-None-Match"] == '"v1"'
+
+
+def test_identical_body_is_not_modified_without_validators(site, store):
+    url = site.page("/events", "<html>same</html>")
+
+    with store.track("The Chapel"):
+        response = http_client.get(url, conditional=True)
+    assert response.unchanged is False
+    store.commit("The Chapel")
+
+    with store.track("The Chapel"):
+        assert http_client.get(url).unchanged is True
+        with pytest.raises(NotModified):
+            http_client.get(url, conditional=True)
+
+
+def test_discarded_validators_are_not_saved(site, store):
+    url = site.page("/events", etag_page('"v1"', "<html>v1</html>"))
+
+    with store.track("The Chapel"):
+        http_client.get(url, conditional=True)
+    store.discard("The Chapel")
+    store.commit("The Chapel")
+
+    assert store.get(url) is None
+    assert http_client.get(url, conditional=True).text == "<html>v1</html>"